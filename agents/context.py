@@ -0,0 +1,123 @@
+# agents/context.py
+import json
+import logging
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from core.config import settings
+from database.models import TripPlan
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, provider-agnostic token estimate (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def _message_tokens(message: BaseMessage) -> int:
+    text = message.content
+    if not isinstance(text, str):
+        text = json.dumps(text, default=str)
+    if isinstance(message, AIMessage) and message.tool_calls:
+        text += json.dumps([call["args"] for call in message.tool_calls], default=str)
+    return estimate_tokens(text) + 4
+
+
+def compact_plan_view(plan: TripPlan) -> str:
+    """
+    Minified plan for the planner prompt. Itinerary days that are already in the
+    plan are reduced to their day number and title: the planner only needs to
+    know they exist, not re-read every activity on every turn.
+    """
+    data = plan.model_dump(exclude={"session_id"})
+    data["itinerary"] = [
+        {"day": day["day"], "title": day["title"]} for day in data["itinerary"]
+    ]
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [truncated {len(text) - limit} chars]"
+
+
+def _compact_stale(message: BaseMessage) -> BaseMessage:
+    limit = settings.STALE_TOOL_MESSAGE_CHARS
+    if isinstance(message, ToolMessage) and isinstance(message.content, str):
+        if len(message.content) > limit:
+            return message.model_copy(
+                update={"content": _truncate(message.content, limit)}
+            )
+    elif isinstance(message, AIMessage) and message.tool_calls:
+        # Old PlanUpdater calls carry whole itinerary chunks that are in the plan already.
+        tool_calls = []
+        for call in message.tool_calls:
+            args = {}
+            for key, value in call["args"].items():
+                dumped = json.dumps(value, default=str)
+                args[key] = (
+                    value if len(dumped) <= limit else f"<omitted: {len(dumped)} chars>"
+                )
+            tool_calls.append({**call, "args": args})
+        return message.model_copy(update={"tool_calls": tool_calls})
+    return message
+
+
+def _group_turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """Groups an AI message with the tool results that answer it, so they are dropped together."""
+    groups: list[list[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, ToolMessage) and groups:
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    return groups
+
+
+def prepare_messages(
+    messages: list[BaseMessage], reserved_tokens: int = 0
+) -> list[BaseMessage]:
+    """
+    Applies the context budget to the conversation history:
+    1. Tool results and tool-call arguments the planner has already acted on
+       (anything before the latest AI message) are truncated.
+    2. If the total still exceeds PROMPT_TOKEN_BUDGET (minus `reserved_tokens`
+       for the system prompt), the oldest turns are dropped. The latest human
+       message and the latest turn are always kept, and the trimmed history
+       always starts at a human message.
+    """
+    last_ai_index = max(
+        (i for i, m in enumerate(messages) if isinstance(m, AIMessage)), default=-1
+    )
+    compacted = [
+        _compact_stale(m) if i < last_ai_index else m for i, m in enumerate(messages)
+    ]
+
+    budget = settings.PROMPT_TOKEN_BUDGET - reserved_tokens
+    groups = _group_turns(compacted)
+    sizes = [sum(_message_tokens(m) for m in group) for group in groups]
+    last_human = max(
+        (i for i, g in enumerate(groups) if isinstance(g[0], HumanMessage)),
+        default=-1,
+    )
+    protected = {last_human, len(groups) - 1}
+    total = sum(sizes)
+    keep = [True] * len(groups)
+    for i in range(len(groups)):
+        if total <= budget:
+            break
+        if i in protected:
+            continue
+        keep[i] = False
+        total -= sizes[i]
+    if not all(keep) and last_human >= 0:
+        # Providers expect the history to open with a user turn, not a tool call.
+        first_human = min(
+            i
+            for i, g in enumerate(groups)
+            if keep[i] and isinstance(g[0], HumanMessage)
+        )
+        keep[:first_human] = [False] * first_human
+
+    return [m for i, group in enumerate(groups) if keep[i] for m in group]
@@ -1,19 +1,35 @@
 # agents/graph.py
+import asyncio
 import json
+import logging
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from langgraph.graph import StateGraph, END
+from langgraph.prebuilt import InjectedState
+from langgraph.types import Send
 from langchain_core.messages import ToolMessage, AIMessage
 
+from .context import compact_plan_view, estimate_tokens, prepare_messages
+from .plan_patch import PlanPatcher, validate_fields
 from .state import TripState
-from core.model_loader import get_llm
+from core.airport_index import get_airport_index
+from core.config import settings
+from core.llm_cache import count_model_calls
+from core.metrics import observe_node, observe_tool
+from core.model_loader import model_registry
+from database.checkpointer import checkpointer
 from prompts.system_prompts import PLANNER_PROMPT
 from tools.weather_info_tool import weather_info
+from tools.route_weather_tool import route_weather
 from tools.search_place_tool import search_place
+from tools.airport_lookup_tool import airport_lookup
 from tools.calculator_tool import calculator
 from tools.currency_conversion_tool import currency_converter
+from tools.budget_conversion_tool import convert_budget
 from tools.flight_search_tool import flight_search
+from tools.flexible_flight_search_tool import flexible_flight_search
 from tools.hotel_search_tool import hotel_search
+from tools.route_hotel_search_tool import route_hotel_search
 from tools.generate_itinerary_tool import generate_itinerary
 from tools.create_multicity_route_tool import create_multicity_route
 from database.models import (
@@ -27,15 +43,25 @@ from database.models import (
 
 external_tools = [
     weather_info,
+    route_weather,
     search_place,
+    airport_lookup,
     calculator,
     currency_converter,
+    convert_budget,
     flight_search,
+    flexible_flight_search,
     hotel_search,
+    route_hotel_search,
     generate_itinerary,
     create_multicity_route,
 ]
 tool_map = {t.name: t for t in external_tools}
+# Tools whose result carries a `plan_update` (fields to replace in the plan)
+# that the tool node applies directly.
+plan_writing_tools = {route_hotel_search.name}
+
+logger = logging.getLogger(__name__)
 
 
 class PlanUpdater(BaseModel):
@@ -83,90 +109,301 @@ class PlanUpdater(BaseModel):
     )
 
 
-llm = get_llm()
-model_with_tools = llm.bind_tools(external_tools + [PlanUpdater])
+planner_tools = external_tools + [PlanUpdater]
 
 
-def planner_node(state: TripState) -> dict:
-    prompt = PLANNER_PROMPT.partial(plan=state["plan"].model_dump_json(indent=2))
-    response = model_with_tools.invoke(prompt.invoke({"messages": state["messages"]}))
-    return {"messages": [response]}
+@observe_node("planner")
+async def planner_node(state: TripState) -> dict:
+    plan_view = compact_plan_view(state["plan"])
+    prompt = PLANNER_PROMPT.partial(plan=plan_view)
+    system_prompt = await prompt.ainvoke({"messages": []})
+    system_tokens = estimate_tokens(system_prompt.to_string())
+    messages = prepare_messages(state["messages"], reserved_tokens=system_tokens)
+    prompt_value = await prompt.ainvoke({"messages": messages})
+    logger.info(
+        f"Planner prompt: ~{estimate_tokens(prompt_value.to_string())} tokens "
+        f"(plan ~{estimate_tokens(plan_view)}, {len(messages)}/{len(state['messages'])} messages)"
+    )
+    model_with_tools = model_registry.with_tools(planner_tools)
+    response = await model_with_tools.ainvoke(prompt_value)
+    if usage := getattr(response, "usage_metadata", None):
+        logger.info(
+            f"Planner usage: {usage.get('input_tokens')} input, "
+            f"{usage.get('output_tokens')} output tokens"
+        )
+    return {"messages": [response], "llm_calls": 1}
 
 
+@observe_node("update_plan")
 def plan_updater_node(state: TripState) -> dict:
     """The 'Assembly Line' node. It correctly assembles the final plan."""
     last_message = state["messages"][-1]
     tool_messages = []
-    updated_plan = state["plan"]
+    patcher = PlanPatcher(state["plan"])
 
     for tool_call in last_message.tool_calls:
         if tool_call["name"] == "PlanUpdater":
-            args = tool_call["args"]
-            updated_data = updated_plan.model_dump()
-
-            # --- THIS IS THE ASSEMBLY LOGIC ---
-            # Special handling for the itinerary to ensure days are sequential
-            if "itinerary" in args and args["itinerary"]:
-                new_itinerary_chunk = args["itinerary"]
-                # Find the last day number in the existing itinerary
-                last_day = (
-                    updated_data["itinerary"][-1]["day"]
-                    if updated_data["itinerary"]
-                    else 0
+            try:
+                patcher.apply_update(tool_call["args"])
+            except ValidationError as e:
+                tool_messages.append(
+                    ToolMessage(
+                        content=f"Plan update rejected: {e}",
+                        tool_call_id=tool_call["id"],
+                        status="error",
+                    )
                 )
-                # Re-number the new chunk to be sequential
-                for i, day_plan in enumerate(new_itinerary_chunk):
-                    day_plan["day"] = last_day + i + 1
-                # Now extend the main itinerary with the re-numbered chunk
-                updated_data["itinerary"].extend(new_itinerary_chunk)
-                # Remove the chunk from args to avoid double-adding
-                del args["itinerary"]
-            # --- END OF ASSEMBLY LOGIC ---
-
-            for key, value in args.items():
-                if value is not None:
-                    if isinstance(updated_data.get(key), list) and isinstance(
-                        value, list
-                    ):
-                        updated_data[key].extend(
-                            v for v in value if v not in updated_data[key]
-                        )
-                    else:
-                        updated_data[key] = value
-
-            updated_plan = TripPlan(**updated_data)
+                continue
             tool_messages.append(
                 ToolMessage(
                     content=f"Successfully updated the plan.",
                     tool_call_id=tool_call["id"],
                 )
             )
-    return {"plan": updated_plan, "messages": tool_messages}
+    return {"plan": patcher.plan, "plan_patch": patcher.ops, "messages": tool_messages}
 
 
-def custom_tool_node(state: TripState) -> dict:
-    tool_messages = []
+def _serialize_tool_output(tool_output) -> str:
+    if (
+        isinstance(tool_output, list)
+        and tool_output
+        and isinstance(tool_output[0], BaseModel)
+    ):
+        serialized_output = [item.model_dump() for item in tool_output]
+        return json.dumps(serialized_output, indent=2)
+    elif isinstance(tool_output, BaseModel):
+        return tool_output.model_dump_json(indent=2)
+    elif not isinstance(tool_output, str):
+        return json.dumps(tool_output, indent=2)
+    return tool_output
+
+
+def _inject_state(tool, args: dict, state: TripState) -> dict:
+    """Fills the tool's `InjectedState` arguments, which the model never sees."""
+    for name, field in tool.args_schema.model_fields.items():
+        for meta in field.metadata:
+            if isinstance(meta, InjectedState):
+                args = {**args, name: state[meta.field] if meta.field else state}
+    return args
+
+
+async def _run_tool_call(
+    tool_call: dict, state: TripState, semaphore: asyncio.Semaphore
+) -> tuple[ToolMessage, dict | None]:
+    """Runs one tool call; returns its message and any plan update it carries."""
+    tool_to_call = tool_map[tool_call["name"]]
+    async with semaphore:
+        try:
+            with observe_tool(tool_call["name"]) as check_result:
+                tool_output = await tool_to_call.ainvoke(
+                    _inject_state(tool_to_call, tool_call["args"], state)
+                )
+                check_result(tool_output)
+        except Exception as e:
+            # One failing call must not take down its siblings; report it to the planner.
+            logger.exception(f"Tool {tool_call['name']} failed")
+            message = ToolMessage(
+                content=f"Error: {tool_call['name']} failed: {e}",
+                tool_call_id=tool_call["id"],
+                status="error",
+            )
+            return message, None
+    plan_update = None
+    if tool_call["name"] in plan_writing_tools and isinstance(tool_output, dict):
+        plan_update = tool_output.pop("plan_update", None)
+        try:
+            plan_update = plan_update and validate_fields(plan_update)
+        except ValidationError as e:
+            # Validated here, so one bad update can't fail the whole tool step.
+            logger.warning(f"Tool {tool_call['name']} returned an invalid plan: {e}")
+            message = ToolMessage(
+                content=f"Error: {tool_call['name']} plan update rejected: {e}",
+                tool_call_id=tool_call["id"],
+                status="error",
+            )
+            return message, None
+    message = ToolMessage(
+        content=_serialize_tool_output(tool_output), tool_call_id=tool_call["id"]
+    )
+    return message, plan_update
+
+
+@observe_node("tools")
+async def custom_tool_node(state: TripState) -> dict:
+    """
+    Runs every external tool call from the last AI message concurrently,
+    bounded by TOOL_CALL_CONCURRENCY. Messages keep the original call order.
+    Plan updates carried by plan-writing tools are applied in the same step.
+    """
     last_message = state["messages"][-1]
-    for tool_call in last_message.tool_calls:
-        tool_name = tool_call["name"]
-        if tool_name in tool_map:
-            tool_to_call = tool_map[tool_name]
-            tool_output = tool_to_call.invoke(tool_call["args"])
-            if (
-                isinstance(tool_output, list)
-                and tool_output
-                and isinstance(tool_output[0], BaseModel)
-            ):
-                serialized_output = [item.model_dump() for item in tool_output]
-                tool_output = json.dumps(serialized_output, indent=2)
-            elif isinstance(tool_output, BaseModel):
-                tool_output = tool_output.model_dump_json(indent=2)
-            elif not isinstance(tool_output, str):
-                tool_output = json.dumps(tool_output, indent=2)
-            tool_messages.append(
-                ToolMessage(content=tool_output, tool_call_id=tool_call["id"])
+    semaphore = asyncio.Semaphore(settings.TOOL_CALL_CONCURRENCY)
+    # Tools like generate_itinerary call the model unless the LLM cache has the result.
+    with count_model_calls() as count:
+        results = await asyncio.gather(
+            *(
+                _run_tool_call(tool_call, state, semaphore)
+                for tool_call in last_message.tool_calls
+                if tool_call["name"] in tool_map
             )
-    return {"messages": tool_messages}
+        )
+    update = {
+        "messages": [message for message, _ in results],
+        "llm_calls": count.calls,
+    }
+    plan_updates = [plan_update for _, plan_update in results if plan_update]
+    if plan_updates:
+        patcher = PlanPatcher(state["plan"])
+        for plan_update in plan_updates:
+            for field, value in plan_update.items():
+                patcher.replace(field, value)
+        update.update(plan=patcher.plan, plan_patch=patcher.ops)
+    return update
+
+
+def _planned_city_count(plan: TripPlan) -> int:
+    """How many leading cities of the route already have their days in the itinerary."""
+    days_needed = 0
+    for index, stop in enumerate(plan.route):
+        days_needed += stop.num_days
+        if len(plan.itinerary) < days_needed:
+            return index
+    return len(plan.route)
+
+
+@observe_node("plan_city")
+async def plan_city_node(task: dict) -> dict:
+    """Fan-out worker: generates the itinerary for a single city of the route."""
+    stop: CityStop = task["stop"]
+    result = {"index": task["city_index"]}
+    with count_model_calls() as count:
+        try:
+            with observe_tool(generate_itinerary.name):
+                days = await generate_itinerary.ainvoke(
+                    {
+                        "destination": f"{stop.city}, {stop.country}",
+                        "duration_days": stop.num_days,
+                        "interests": task["interests"],
+                    }
+                )
+        except Exception as e:
+            logger.exception(f"Itinerary generation failed for {stop.city}")
+            result["error"] = str(e) or type(e).__name__
+        else:
+            if len(days) < stop.num_days:
+                result["error"] = (
+                    f"only {len(days)} of {stop.num_days} days were generated"
+                )
+            else:
+                result["days"] = [day.model_dump() for day in days[: stop.num_days]]
+    return {"city_itineraries": [result], "llm_calls": count.calls}
+
+
+@observe_node("join_itineraries")
+def join_itineraries_node(state: TripState) -> dict:
+    """
+    Stitches the fanned-out city itineraries into the plan, in route order.
+    The itinerary is one run of days, so it stops at the first city that
+    failed: that city and the ones after it stay pending for the next turn,
+    and the turn ends telling the user what went wrong.
+    """
+    patcher = PlanPatcher(state["plan"])
+    route = patcher.plan.route
+    update = {}
+    for result in sorted(state["city_itineraries"], key=lambda r: r["index"]):
+        stop = route[result["index"]]
+        if "error" in result:
+            logger.warning(f"Itinerary for {stop.city} failed: {result['error']}")
+            update["messages"] = [
+                AIMessage(
+                    content=(
+                        f"I couldn't plan the days in {stop.city} this time "
+                        f"({result['error']}). Everything planned so far is "
+                        "saved; send another message to try again."
+                    )
+                )
+            ]
+            break
+        patcher.append_itinerary(result["days"])
+    patcher.replace("current_city_index", _planned_city_count(patcher.plan))
+    return {
+        **update,
+        "plan": patcher.plan,
+        "plan_patch": patcher.ops,
+        "city_itineraries": None,
+    }
+
+
+def join_router(state: TripState) -> str:
+    """Ends the turn if the join reported a failed city, else on to the controller."""
+    # The graph never enters the fan-out after an AI message without tool calls
+    # (that ends the turn), so one at the end here is the join's failure notice.
+    last_message = state["messages"][-1]
+    if isinstance(last_message, AIMessage) and not last_message.tool_calls:
+        return END
+    return "controller"
+
+
+def _fill_airport_codes(patcher: PlanPatcher):
+    """
+    Sets missing `origin_iata`/`destination_iata` from the offline airport
+    index as soon as the origin and destination are known. A destination that
+    isn't a city (e.g. "Europe") falls back to the first city of the route.
+    """
+    plan = patcher.plan
+    index = get_airport_index()
+    if plan.origin_city and not plan.origin_iata:
+        if airport := index.resolve(plan.origin_city):
+            patcher.replace("origin_iata", airport.iata)
+    if not plan.destination_iata:
+        places = [plan.destination, plan.route[0].city if plan.route else None]
+        for place in filter(None, places):
+            if airport := index.resolve(place):
+                patcher.replace("destination_iata", airport.iata)
+                break
+
+
+@observe_node("controller")
+def controller_node(state: TripState) -> dict:
+    """
+    Deterministic counterpart of the planner's execution script. Fills in
+    airport codes and advances `current_city_index` past every city whose days
+    are already in the itinerary, which also moves a fully planned route on to
+    finalization, without an LLM call.
+    """
+    patcher = PlanPatcher(state["plan"])
+    _fill_airport_codes(patcher)
+    plan = patcher.plan
+    planned = _planned_city_count(plan)
+    if plan.route and planned > plan.current_city_index:
+        patcher.replace("current_city_index", planned)
+    if not patcher.ops:
+        return {}
+    return {"plan": patcher.plan, "plan_patch": patcher.ops}
+
+
+def controller_router(state: TripState):
+    """
+    Generates missing city itineraries directly (all remaining cities in parallel,
+    or just the current one when ITINERARY_FAN_OUT is off). Anything that needs
+    creative output, like the route, budget or final summary, goes to the planner.
+    """
+    plan = state["plan"]
+    if plan.current_city_index >= len(plan.route):
+        return "planner"
+    pending = range(plan.current_city_index, len(plan.route))
+    if not settings.ITINERARY_FAN_OUT:
+        pending = pending[:1]
+    return [
+        Send(
+            "plan_city",
+            {
+                "city_index": index,
+                "stop": plan.route[index],
+                "interests": plan.interests,
+            },
+        )
+        for index in pending
+    ]
 
 
 def router(state: TripState) -> str:
@@ -181,15 +418,23 @@ def router(state: TripState) -> str:
 
 
 workflow = StateGraph(TripState)
+workflow.add_node("controller", controller_node)
 workflow.add_node("planner", planner_node)
 workflow.add_node("update_plan", plan_updater_node)
 workflow.add_node("tools", custom_tool_node)
-workflow.set_entry_point("planner")
+workflow.add_node("plan_city", plan_city_node)
+workflow.add_node("join_itineraries", join_itineraries_node)
+workflow.set_entry_point("controller")
+workflow.add_conditional_edges(
+    "controller", controller_router, ["planner", "plan_city"]
+)
 workflow.add_conditional_edges(
     "planner",
     router,
     {"update_plan": "update_plan", "call_external_tools": "tools", END: END},
 )
-workflow.add_edge("update_plan", "planner")
+workflow.add_edge("update_plan", "controller")
+workflow.add_edge("plan_city", "join_itineraries")
+workflow.add_conditional_edges("join_itineraries", join_router, ["controller", END])
 workflow.add_edge("tools", "planner")
-graph = workflow.compile()
+graph = workflow.compile(checkpointer=checkpointer)
@@ -0,0 +1,131 @@
+# agents/plan_patch.py
+import hashlib
+import json
+from functools import lru_cache, partial
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from database.models import TripPlan
+
+
+def _item_key(item: Any) -> str:
+    """Stable hash of a list item, used to de-duplicate in O(1)."""
+    if isinstance(item, BaseModel):
+        item = item.model_dump()
+    payload = json.dumps(item, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(field: str) -> TypeAdapter:
+    return TypeAdapter(TripPlan.model_fields[field].annotation)
+
+
+@lru_cache(maxsize=None)
+def _item_adapter(field: str) -> TypeAdapter:
+    # List fields are annotated as List[X]; validate one item at a time.
+    return TypeAdapter(TripPlan.model_fields[field].annotation.__args__[0])
+
+
+def validate_fields(update: dict) -> dict:
+    """
+    `update` with every value validated against its TripPlan field, so it can
+    be replaced into a plan without failing. Raises `ValidationError`.
+    """
+    return {
+        field: _field_adapter(field).validate_python(value)
+        for field, value in update.items()
+    }
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_jsonable(item) for item in value]
+    return value.model_dump() if isinstance(value, BaseModel) else value
+
+
+class PlanPatcher:
+    """
+    Applies changes to a TripPlan in place and records them as JSON-Patch
+    operations (`add` / `replace`), so callers can ship just the delta.
+
+    - scalar fields are validated and replaced only when they change,
+    - list fields are extended with items not already present (hashed keys),
+    - itinerary chunks are re-numbered to follow the last existing day.
+    """
+
+    def __init__(self, plan: TripPlan):
+        self.plan = plan
+        self.ops: list[dict] = []
+        self._keys: dict[str, set[str]] = {}
+
+    def _existing_keys(self, field: str) -> set[str]:
+        if field not in self._keys:
+            self._keys[field] = {_item_key(i) for i in getattr(self.plan, field)}
+        return self._keys[field]
+
+    def replace(self, field: str, value: Any):
+        value = _field_adapter(field).validate_python(value)
+        if getattr(self.plan, field) == value:
+            return
+        setattr(self.plan, field, value)
+        self.ops.append(
+            {"op": "replace", "path": f"/{field}", "value": _jsonable(value)}
+        )
+
+    def extend(self, field: str, items: list):
+        """Appends the items that aren't in the list yet."""
+        existing = self._existing_keys(field)
+        target = getattr(self.plan, field)
+        adapter = _item_adapter(field)
+        for raw in items:
+            item = adapter.validate_python(raw)
+            key = _item_key(item)
+            if key in existing:
+                continue
+            existing.add(key)
+            target.append(item)
+            self.ops.append(
+                {"op": "add", "path": f"/{field}/-", "value": _jsonable(item)}
+            )
+
+    def append_itinerary(self, days: list):
+        """Re-numbers a chunk of days to follow the existing itinerary."""
+        itinerary = self.plan.itinerary
+        # Find the last day number in the existing itinerary
+        last_day = itinerary[-1].day if itinerary else 0
+        adapter = _item_adapter("itinerary")
+        for i, raw in enumerate(days):
+            day = adapter.validate_python(raw)
+            # Re-number the new chunk to be sequential
+            day.day = last_day + i + 1
+            itinerary.append(day)
+            self.ops.append(
+                {"op": "add", "path": "/itinerary/-", "value": day.model_dump()}
+            )
+        self._keys.pop("itinerary", None)
+
+    def apply_update(self, args: dict):
+        """
+        Applies the arguments of a PlanUpdater call: all of them, or none if
+        any is invalid (the ValidationError propagates).
+        """
+        # Validate everything first so a bad field can't leave a half-applied update.
+        staged = []
+        if args.get("itinerary"):
+            adapter = _item_adapter("itinerary")
+            days = [adapter.validate_python(day) for day in args["itinerary"]]
+            staged.append((self.append_itinerary, days))
+        for key, value in args.items():
+            if key == "itinerary" or value is None or key not in TripPlan.model_fields:
+                continue
+            if isinstance(getattr(self.plan, key), list) and isinstance(value, list):
+                adapter = _item_adapter(key)
+                items = [adapter.validate_python(item) for item in value]
+                staged.append((partial(self.extend, key), items))
+            else:
+                value = _field_adapter(key).validate_python(value)
+                staged.append((partial(self.replace, key), value))
+        for apply, value in staged:
+            apply(value)
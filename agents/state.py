@@ -1,13 +1,44 @@
 # agents/state.py
-from typing import Annotated
+from typing import Annotated, Optional
 from typing_extensions import TypedDict
 from langgraph.graph.message import add_messages
 from langchain_core.messages import BaseMessage
 from database.models import TripPlan
 
 
+def collect_city_itineraries(
+    existing: Optional[list[dict]], new: Optional[list[dict]]
+) -> list[dict]:
+    """Accumulates per-city results from the itinerary fan-out. `None` clears it."""
+    if new is None:
+        return []
+    return (existing or []) + new
+
+
+def collect_plan_patch(
+    existing: Optional[list[dict]], new: Optional[list[dict]]
+) -> list[dict]:
+    """Accumulates JSON-Patch operations applied to the plan. `None` clears it."""
+    if new is None:
+        return []
+    return (existing or []) + new
+
+
+def count_llm_calls(existing: Optional[int], new: Optional[int]) -> int:
+    """Sums LLM calls made by the nodes. `None` resets the counter for a new request."""
+    if new is None:
+        return 0
+    return (existing or 0) + new
+
+
 class TripState(TypedDict):
     # The `add_messages` function defines how messages are added to the state.
     messages: Annotated[list[BaseMessage], add_messages]
     # This is our structured plan that the agent will fill out.
     plan: TripPlan
+    # Per-city itineraries produced by the parallel fan-out, waiting to be joined.
+    city_itineraries: Annotated[list[dict], collect_city_itineraries]
+    # Number of LLM calls made while handling the current request.
+    llm_calls: Annotated[int, count_llm_calls]
+    # JSON-Patch operations applied to `plan` while handling the current request.
+    plan_patch: Annotated[list[dict], collect_plan_patch]
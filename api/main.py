@@ -1,17 +1,42 @@
 # api/main.py
+import asyncio
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from api.routes import router as trip_router
 from core.config import settings  # To ensure settings are loaded
+from core.http_client import aclose_http_clients
+from core.metrics import render_metrics
+from database.job_queue import job_queue
+from services.job_worker import JobWorker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background jobs normally run in `python -m services.job_worker` processes;
+    # a single-process deployment can run them here instead.
+    worker = None
+    if settings.JOB_INPROCESS_WORKERS > 0:
+        worker = asyncio.create_task(
+            JobWorker(job_queue, settings.JOB_INPROCESS_WORKERS).run()
+        )
+    yield
+    if worker is not None:
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+    # Release pooled connections held by the tools
+    await aclose_http_clients()
+
+
 app = FastAPI(
     title="Advanced Trip Planner API",
     description="The backend for the best trip planner on Earth.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.include_router(trip_router, prefix="/api")
@@ -22,4 +47,12 @@ def read_root():
     return {"message": "Welcome to the Trip Planner API"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint: node/tool/LLM latency, tokens, cache and errors."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+
 # To run: uvicorn api.main:app --reload
+# Background jobs: python -m services.job_worker
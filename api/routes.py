@@ -1,13 +1,51 @@
 # api/routes.py
+import asyncio
+import json
 import logging
 from fastapi import APIRouter, HTTPException
-from services.graph_service import run_graph
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from services.admission import AdmissionRejected, admission
+from services.graph_service import arun_graph, astream_graph
+from core.cache import tool_cache
+from core.config import settings
+from core.llm_cache import llm_cache
+from core.singleflight import single_flight
+from core.http_client import get_pool_stats
+from core.resilience import get_provider_stats
+from database.job_queue import QUEUED, RUNNING, SUCCEEDED, job_queue
 from database.models import QueryRequest
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+async def _check_no_active_job(session_id: str):
+    """
+    A synchronous turn must not run next to a background job of the same
+    session (possibly in another worker process), or one would overwrite the
+    other's plan. The job queue is shared by every process, so ask it.
+    """
+    job = await asyncio.to_thread(job_queue.active_job, session_id)
+    if job is not None:
+        raise HTTPException(
+            status_code=409,
+            detail=(
+                f"Background job {job.id} for this session is still {job.status}; "
+                f"wait for it at /api/jobs/{job.id}."
+            ),
+            headers={"Retry-After": str(max(1, round(settings.JOB_POLL_INTERVAL)))},
+        )
+
+
+def _rejected(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=e.detail,
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 @router.post("/query")
 async def query_travel_agent(request: QueryRequest):
     try:
@@ -18,18 +56,172 @@ async def query_travel_agent(request: QueryRequest):
                 status_code=400, detail="Query and session_id are required."
             )
 
-        result = run_graph(request)
+        if request.background:
+            job = await asyncio.to_thread(job_queue.enqueue, request)
+            logger.info(f"Queued job {job.id} for session {request.session_id}")
+            return JSONResponse(status_code=202, content=_job_status(job.to_dict()))
+
+        await _check_no_active_job(request.session_id)
+        # One turn per session at a time, and a bounded number of runs overall
+        async with admission.admit(request.session_id):
+            result = await arun_graph(request)
 
         if not result:
             raise HTTPException(
                 status_code=404, detail="No results found for the given query."
             )
 
-        # Log the result for debugging
-        logger.info(f"Result for session {request.session_id}: {result}")
+        logger.info(
+            f"Result for session {request.session_id}: "
+            f"{len(result['plan_delta'])} plan changes, {result['llm_calls']} LLM calls"
+        )
 
         return result
 
+    except AdmissionRejected as e:
+        logger.warning(f"Rejected query for session {request.session_id}: {e}")
+        raise _rejected(e)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("Error handling query")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _job_status(job: dict) -> dict:
+    job_id = job["job_id"]
+    return {
+        **job,
+        "status_url": f"/api/jobs/{job_id}",
+        "result_url": f"/api/jobs/{job_id}/result",
+    }
+
+
+async def _get_job(job_id: str):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    """Status of a background run: queued, running, succeeded, failed or cancelled."""
+    return _job_status((await _get_job(job_id)).to_dict())
+
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    """
+    The `/query` response of a finished job. 202 while it's still queued or
+    running, 409 if it failed or was cancelled.
+    """
+    job = await _get_job(job_id)
+    if job.status in (QUEUED, RUNNING):
+        return JSONResponse(
+            status_code=202,
+            content=_job_status(job.to_dict()),
+            headers={"Retry-After": str(max(1, round(settings.JOB_POLL_INTERVAL)))},
+        )
+    if job.status != SUCCEEDED:
+        raise HTTPException(
+            status_code=409, detail=job.error or f"The job was {job.status}."
+        )
+    return job.result
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancels a queued job, or asks the worker to stop a running one."""
+    await _get_job(job_id)
+    job = await asyncio.to_thread(job_queue.cancel, job_id)
+    logger.info(f"Cancel requested for job {job_id}: now {job.status}")
+    return _job_status(job.to_dict())
+
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post("/query/stream")
+async def stream_travel_agent(request: QueryRequest):
+    """
+    Same as `/query`, but streams progress as Server-Sent Events:
+    node_start/node_end, tool_result, plan_delta, then final (or error).
+    """
+    if not request.query or not request.session_id:
+        raise HTTPException(
+            status_code=400, detail="Query and session_id are required."
+        )
+
+    logger.info(
+        f"Received streaming query for session {request.session_id}: {request.query}"
+    )
+
+    await _check_no_active_job(request.session_id)
+    # Admit before the response starts, so a saturated server can still say 429/503.
+    try:
+        ticket = await admission.acquire(request.session_id)
+    except AdmissionRejected as e:
+        logger.warning(f"Rejected streaming query for {request.session_id}: {e}")
+        raise _rejected(e)
+
+    async def event_stream():
+        try:
+            async for event in astream_graph(request):
+                yield _sse(event["event"], event["data"])
+        except Exception as e:
+            logger.exception("Error handling streaming query")
+            yield _sse("error", {"detail": str(e)})
+        finally:
+            admission.release(ticket)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also release if the stream never started (client gone early)
+        background=BackgroundTask(admission.release, ticket),
+    )
+
+
+@router.get("/stats/admission")
+async def admission_stats():
+    """Running and queued graph runs."""
+    return admission.stats()
+
+
+@router.get("/stats/jobs")
+async def job_stats():
+    """Background jobs by status."""
+    return await asyncio.to_thread(job_queue.stats)
+
+
+@router.get("/stats/http")
+async def http_pool_stats():
+    """Connection reuse statistics for the shared outbound HTTP client."""
+    return get_pool_stats()
+
+
+@router.get("/stats/providers")
+async def provider_stats():
+    """Circuit breaker state and rate-limit headroom per upstream API."""
+    return get_provider_stats()
+
+
+@router.get("/stats/cache")
+async def tool_cache_stats():
+    """Hit/miss counters for the tool result cache."""
+    return tool_cache.stats()
+
+
+@router.get("/stats/llm-cache")
+async def llm_cache_stats():
+    """Hit/miss counters and size of the generated itinerary/route cache."""
+    return llm_cache.stats()
+
+
+@router.get("/stats/single-flight")
+async def single_flight_stats():
+    """How many upstream tool/LLM calls were shared with concurrent callers."""
+    return single_flight.stats()
@@ -0,0 +1,135 @@
+# benchmarks/fake_llm.py
+import asyncio
+import json
+import re
+import time
+from typing import Any, Callable, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+# A step turns the messages the planner sees into its next reply.
+Step = Callable[[List[BaseMessage]], AIMessage]
+
+TRIP_REQUEST = re.compile(
+    r"(\d+)-day trip to (.+?) with interests in (.*?)\.?$", re.MULTILINE
+)
+
+# Cities the fake route generator picks for a region
+REGION_CITIES = {
+    "europe": [("Paris", "France"), ("Rome", "Italy"), ("Berlin", "Germany")],
+    "southeast asia": [
+        ("Bangkok", "Thailand"),
+        ("Hanoi", "Vietnam"),
+        ("Singapore", "Singapore"),
+    ],
+}
+
+
+def _fake_itinerary(duration_days: int, destination: str, interests: str) -> dict:
+    city = destination.split(",")[0]
+    return {
+        "itinerary_list": [
+            {
+                "day": day,
+                "title": f"Day {day} in {city}",
+                "activities": [
+                    f"Morning walk through the old quarter of {city}",
+                    f"Visit the best {interests or 'sights'} spots in {city}",
+                    f"Sunset viewpoint over {city}",
+                ],
+                "meals": {
+                    "breakfast": f"Cafe near the {city} market",
+                    "lunch": f"Street food tour in {city}",
+                    "dinner": f"Traditional restaurant in {city}",
+                },
+            }
+            for day in range(1, duration_days + 1)
+        ]
+    }
+
+
+def _fake_route(duration_days: int, region: str, interests: str) -> dict:
+    cities = REGION_CITIES.get(
+        region.strip().lower(), [(f"{region} City {i}", region) for i in (1, 2, 3)]
+    )
+    cities = cities[: max(1, min(len(cities), duration_days))]
+    base, extra = divmod(duration_days, len(cities))
+    return {
+        "route_plan": [
+            {"city": city, "country": country, "num_days": base + (i < extra)}
+            for i, (city, country) in enumerate(cities)
+        ]
+    }
+
+
+STRUCTURED_OUTPUTS = {"Itinerary": _fake_itinerary, "Route": _fake_route}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Chat model stand-in for benchmarks. Planner turns replay a script of steps;
+    structured-output calls (itineraries, routes) are synthesized from the prompt.
+    Each call sleeps `latency` seconds to mimic a provider round trip.
+    """
+
+    latency: float = 0.0
+    script: List[Any] = []
+    cursor: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def start(self, script: List[Step]):
+        """Loads the script for the next trip."""
+        self.script = list(script)
+        self.cursor = 0
+
+    def _reply(self, messages: List[BaseMessage], schema: Optional[str]) -> AIMessage:
+        if schema:
+            request = next(
+                m.content for m in reversed(messages) if isinstance(m, HumanMessage)
+            )
+            days, destination, interests = TRIP_REQUEST.search(request).groups()
+            content = STRUCTURED_OUTPUTS[schema](int(days), destination, interests)
+            message = AIMessage(content=json.dumps(content))
+        elif self.cursor < len(self.script):
+            message = self.script[self.cursor](messages)
+            self.cursor += 1
+        else:
+            message = AIMessage(content="Your trip plan is ready. Enjoy the journey!")
+        input_tokens = sum(len(str(m.content)) // 4 + 1 for m in messages)
+        output_tokens = len(str(message.content) + str(message.tool_calls)) // 4 + 1
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return message
+
+    def _generate(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        message = self._reply(messages, kwargs.get("structured_schema"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        message = self._reply(messages, kwargs.get("structured_schema"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def bind_tools(self, tools, **kwargs):
+        # The script already knows which tools to call.
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        def parse(message: AIMessage):
+            return schema.model_validate_json(message.content)
+
+        return self.bind(structured_schema=schema.__name__) | RunnableLambda(parse)
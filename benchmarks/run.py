@@ -0,0 +1,344 @@
+# benchmarks/run.py
+"""
+Offline benchmark: runs `agents.graph.graph` end to end with a scripted chat
+model and local stub APIs, so nothing is billed and results are repeatable.
+
+Per trip it records wall time per node and per tool, LLM calls and tokens,
+checkpoint/response serialization cost and peak Python memory, and writes
+everything (plus the git commit) to a JSON file for comparing commits.
+
+    python -m benchmarks.run --repeat 5 --output benchmark_results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .fake_llm import ScriptedChatModel
+from .scenarios import SCENARIOS
+from .stub_apis import StubAPIServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _timer() -> dict:
+    return {"calls": 0, "total_ms": 0.0}
+
+
+class TimingCallback(BaseCallbackHandler):
+    """Collects wall time per graph node, per tool and per LLM call."""
+
+    run_inline = True
+
+    def __init__(self, node_names: set[str]):
+        self.node_names = node_names
+        self.nodes: dict[str, dict] = defaultdict(_timer)
+        self.tools: dict[str, dict] = defaultdict(_timer)
+        self.llm: dict[str, dict] = defaultdict(_timer)
+        self.tokens = {"input": 0, "output": 0}
+        self._open: dict = {}
+
+    def _start(self, run_id, bucket: dict, name: str):
+        self._open[run_id] = (bucket, name, time.perf_counter())
+
+    def _finish(self, run_id):
+        if entry := self._open.pop(run_id, None):
+            bucket, name, started = entry
+            bucket[name]["calls"] += 1
+            bucket[name]["total_ms"] += (time.perf_counter() - started) * 1000
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        name = kwargs.get("name")
+        if name in self.node_names and (metadata or {}).get("langgraph_node") == name:
+            self._start(run_id, self.nodes, name)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._start(run_id, self.tools, kwargs.get("name") or serialized["name"])
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, metadata=None, **kwargs
+    ):
+        self._start(run_id, self.llm, (metadata or {}).get("langgraph_node", "other"))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id)
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(generation.message, "usage_metadata", None) or {}
+                self.tokens["input"] += usage.get("input_tokens", 0)
+                self.tokens["output"] += usage.get("output_tokens", 0)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def report(self) -> dict:
+        def rounded(bucket):
+            return {
+                name: {"calls": t["calls"], "total_ms": round(t["total_ms"], 2)}
+                for name, t in sorted(bucket.items())
+            }
+
+        return {
+            "nodes": rounded(self.nodes),
+            "tools": rounded(self.tools),
+            "llm": {
+                "calls": sum(t["calls"] for t in self.llm.values()),
+                "by_node": rounded(self.llm),
+                "tokens": dict(self.tokens),
+            },
+        }
+
+
+class TimedSerializer:
+    """Wraps the checkpointer's serializer to measure what checkpointing costs."""
+
+    def __init__(self, serde):
+        self.serde = serde
+        self.reset()
+
+    def reset(self):
+        self.stats = {"dumps": 0, "dumps_ms": 0.0, "loads": 0, "loads_ms": 0.0}
+        self.stats.update(bytes=0)
+
+    def dumps_typed(self, obj):
+        started = time.perf_counter()
+        type_, data = self.serde.dumps_typed(obj)
+        self.stats["dumps"] += 1
+        self.stats["dumps_ms"] += (time.perf_counter() - started) * 1000
+        self.stats["bytes"] += len(data or b"")
+        return type_, data
+
+    def loads_typed(self, data):
+        started = time.perf_counter()
+        obj = self.serde.loads_typed(data)
+        self.stats["loads"] += 1
+        self.stats["loads_ms"] += (time.perf_counter() - started) * 1000
+        return obj
+
+    def __getattr__(self, name):
+        return getattr(self.serde, name)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _configure_environment(args, stubs: StubAPIServer, workdir: str):
+    """Points settings at the stubs and throwaway storage; must run before app imports."""
+    os.environ.update(stubs.settings_env())
+    for key in (
+        "GOOGLE_API_KEY",
+        "WEATHER_API_KEY",
+        "EXCHANGE_RATES_API_KEY",
+        "RAPIDAPI_KEY",
+    ):
+        os.environ.setdefault(key, "benchmark")
+    os.environ.update(
+        {
+            "MODEL_PROVIDER": "scripted",
+            "TOOL_CACHE_BACKEND": "memory",
+            "LLM_CACHE_PATH": os.path.join(workdir, "llm_cache.db"),
+            "CHECKPOINT_PATH": os.path.join(workdir, "checkpoints.db"),
+            "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'trip_planner.db')}",
+            "ITINERARY_FAN_OUT": str(not args.no_fan_out),
+        }
+    )
+
+
+async def _run_trip(app, scenario: dict, measure_memory: bool) -> dict:
+    model, graph, serializer = app["model"], app["graph"], app["serializer"]
+    if not app["warm"]:
+        app["tool_cache"].clear()
+        app["llm_cache"].clear()
+    model.start(scenario["script"])
+    serializer.reset()
+    callback = TimingCallback(app["node_names"])
+    session_id = f"bench-{uuid.uuid4().hex[:8]}"
+    state = {
+        "messages": [("human", scenario["query"])],
+        "plan": app["TripPlan"](session_id=session_id),
+        "city_itineraries": None,
+        "llm_calls": None,
+        "plan_patch": None,
+    }
+    config = {
+        "recursion_limit": 50,
+        "configurable": {"thread_id": session_id},
+        "callbacks": [callback],
+    }
+
+    if measure_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    final_state = await graph.ainvoke(state, config=config)
+    wall_ms = (time.perf_counter() - started) * 1000
+    peak_kb = None
+    if measure_memory:
+        peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+
+    serialize_started = time.perf_counter()
+    response = json.dumps(
+        {
+            "plan": final_state["plan"].model_dump(),
+            "plan_delta": final_state.get("plan_patch") or [],
+        }
+    )
+    response_ms = (time.perf_counter() - serialize_started) * 1000
+
+    plan = final_state["plan"]
+    return {
+        "wall_ms": round(wall_ms, 2),
+        **callback.report(),
+        "llm_calls_reported": final_state.get("llm_calls", 0),
+        "serialization": {
+            "checkpoint_dumps": serializer.stats["dumps"],
+            "checkpoint_dumps_ms": round(serializer.stats["dumps_ms"], 2),
+            "checkpoint_loads": serializer.stats["loads"],
+            "checkpoint_loads_ms": round(serializer.stats["loads_ms"], 2),
+            "checkpoint_bytes": serializer.stats["bytes"],
+            "response_ms": round(response_ms, 2),
+            "response_bytes": len(response),
+        },
+        "peak_memory_kb": peak_kb,
+        "plan": {
+            "status": plan.status,
+            "itinerary_days": len(plan.itinerary),
+            "route_stops": len(plan.route),
+        },
+    }
+
+
+def _summary(runs: list[dict], memory_run: dict) -> dict:
+    walls = [run["wall_ms"] for run in runs]
+    return {
+        "wall_ms_median": round(statistics.median(walls), 2),
+        "wall_ms_min": min(walls),
+        "wall_ms_max": max(walls),
+        "llm_calls": runs[-1]["llm"]["calls"],
+        "peak_memory_kb": memory_run["peak_memory_kb"],
+    }
+
+
+async def _benchmark(args, app) -> dict:
+    from core.http_client import aclose_http_clients
+
+    results = {}
+    try:
+        for name in args.scenario or SCENARIOS:
+            scenario = SCENARIOS[name]
+            runs = [
+                await _run_trip(app, scenario, measure_memory=False)
+                for _ in range(args.repeat)
+            ]
+            # tracemalloc slows everything down, so memory gets its own run
+            memory_run = await _run_trip(app, scenario, measure_memory=True)
+            results[name] = {"summary": _summary(runs, memory_run), "runs": runs}
+            print(f"{name}: {json.dumps(results[name]['summary'])}")
+    finally:
+        await aclose_http_clients()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline trip planner benchmark")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per trip")
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.05, help="seconds per LLM call"
+    )
+    parser.add_argument(
+        "--api-latency", type=float, default=0.02, help="seconds per API request"
+    )
+    parser.add_argument(
+        "--no-fan-out", action="store_true", help="plan route cities one by one"
+    )
+    parser.add_argument(
+        "--warm", action="store_true", help="keep tool/LLM caches between runs"
+    )
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    stubs = StubAPIServer(latency=args.api_latency).start()
+    with tempfile.TemporaryDirectory() as workdir:
+        _configure_environment(args, stubs, workdir)
+
+        # Imported only now so the settings pick up the overrides above.
+        from agents.graph import graph
+        from core.cache import tool_cache
+        from core.llm_cache import llm_cache
+        from core.model_loader import PROVIDERS
+        from database.checkpointer import checkpointer
+        from database.models import TripPlan
+
+        model = ScriptedChatModel(latency=args.llm_latency)
+        PROVIDERS["scripted"] = lambda: model
+        serializer = TimedSerializer(checkpointer.serde)
+        checkpointer.serde = serializer
+        app = {
+            "graph": graph,
+            "model": model,
+            "serializer": serializer,
+            "tool_cache": tool_cache,
+            "llm_cache": llm_cache,
+            "TripPlan": TripPlan,
+            "node_names": {n for n in graph.nodes if not n.startswith("__")},
+            "warm": args.warm,
+        }
+        scenarios = asyncio.run(_benchmark(args, app))
+    stubs.stop()
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "repeat": args.repeat,
+            "llm_latency": args.llm_latency,
+            "api_latency": args.api_latency,
+            "fan_out": not args.no_fan_out,
+            "warm_cache": args.warm,
+            "stub_requests": stubs.requests,
+        },
+        "scenarios": scenarios,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
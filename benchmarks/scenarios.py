@@ -0,0 +1,222 @@
+# benchmarks/scenarios.py
+import json
+import uuid
+from datetime import date, timedelta
+from typing import Any, List
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+
+from .fake_llm import Step
+
+
+def _call(name: str, **args) -> dict:
+    return {"name": name, "args": args}
+
+
+def _outputs(messages: List[BaseMessage], name: str) -> List[Any]:
+    """Parsed results of every `name` call in the latest AI message that made one."""
+    results = {
+        m.tool_call_id: m.content for m in messages if isinstance(m, ToolMessage)
+    }
+    for message in reversed(messages):
+        calls = [c for c in getattr(message, "tool_calls", []) if c["name"] == name]
+        if calls:
+            outputs = []
+            for call in calls:
+                content = results.get(call["id"], "null")
+                try:
+                    outputs.append(json.loads(content))
+                except json.JSONDecodeError:
+                    outputs.append(content)
+            return outputs
+    return []
+
+
+def _airport_code(messages: List[BaseMessage], city: str) -> str:
+    for airports in _outputs(messages, "airport_lookup"):
+        for airport in airports if isinstance(airports, list) else []:
+            if city.lower() == str(airport.get("city", "")).lower():
+                return airport["iata"]
+    return city[:3].upper()
+
+
+def tool_calls(*calls) -> Step:
+    """A step that issues `calls` (dicts, or callables building them from messages)."""
+
+    def step(messages: List[BaseMessage]) -> AIMessage:
+        resolved = []
+        for call in calls:
+            resolved.extend(call(messages) if callable(call) else [call])
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {**call, "id": f"call_{uuid.uuid4().hex[:12]}"} for call in resolved
+            ],
+        )
+
+    return step
+
+
+def _single_city_profile(messages):
+    # Airport codes are filled in by the controller from the offline index.
+    return [
+        _call(
+            "PlanUpdater",
+            origin_city="Delhi",
+            destination="Goa",
+            duration_days=5,
+            interests=["beaches", "food"],
+        )
+    ]
+
+
+def _single_city_bookings(messages):
+    # Results are recorded right away: once consumed they are trimmed from the prompt.
+    # `route_hotel_search` already saved the hotels.
+    flights = _outputs(messages, "flight_search")[0]
+    return [
+        _call(
+            "PlanUpdater",
+            flights=[f for f in flights if "error" not in f],
+            budget=[
+                {"category": "Flights", "estimated_cost": 9000, "currency": "INR"},
+                {"category": "Hotels", "estimated_cost": 36000, "currency": "INR"},
+                {"category": "Food", "estimated_cost": 10000, "currency": "INR"},
+            ],
+        )
+    ]
+
+
+def _single_city_itinerary(messages):
+    return [
+        _call(
+            "PlanUpdater",
+            itinerary=_outputs(messages, "generate_itinerary")[0],
+            status="complete",
+        )
+    ]
+
+
+def _planned_route(messages) -> List[dict]:
+    return next(
+        call["args"]["route"]
+        for m in reversed(messages)
+        for call in getattr(m, "tool_calls", [])
+        if call["name"] == "PlanUpdater" and call["args"].get("route")
+    )
+
+
+def _multi_city_profile(messages):
+    return [
+        _call(
+            "PlanUpdater",
+            origin_city="Delhi",
+            destination="Europe",
+            duration_days=9,
+            interests=["food", "history"],
+            route=_outputs(messages, "create_multicity_route")[0],
+        )
+    ]
+
+
+def _multi_city_research(messages):
+    start_date = (date.today() + timedelta(days=7)).isoformat()
+    # Both route tools cover every stop in one call; hotels are saved to the plan.
+    return [
+        _call("airport_lookup", query=_planned_route(messages)[0]["city"]),
+        _call("route_weather", start_date=start_date),
+        _call("route_hotel_search", start_date=start_date, num_adults=2),
+    ]
+
+
+def _multi_city_flights(messages):
+    first_city = _planned_route(messages)[0]["city"]
+    return [
+        _call(
+            "flight_search",
+            origin_iata="DEL",
+            destination_iata=_airport_code(messages, first_city),
+            departure_date="2025-12-10",
+        ),
+        _call(
+            "convert_budget",
+            items=[
+                {"category": "Hotels", "estimated_cost": 1100, "currency": "EUR"},
+                {"category": "Food", "estimated_cost": 450, "currency": "EUR"},
+                {"category": "Visa", "estimated_cost": 8000, "currency": "INR"},
+            ],
+            target_currency="INR",
+        ),
+    ]
+
+
+def _multi_city_plan(messages):
+    flights = _outputs(messages, "flight_search")[0]
+    return [
+        _call(
+            "PlanUpdater",
+            flights=[f for f in flights if "error" not in f],
+            budget=[
+                {"category": "Flights", "estimated_cost": 60000, "currency": "INR"},
+                {"category": "Hotels", "estimated_cost": 90000, "currency": "INR"},
+            ],
+            status="complete",
+        )
+    ]
+
+
+# Each scenario is one user query plus the planner turns the fake model replays.
+SCENARIOS = {
+    "single_city": {
+        "query": "Plan a 5-day trip from Delhi to Goa in December. We love beaches and food.",
+        "script": [
+            tool_calls(_call("weather_info", location="Goa")),
+            tool_calls(_single_city_profile),
+            tool_calls(
+                _call(
+                    "flight_search",
+                    origin_iata="DEL",
+                    destination_iata="GOI",
+                    departure_date="2025-12-10",
+                ),
+                _call("route_hotel_search", start_date="2025-12-10", num_adults=2),
+                _call("search_place", query="tourist attractions in Goa"),
+                _call(
+                    "currency_converter",
+                    amount=50000,
+                    from_currency="INR",
+                    to_currency="USD",
+                ),
+            ),
+            tool_calls(_single_city_bookings),
+            tool_calls(
+                _call(
+                    "generate_itinerary",
+                    destination="Goa",
+                    duration_days=5,
+                    interests=["beaches", "food"],
+                )
+            ),
+            tool_calls(_single_city_itinerary),
+        ],
+    },
+    "multi_city": {
+        "query": "Plan a 9-day trip across Europe from Delhi. We're into food and history.",
+        "script": [
+            tool_calls(
+                _call(
+                    "create_multicity_route",
+                    region="Europe",
+                    duration_days=9,
+                    interests=["food", "history"],
+                    start_city="Delhi",
+                    end_city="Delhi",
+                )
+            ),
+            tool_calls(_multi_city_profile),
+            tool_calls(_multi_city_research),
+            tool_calls(_multi_city_flights),
+            tool_calls(_multi_city_plan),
+        ],
+    },
+}
@@ -0,0 +1,205 @@
+# benchmarks/stub_apis.py
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Rough rates against USD, enough for plausible conversions
+USD_RATES = {"USD": 1.0, "INR": 83.2, "EUR": 0.92, "GBP": 0.79, "JPY": 151.0}
+
+
+def _weather(path: list[str], query: dict) -> dict:
+    if path == ["forecast.json"]:
+        # `days` daily forecasts starting today, like the real API
+        days = min(int(query.get("days", 1)), 14)
+        return {
+            "location": {"name": query.get("q", "Unknown")},
+            "forecast": {
+                "forecastday": [
+                    {
+                        "date": (date.today() + timedelta(days=i)).isoformat(),
+                        "day": {
+                            "maxtemp_c": 29.0,
+                            "mintemp_c": 21.5,
+                            "daily_chance_of_rain": 20,
+                            "condition": {"text": "Partly cloudy"},
+                        },
+                    }
+                    for i in range(days)
+                ]
+            },
+        }
+    return {
+        "location": {"name": query.get("q", "Unknown")},
+        "current": {
+            "temp_c": 27.0,
+            "feelslike_c": 29.5,
+            "humidity": 64,
+            "condition": {"text": "Partly cloudy"},
+        },
+    }
+
+
+def _places(path: list[str], query: dict) -> dict:
+    text = query.get("query", "")
+    subject = text.split(" in ")[-1].title()
+    if "airport" in text.lower():
+        code = subject.replace(" ", "")[:3].upper()
+        return {
+            "results": [
+                {
+                    "name": f"{subject} International Airport ({code})",
+                    "formatted_address": f"{subject}",
+                    "rating": 4.1,
+                    "place_id": f"airport-{code}",
+                }
+            ]
+        }
+    return {
+        "results": [
+            {
+                "name": f"{subject} attraction {i}",
+                "formatted_address": f"Street {i}, {subject}",
+                "rating": 4.0 + i / 10,
+                "place_id": f"place-{subject}-{i}",
+            }
+            for i in range(1, 6)
+        ]
+    }
+
+
+def _fx(path: list[str], query: dict) -> dict:
+    # /<key>/pair/<from>/<to>/<amount> or /<key>/latest/<base>
+    if len(path) >= 5 and path[1] == "pair":
+        source, target, amount = path[2], path[3], float(path[4])
+        if source not in USD_RATES or target not in USD_RATES:
+            return {"result": "error", "error-type": "unsupported-code"}
+        rate = USD_RATES[target] / USD_RATES[source]
+        return {
+            "result": "success",
+            "conversion_rate": rate,
+            "conversion_result": amount * rate,
+        }
+    if len(path) >= 3 and path[1] == "latest":
+        base = path[2]
+        if base not in USD_RATES:
+            return {"result": "error", "error-type": "unsupported-code"}
+        return {
+            "result": "success",
+            "base_code": base,
+            "conversion_rates": {
+                code: rate / USD_RATES[base] for code, rate in USD_RATES.items()
+            },
+        }
+    return {"result": "error", "error-type": "malformed-request"}
+
+
+def _flights(path: list[str], query: dict) -> dict:
+    date = query.get("departure_date", "2025-01-01")
+    return {
+        "flights": [
+            {
+                "airline": {"name": airline},
+                "price": {"amount": 4500 + 750 * i, "currency": "INR"},
+                "departure": {"scheduled_time": f"{date}T0{6 + 2 * i}:00:00"},
+                "arrival": {"scheduled_time": f"{date}T0{8 + 2 * i}:30:00"},
+                "stops": [] if i < 2 else [{"iata": "BOM"}],
+            }
+            for i, airline in enumerate(["IndiGo", "Air India", "Vistara", "Akasa"])
+        ]
+    }
+
+
+def _hotels(path: list[str], query: dict) -> dict:
+    city = query.get("dest_name", "City")
+    return {
+        "result": [
+            {
+                "hotel_name": f"{city} {name}",
+                "class": stars,
+                "min_total_price": price,
+                "currency_code": "INR",
+                "review_score": score,
+            }
+            for name, stars, price, score in [
+                ("Grand Palace", 5.0, 14500, 9.1),
+                ("Riverside Inn", 4.0, 7200, 8.6),
+                ("Backpackers Hub", 2.0, 1800, 8.2),
+                ("Central Suites", 3.0, 4600, 7.9),
+            ]
+        ]
+    }
+
+
+# First path segment -> handler; the rest of the path is passed through
+ROUTES = {
+    "weather": _weather,
+    "places": _places,
+    "fx": _fx,
+    "flights": _flights,
+    "hotels": _hotels,
+}
+
+
+class StubAPIServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the weather, places, FX, flight and hotel APIs.
+    Every response is delayed by `latency` seconds to mimic a network hop.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.latency = latency
+        self.requests = 0
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def settings_env(self) -> dict[str, str]:
+        """Environment overrides that point the tools at this server."""
+        return {
+            "WEATHER_API_BASE_URL": f"{self.base_url}/weather",
+            "PLACES_API_BASE_URL": f"{self.base_url}/places",
+            "EXCHANGE_RATES_API_BASE_URL": f"{self.base_url}/fx",
+            "FLIGHT_API_BASE_URL": f"{self.base_url}/flights",
+            "HOTEL_API_BASE_URL": f"{self.base_url}/hotels",
+        }
+
+    def start(self) -> "StubAPIServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: StubAPIServer
+
+    def do_GET(self):
+        self.server.requests += 1
+        url = urlparse(self.path)
+        segments = [s for s in url.path.split("/") if s]
+        handler = ROUTES.get(segments[0]) if segments else None
+        if handler is None:
+            self.send_error(404)
+            return
+        time.sleep(self.server.latency)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        body = json.dumps(handler(segments[1:], query)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,215 @@
+# core/airport_index.py
+import csv
+import logging
+import re
+import unicodedata
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_AIRPORTS = Path(__file__).resolve().parent.parent / "data" / "airports.csv"
+
+# Dropped from names and queries alike, so "airport in Goa" and "Goa city"
+# find "Goa", and "New York City" finds "New York".
+_STOPWORDS = {"airport", "airports", "international", "intl", "in", "near", "city"}
+_IATA = re.compile(r"^[A-Za-z]{3}$")
+
+EXACT, IATA, PREFIX, FUZZY = "exact", "iata", "prefix", "fuzzy"
+
+
+@dataclass(frozen=True)
+class Airport:
+    iata: str
+    name: str
+    city: str
+    country: str
+    latitude: float
+    longitude: float
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def normalize(text: str) -> str:
+    """Lowercase ASCII words without punctuation, accents or stopwords."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return " ".join(w for w in words if w not in _STOPWORDS)
+
+
+def _deletions(word: str, edits: int) -> set[str]:
+    """`word` with up to `edits` characters removed."""
+    found = frontier = {word}
+    for _ in range(edits):
+        frontier = {w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))}
+        found = found | frontier
+    return found
+
+
+def _edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        row = [i]
+        for j, other in enumerate(b, 1):
+            row.append(
+                min(row[j - 1] + 1, previous[j] + 1, previous[j - 1] + (char != other))
+            )
+        previous = row
+    return previous[-1]
+
+
+class _Node:
+    __slots__ = ("children", "key", "airports")
+
+    def __init__(self):
+        self.children: dict[str, "_Node"] = {}
+        self.key: str | None = None
+        self.airports: list[int] = []
+
+
+class AirportIndex:
+    """
+    In-memory index of airports by city, alias and airport name.
+
+    - exact names and IATA codes are a trie walk,
+    - prefixes ("bang" -> Bangkok, Bangalore) collect the subtree under the walk,
+    - typos ("Amsterdm") go through a symmetric-deletion table: every key is
+      stored under its variants with up to AIRPORT_FUZZY_MAX_EDITS characters
+      deleted, so a lookup only generates the query's own deletions and checks
+      the edit distance of the few keys they hit.
+
+    Airports of one city keep their file order, so the main one comes first.
+    """
+
+    def __init__(self, airports: list[Airport], aliases: list[list[str]]):
+        self.airports = airports
+        self._by_code = {a.iata: i for i, a in enumerate(airports)}
+        self._root = _Node()
+        self._deletions: dict[str, set[str]] = {}
+        for i, airport in enumerate(airports):
+            # Airport names are long; typos are only looked for in place names.
+            self._insert(normalize(airport.name), i, fuzzy=False)
+            for name in (airport.city, *aliases[i]):
+                self._insert(normalize(name), i)
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "AirportIndex":
+        airports, aliases = [], []
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                airports.append(
+                    Airport(
+                        iata=row["iata"].upper(),
+                        name=row["name"],
+                        city=row["city"],
+                        country=row["country"],
+                        latitude=float(row["latitude"]),
+                        longitude=float(row["longitude"]),
+                    )
+                )
+                aliases.append([a for a in row.get("aliases", "").split("|") if a])
+        logger.info(f"Loaded {len(airports)} airports from {path}")
+        return cls(airports, aliases)
+
+    def _insert(self, key: str, airport: int, fuzzy: bool = True):
+        if not key:
+            return
+        node = self._root
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+        # A key is among its own deletions, so this skips keys already indexed.
+        if fuzzy and key not in self._deletions.get(key, ()):
+            for variant in _deletions(key, settings.AIRPORT_FUZZY_MAX_EDITS):
+                self._deletions.setdefault(variant, set()).add(key)
+        node.key = key
+        if airport not in node.airports:
+            node.airports.append(airport)
+
+    def _walk(self, key: str) -> _Node | None:
+        node = self._root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _prefixed(self, node: _Node) -> list[tuple[int, str, list[int]]]:
+        """(length, key, airports) of every key in the subtree."""
+        found, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            if node.key:
+                found.append((len(node.key), node.key, node.airports))
+            stack.extend(node.children.values())
+        return found
+
+    def _fuzzy(self, key: str, max_edits: int) -> list[tuple[int, str, list[int]]]:
+        """(distance, key, airports) of every key within `max_edits` of `key`."""
+        candidates = set()
+        for variant in _deletions(key, max_edits):
+            candidates |= self._deletions.get(variant, set())
+        found = []
+        for candidate in candidates:
+            distance = _edit_distance(key, candidate)
+            if distance <= max_edits:
+                found.append((distance, candidate, self._walk(candidate).airports))
+        return found
+
+    def _ranked(self, matches: list[tuple[int, str, list[int]]]) -> list[int]:
+        ordered = {}
+        for _, _, airports in sorted(matches, key=lambda m: (m[0], min(m[2]))):
+            ordered.update(dict.fromkeys(airports))
+        return list(ordered)
+
+    def search(self, query: str, limit: int = 5) -> list[tuple[Airport, str]]:
+        """
+        Airports for a city, alias, airport name or IATA code, each with how it
+        matched (exact, iata, prefix or fuzzy). Only the first comma-separated
+        part is looked up, so "Gwalior, India" works.
+        """
+        text = query.split(",")[0].strip()
+        key = normalize(text)
+        results: list[tuple[int, str]] = []
+        node = self._walk(key) if key else None
+        if node is not None and node.key:
+            results += [(a, EXACT) for a in node.airports]
+        if _IATA.match(text) and (code := self._by_code.get(text.upper())) is not None:
+            results.append((code, IATA))
+        if not results and node is not None:
+            results += [(a, PREFIX) for a in self._ranked(self._prefixed(node))]
+        if not results and len(key) > 2:
+            max_edits = min(settings.AIRPORT_FUZZY_MAX_EDITS, len(key) // 5 + 1)
+            results += [(a, FUZZY) for a in self._ranked(self._fuzzy(key, max_edits))]
+        seen, unique = set(), []
+        for airport, match in results:
+            if airport not in seen:
+                seen.add(airport)
+                unique.append((self.airports[airport], match))
+        return unique[:limit]
+
+    def resolve(self, place: str) -> Airport | None:
+        """
+        The main airport of a place, only when it is named exactly (city, alias
+        or airport name) or given as an IATA code in capitals ("DEL"). Prefix
+        and typo matches are left to `search()`: a near miss is often another
+        place ("Siena" is one edit away from "Vienna").
+        """
+        text = place.split(",")[0].strip()
+        key = normalize(text)
+        node = self._walk(key) if key else None
+        if node is not None and node.key:
+            return self.airports[node.airports[0]]
+        if _IATA.match(text) and text.isupper():
+            if (code := self._by_code.get(text)) is not None:
+                return self.airports[code]
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_airport_index() -> AirportIndex:
+    """The process-wide index, loaded on first use."""
+    return AirportIndex.from_csv(settings.AIRPORT_DATA_PATH or BUNDLED_AIRPORTS)
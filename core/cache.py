@@ -0,0 +1,340 @@
+# core/cache.py
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable
+
+from .config import settings
+from .metrics import record_cache
+from .resilience import ProviderUnavailable
+from .singleflight import single_flight
+
+logger = logging.getLogger(__name__)
+
+# What lookups return when nothing usable is cached (`None` is a valid value)
+MISSING = object()
+
+
+def normalize(value: Any) -> Any:
+    """
+    Normalizes tool arguments so that trivially different calls share a cache entry,
+    e.g. `weather_info("Paris ")` and `weather_info("paris")`.
+    """
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {str(k): normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple, set)):
+        items = [normalize(v) for v in value]
+        if isinstance(value, set) or all(isinstance(i, str) for i in items):
+            items.sort()
+        return items
+    if hasattr(value, "model_dump"):
+        return normalize(value.model_dump())
+    return value
+
+
+def make_key(namespace: str, arguments: dict) -> str:
+    payload = json.dumps(normalize(arguments), sort_keys=True, default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class CacheBackend(ABC):
+    """
+    Stores JSON-serializable values with a TTL and an LRU size bound. Expired
+    entries are kept for another `stale_ttl` seconds, readable only with
+    `allow_stale`, so a result can still be served while its API is down.
+    """
+
+    @abstractmethod
+    def get(self, key: str, allow_stale: bool = False) -> Any:
+        """Returns the cached value, or `MISSING` if absent or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float): ...
+
+    @abstractmethod
+    def clear(self): ...
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache. Values are stored serialized so callers can't mutate them."""
+
+    def __init__(self, max_entries: int, stale_ttl: float = 0):
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, allow_stale: bool = False) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, payload = entry
+            now = time.time()
+            if expires_at + self.stale_ttl < now:
+                del self._data[key]
+                return MISSING
+            if expires_at < now and not allow_stale:
+                return MISSING
+            self._data.move_to_end(key)
+        return json.loads(payload)
+
+    def set(self, key: str, value: Any, ttl: float):
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._data[key] = (time.time() + ttl, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    LRU cache in a local SQLite file, so several uvicorn workers on one host
+    share their results. Each thread gets its own connection.
+    """
+
+    def __init__(self, path: str, max_entries: int, stale_ttl: float = 0):
+        self.path = path
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, allow_stale: bool = False) -> Any:
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return MISSING
+        payload, expires_at = row
+        if expires_at + self.stale_ttl < now:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return MISSING
+        if expires_at < now and not allow_stale:
+            return MISSING
+        conn.execute("UPDATE cache SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(payload)
+
+    def set(self, key: str, value: Any, ttl: float):
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at, last_access)"
+            " VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, default=str), now + ttl, now),
+        )
+        # Drop rows past their stale window first, then the least recently used
+        # ones over the bound.
+        conn.execute("DELETE FROM cache WHERE expires_at < ?", (now - self.stale_ttl,))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            " SELECT key FROM cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        self._connect().execute("DELETE FROM cache")
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def get_cache_backend() -> CacheBackend:
+    """Builds the backend selected by `TOOL_CACHE_BACKEND` ('memory' or 'sqlite')."""
+    backend = settings.TOOL_CACHE_BACKEND.lower()
+    if backend == "memory":
+        return MemoryCacheBackend(
+            settings.TOOL_CACHE_MAX_ENTRIES, settings.TOOL_CACHE_STALE_TTL
+        )
+    if backend == "sqlite":
+        return SQLiteCacheBackend(
+            settings.TOOL_CACHE_PATH,
+            settings.TOOL_CACHE_MAX_ENTRIES,
+            settings.TOOL_CACHE_STALE_TTL,
+        )
+    raise ValueError(f"Unsupported tool cache backend: {backend}")
+
+
+class ToolCache:
+    """
+    Caches tool results keyed on normalized arguments.
+    Only successful return values are cached; exceptions propagate uncached.
+    """
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._hits: dict[str, int] = defaultdict(int)
+        self._misses: dict[str, int] = defaultdict(int)
+
+    def _record(self, namespace: str, hit: bool):
+        record_cache("tool", namespace, "hit" if hit else "miss")
+        with self._lock:
+            if hit:
+                self._hits[namespace] += 1
+            else:
+                self._misses[namespace] += 1
+
+    def lookup(self, namespace: str, key: str) -> Any:
+        try:
+            value = self.backend.get(key)
+        except Exception:
+            logger.exception("Tool cache read failed")
+            value = MISSING
+        self._record(namespace, value is not MISSING)
+        return value
+
+    def stale_fallback(self, namespace: str, key: str, error: ProviderUnavailable):
+        """An expired result for `key` to answer with while its API is down."""
+        try:
+            value = self.backend.get(key, allow_stale=True)
+        except Exception:
+            logger.exception("Tool cache read failed")
+            value = MISSING
+        if value is MISSING:
+            raise error
+        record_cache("tool", namespace, "stale")
+        logger.warning(f"Serving a stale {namespace} result: {error.reason}")
+        return value
+
+    def store(self, key: str, value: Any, ttl: float):
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception:
+            logger.exception("Tool cache write failed")
+
+    def cached(self, namespace: str, ttl: float | Callable[[dict], float]):
+        """
+        Decorator for sync or async functions. `ttl` is seconds, or a callable that
+        receives the bound arguments and returns seconds. Sync and async variants
+        of a tool should use the same namespace so they share entries.
+        Concurrent misses for one key share a single upstream call, even with
+        caching disabled. If the upstream API is unavailable (`ProviderUnavailable`),
+        an expired entry is returned instead when there is one.
+        """
+
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            def prepare(args, kwargs) -> tuple[str, float]:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                seconds = ttl(arguments) if callable(ttl) else ttl
+                return make_key(namespace, arguments), seconds
+
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    key, seconds = prepare(args, kwargs)
+                    if seconds <= 0:
+                        return await single_flight.ado(
+                            namespace, f"tool/{key}", lambda: func(*args, **kwargs)
+                        )
+                    value = self.lookup(namespace, key)
+                    if value is not MISSING:
+                        return value
+
+                    async def load():
+                        try:
+                            value = await func(*args, **kwargs)
+                        except ProviderUnavailable as e:
+                            return self.stale_fallback(namespace, key, e)
+                        self.store(key, value, seconds)
+                        return value
+
+                    return await single_flight.ado(namespace, f"tool/{key}", load)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key, seconds = prepare(args, kwargs)
+                if seconds <= 0:
+                    return single_flight.do(
+                        namespace, f"tool/{key}", lambda: func(*args, **kwargs)
+                    )
+                value = self.lookup(namespace, key)
+                if value is not MISSING:
+                    return value
+
+                def load():
+                    try:
+                        value = func(*args, **kwargs)
+                    except ProviderUnavailable as e:
+                        return self.stale_fallback(namespace, key, e)
+                    self.store(key, value, seconds)
+                    return value
+
+                return single_flight.do(namespace, f"tool/{key}", load)
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict:
+        with self._lock:
+            namespaces = {}
+            for namespace in sorted(set(self._hits) | set(self._misses)):
+                hits, misses = self._hits[namespace], self._misses[namespace]
+                namespaces[namespace] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses), 4),
+                }
+        try:
+            size = len(self.backend)
+        except Exception:
+            size = None
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": size,
+            "namespaces": namespaces,
+        }
+
+    def clear(self):
+        self.backend.clear()
+
+
+tool_cache = ToolCache(get_cache_backend())
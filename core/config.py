@@ -23,8 +23,130 @@ class Settings(BaseSettings):
     OPENAI_MODEL_NAME: str = "gpt-4o"
     GROQ_MODEL_NAME: str = "llama3-70b-8192"
 
+    # External API endpoints (override to point the tools at local stubs)
+    WEATHER_API_BASE_URL: str = "http://api.weatherapi.com/v1"
+    PLACES_API_BASE_URL: str = "https://maps.googleapis.com/maps/api/place"
+    EXCHANGE_RATES_API_BASE_URL: str = "https://v6.exchangerate-api.com/v6"
+    FLIGHT_API_BASE_URL: str = "https://flight-data.p.rapidapi.com"
+    HOTEL_API_BASE_URL: str = "https://booking-com.p.rapidapi.com/v1"
+
+    # Outbound HTTP (shared, pooled client used by the tools)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_TIMEOUT: float = 10.0
+    RAPIDAPI_TIMEOUT: float = 20.0
+
+    # Upstream API resilience (per provider, per process): requests/second and
+    # burst sized to each quota, how long a call may wait for a token before
+    # failing fast, retries with exponential backoff (seconds) on 429/5xx and
+    # connection errors, and the circuit breaker that opens after consecutive
+    # failed calls and lets a probe through after the recovery timeout.
+    WEATHER_RATE_LIMIT: float = 5.0
+    WEATHER_RATE_BURST: float = 10
+    PLACES_RATE_LIMIT: float = 10.0
+    PLACES_RATE_BURST: float = 20
+    EXCHANGE_RATES_RATE_LIMIT: float = 1.0
+    EXCHANGE_RATES_RATE_BURST: float = 5
+    FLIGHT_RATE_LIMIT: float = 1.0
+    FLIGHT_RATE_BURST: float = 3
+    HOTEL_RATE_LIMIT: float = 1.0
+    HOTEL_RATE_BURST: float = 3
+    PROVIDER_RATE_LIMIT_MAX_WAIT: float = 5.0
+    PROVIDER_MAX_RETRIES: int = 2
+    PROVIDER_BACKOFF_BASE: float = 0.5
+    PROVIDER_BACKOFF_MAX: float = 8.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIMEOUT: float = 30.0
+
+    # Currency every FX rate table is fetched against; other pairs use cross rates
+    FX_BASE_CURRENCY: str = "USD"
+
+    # Max external tool calls run concurrently within one planner turn
+    TOOL_CALL_CONCURRENCY: int = 4
+    # Widest ± day window one flexible-date flight search may cover
+    FLIGHT_FLEX_MAX_WINDOW_DAYS: int = 3
+    # How many days ahead (from today) the weather API has daily forecasts for
+    WEATHER_FORECAST_DAYS: int = 14
+    # Offline airport/city index (CSV); unset uses the bundled data/airports.csv
+    AIRPORT_DATA_PATH: str | None = None
+    # Typos tolerated when a city isn't found by exact or prefix lookup
+    AIRPORT_FUZZY_MAX_EDITS: int = 2
+
+    # Admission control for graph runs (per process): concurrent runs, how many
+    # requests may wait for a slot and for how long (seconds), and how many
+    # turns of one session may queue behind its running turn.
+    MAX_CONCURRENT_RUNS: int = 8
+    MAX_QUEUED_RUNS: int = 32
+    RUN_QUEUE_TIMEOUT: float = 30.0
+    SESSION_MAX_QUEUED: int = 1
+
+    # Generate every route city's itinerary in parallel once the route is set
+    ITINERARY_FAN_OUT: bool = True
+    # Reorder generated multi-city routes by distance (keeps days per city)
+    ROUTE_OPTIMIZATION: bool = True
+
+    # Planner context budget: approximate token ceiling for the planner prompt,
+    # and how much of an already-consumed tool result is kept in the history.
+    PROMPT_TOKEN_BUDGET: int = 8000
+    STALE_TOOL_MESSAGE_CHARS: int = 400
+
+    # Tool result cache ("memory" or "sqlite"); TTLs are in seconds, 0 disables
+    TOOL_CACHE_BACKEND: str = "memory"
+    TOOL_CACHE_PATH: str = "tool_cache.db"
+    TOOL_CACHE_MAX_ENTRIES: int = 2048
+    # Expired results are kept this much longer, to answer while an API is down
+    TOOL_CACHE_STALE_TTL: int = 24 * 60 * 60
+    WEATHER_CACHE_TTL: int = 10 * 60
+    FORECAST_CACHE_TTL: int = 3 * 60 * 60
+    PLACES_CACHE_TTL: int = 6 * 60 * 60
+    IATA_CACHE_TTL: int = 24 * 60 * 60
+    FX_CACHE_TTL: int = 60 * 60
+    FLIGHT_CACHE_TTL: int = 15 * 60
+    HOTEL_CACHE_TTL: int = 30 * 60
+
+    # Generated itinerary/route cache (on disk). Stale entries can be served
+    # for up to LLM_CACHE_STALE_TTL past their TTL while refreshed in background.
+    LLM_CACHE_PATH: str = "llm_cache.db"
+    LLM_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+    LLM_CACHE_TTL: int = 7 * 24 * 60 * 60
+    LLM_CACHE_STALE_TTL: int = 7 * 24 * 60 * 60
+    LLM_CACHE_STALE_WHILE_REVALIDATE: bool = False
+
     # Database
     DATABASE_URL: str = "sqlite:///trip_planner.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Session store: hot LRU size and idle TTL
+    SESSION_CACHE_SIZE: int = 256
+    SESSION_TTL_SECONDS: int = 7 * 24 * 60 * 60
+    SESSION_PURGE_INTERVAL: float = 10 * 60
+    # Graph checkpoints (conversation state per session)
+    CHECKPOINT_PATH: str = "checkpoints.db"
+    CHECKPOINT_KEEP_LAST: int = 10
+    # Background jobs: persistent queue, runs per worker process, how often a
+    # running job is heartbeated/polled for cancellation, when a silent job is
+    # handed to another worker, and how long finished results are kept.
+    # JOB_INPROCESS_WORKERS > 0 also runs jobs inside the API process.
+    JOB_QUEUE_PATH: str = "jobs.db"
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_INPROCESS_WORKERS: int = 0
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_HEARTBEAT_INTERVAL: float = 2.0
+    JOB_STALE_AFTER: float = 60.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RESULT_TTL: int = 24 * 60 * 60
+
+    @property
+    def llm_model_name(self) -> str:
+        """Model name of the configured provider."""
+        return {
+            "google": self.GOOGLE_MODEL_NAME,
+            "openai": self.OPENAI_MODEL_NAME,
+            "groq": self.GROQ_MODEL_NAME,
+        }.get(self.MODEL_PROVIDER.lower(), self.MODEL_PROVIDER)
 
 
 settings = Settings()
@@ -0,0 +1,41 @@
+# core/gemini_sanitizer.py
+import json
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import ToolMessage, BaseMessage
+from langchain_core.outputs import ChatResult
+from typing import List, Any
+
+
+class GeminiSanitizer(ChatGoogleGenerativeAI):
+    """
+    A custom wrapper for ChatGoogleGenerativeAI that sanitizes ToolMessages
+    to prevent the 'contents.parts must not be empty' error.
+    This is the correct way to handle complex tool outputs for the Gemini API.
+    """
+
+    @staticmethod
+    def _sanitize(messages: List[BaseMessage]) -> List[BaseMessage]:
+        sanitized_messages = []
+        for msg in messages:
+            if isinstance(msg, ToolMessage):
+                # The Gemini API can fail if the content of a ToolMessage
+                # is not a simple string. We ensure it is by JSON-dumping it.
+                if not isinstance(msg.content, str):
+                    msg.content = json.dumps(msg.content, indent=2)
+            sanitized_messages.append(msg)
+        return sanitized_messages
+
+    def _generate(self, messages: List[BaseMessage], **kwargs: Any) -> ChatResult:
+        """
+        Intercepts messages, cleans them, and then calls the parent method.
+        """
+        # Call the original _generate method with the cleaned messages
+        return super()._generate(self._sanitize(messages), **kwargs)
+
+    async def _agenerate(
+        self, messages: List[BaseMessage], **kwargs: Any
+    ) -> ChatResult:
+        """
+        Async counterpart of `_generate`, used by `ainvoke`.
+        """
+        return await super()._agenerate(self._sanitize(messages), **kwargs)
@@ -0,0 +1,248 @@
+# core/http_client.py
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import settings
+from .resilience import providers
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Thread-safe counters used to measure connection reuse."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: dict[str, int] = defaultdict(int)
+        self._connections: dict[str, int] = defaultdict(int)
+        self._tls_handshakes: dict[str, int] = defaultdict(int)
+        self._errors: dict[str, int] = defaultdict(int)
+
+    def record_request(self, host: str):
+        with self._lock:
+            self._requests[host] += 1
+
+    def record_error(self, host: str):
+        with self._lock:
+            self._errors[host] += 1
+
+    def record_trace(self, host: str, event_name: str):
+        with self._lock:
+            if event_name == "connection.connect_tcp.complete":
+                self._connections[host] += 1
+            elif event_name == "connection.start_tls.complete":
+                self._tls_handshakes[host] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hosts = {}
+            for host in sorted(set(self._requests) | set(self._connections)):
+                requests_ = self._requests[host]
+                connections = self._connections[host]
+                hosts[host] = {
+                    "requests": requests_,
+                    "new_connections": connections,
+                    "tls_handshakes": self._tls_handshakes[host],
+                    "errors": self._errors[host],
+                    "reuse_rate": _reuse_rate(requests_, connections),
+                }
+            total_requests = sum(self._requests.values())
+            total_connections = sum(self._connections.values())
+            return {
+                "requests": total_requests,
+                "new_connections": total_connections,
+                "reuse_rate": _reuse_rate(total_requests, total_connections),
+                "hosts": hosts,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._requests.clear()
+            self._connections.clear()
+            self._tls_handshakes.clear()
+            self._errors.clear()
+
+
+def _reuse_rate(requests_: int, connections: int) -> float:
+    if not requests_:
+        return 0.0
+    return round(max(requests_ - connections, 0) / requests_, 4)
+
+
+pool_stats = PoolStats()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout(read_timeout: float | None = None) -> httpx.Timeout:
+    return httpx.Timeout(
+        read_timeout or settings.HTTP_TIMEOUT,
+        connect=settings.HTTP_CONNECT_TIMEOUT,
+    )
+
+
+# One client per process so every tool call shares the same connections.
+# Async connections are bound to the event loop they were opened on, so we remember it.
+_sync_client: httpx.Client | None = None
+_sync_client_lock = threading.Lock()
+_async_client: httpx.AsyncClient | None = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+
+# httpx has no per-host limit, so we cap concurrent requests per host ourselves.
+_host_semaphores: dict[str, threading.BoundedSemaphore] = {}
+_async_host_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def get_client() -> httpx.Client:
+    """
+    Returns the shared, pooled sync HTTP client, creating it on first use.
+    """
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(limits=_limits(), timeout=_timeout())
+            logger.info("Created shared HTTP client")
+        return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the shared, pooled async HTTP client, creating it on first use
+    (or when called from a different event loop than the one it was built on).
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if (
+        _async_client is None
+        or _async_client.is_closed
+        or _async_client_loop is not loop
+    ):
+        _async_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+        _async_client_loop = loop
+        _async_host_semaphores.clear()
+        logger.info("Created shared async HTTP client")
+    return _async_client
+
+
+def _host_semaphore(host: str) -> threading.BoundedSemaphore:
+    with _sync_client_lock:
+        if host not in _host_semaphores:
+            _host_semaphores[host] = threading.BoundedSemaphore(
+                settings.HTTP_MAX_CONNECTIONS_PER_HOST
+            )
+        return _host_semaphores[host]
+
+
+def _async_host_semaphore(host: str) -> asyncio.Semaphore:
+    if host not in _async_host_semaphores:
+        _async_host_semaphores[host] = asyncio.Semaphore(
+            settings.HTTP_MAX_CONNECTIONS_PER_HOST
+        )
+    return _async_host_semaphores[host]
+
+
+def http_get(
+    url: str, timeout: float | None = None, provider: str | None = None, **kwargs
+) -> httpx.Response:
+    """
+    GET through the shared sync client. `timeout` overrides the read timeout.
+    With `provider`, the request goes through that API's rate limit, retries
+    and circuit breaker (see `core.resilience`).
+    """
+    host = urlsplit(url).netloc
+
+    def trace(event_name, info):
+        pool_stats.record_trace(host, event_name)
+
+    def send() -> httpx.Response:
+        pool_stats.record_request(host)
+        with _host_semaphore(host):
+            try:
+                return get_client().get(
+                    url,
+                    timeout=_timeout(timeout),
+                    extensions={"trace": trace},
+                    **kwargs,
+                )
+            except httpx.HTTPError:
+                pool_stats.record_error(host)
+                raise
+
+    if provider is None:
+        return send()
+    return providers[provider].call(send)
+
+
+async def ahttp_get(
+    url: str, timeout: float | None = None, provider: str | None = None, **kwargs
+) -> httpx.Response:
+    """
+    GET through the shared async client. `timeout` overrides the read timeout.
+    With `provider`, the request goes through that API's rate limit, retries
+    and circuit breaker (see `core.resilience`).
+    """
+    host = urlsplit(url).netloc
+
+    async def trace(event_name, info):
+        pool_stats.record_trace(host, event_name)
+
+    async def send() -> httpx.Response:
+        pool_stats.record_request(host)
+        client = get_async_client()
+        async with _async_host_semaphore(host):
+            try:
+                return await client.get(
+                    url,
+                    timeout=_timeout(timeout),
+                    extensions={"trace": trace},
+                    **kwargs,
+                )
+            except httpx.HTTPError:
+                pool_stats.record_error(host)
+                raise
+
+    if provider is None:
+        return await send()
+    return await providers[provider].acall(send)
+
+
+def get_pool_stats() -> dict:
+    """Request/connection counters per host, plus the configured limits."""
+    stats = pool_stats.snapshot()
+    stats["limits"] = {
+        "max_connections": settings.HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "max_connections_per_host": settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        "keepalive_expiry": settings.HTTP_KEEPALIVE_EXPIRY,
+    }
+    return stats
+
+
+def close_http_clients():
+    """Closes the shared sync client."""
+    global _sync_client
+    with _sync_client_lock:
+        if _sync_client is not None and not _sync_client.is_closed:
+            _sync_client.close()
+        _sync_client = None
+
+
+async def aclose_http_clients():
+    """Closes the shared clients. Called on application shutdown."""
+    global _async_client, _async_client_loop
+    if _async_client is not None and not _async_client.is_closed:
+        await _async_client.aclose()
+    _async_client = None
+    _async_client_loop = None
+    close_http_clients()
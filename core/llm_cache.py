@@ -0,0 +1,314 @@
+# core/llm_cache.py
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from .cache import MISSING, make_key
+from .config import settings
+from .metrics import record_cache
+from .singleflight import single_flight
+
+logger = logging.getLogger(__name__)
+
+STAT_NAMES = {"hit": "hits", "stale": "stale_hits", "miss": "misses"}
+
+
+@dataclass
+class CallCount:
+    calls: int = 0
+
+
+_call_count: ContextVar[CallCount | None] = ContextVar("llm_call_count", default=None)
+
+
+@contextmanager
+def count_model_calls() -> Iterator[CallCount]:
+    """
+    Counts the model calls that cached functions really make inside the block
+    (cache hits and calls shared with a concurrent caller don't count).
+    """
+    count = CallCount()
+    token = _call_count.set(count)
+    try:
+        yield count
+    finally:
+        _call_count.reset(token)
+
+
+def _record_model_call():
+    if (count := _call_count.get()) is not None:
+        count.calls += 1
+
+
+def prompt_version(*parts: Any) -> str:
+    """
+    Fingerprint of whatever shapes an LLM result (prompt templates, output schema).
+    Editing any of them changes the version, so old cache entries stop matching.
+    """
+    payloads = []
+    for part in parts:
+        if hasattr(part, "to_json"):
+            part = part.to_json()
+        elif hasattr(part, "model_json_schema"):
+            part = part.model_json_schema()
+        payloads.append(json.dumps(part, sort_keys=True, default=str))
+    return hashlib.sha256("\n".join(payloads).encode()).hexdigest()[:16]
+
+
+class LLMResultCache:
+    """
+    Disk-backed cache for expensive generated results (itineraries, routes).
+
+    Entries are fresh for `ttl` seconds (0 disables the cache). After that they
+    are recomputed, unless stale-while-revalidate is on: then a stale entry (up
+    to `stale_ttl` seconds past its TTL) is returned at once and refreshed in
+    the background.
+    The file is kept under `max_bytes` by evicting the least recently used rows.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int,
+        ttl: float,
+        stale_ttl: float = 0,
+        stale_while_revalidate: bool = False,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_last_access"
+                " ON llm_cache (last_access)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, namespace: str, stat: str):
+        record_cache("llm", namespace, stat)
+        with self._lock:
+            self._stats[STAT_NAMES[stat]] += 1
+
+    def get(self, key: str) -> tuple[Any, bool]:
+        """Returns `(value, is_stale)`, or `(MISSING, False)` if nothing usable."""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return MISSING, False
+            payload, created_at = row
+            age = time.time() - created_at
+            stale = age > self.ttl
+            if stale and not (
+                self.stale_while_revalidate and age <= self.ttl + self.stale_ttl
+            ):
+                return MISSING, False
+            conn.execute(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            return json.loads(payload), stale
+        except Exception:
+            logger.exception("LLM cache read failed")
+            return MISSING, False
+
+    def set(self, key: str, value: Any):
+        try:
+            payload = json.dumps(value, default=str)
+            conn = self._connect()
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache"
+                " (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self._evict(conn)
+        except Exception:
+            logger.exception("LLM cache write failed")
+
+    def _evict(self, conn: sqlite3.Connection):
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        # Walk rows from least to most recently used until enough is freed.
+        doomed, freed = [], 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_access"
+        ):
+            doomed.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+        logger.info(f"LLM cache evicted {len(doomed)} entries ({freed} bytes)")
+
+    def _claim_refresh(self, key: str) -> bool:
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._stats["refreshes"] += 1
+            return True
+
+    def _release_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def cached(self, namespace: str, version: str):
+        """
+        Decorator for sync or async functions returning JSON-serializable results.
+        The key is the normalized arguments plus `version` and the configured model.
+        Empty results and exceptions are not cached. Concurrent misses for one
+        key share a single LLM call.
+        """
+
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def counted(*args, **kwargs):
+                # Background refreshes call `func` directly and aren't counted.
+                _record_model_call()
+                return func(*args, **kwargs)
+
+            def key_for(args, kwargs) -> str:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(bound.arguments)
+                arguments["__model__"] = settings.llm_model_name
+                arguments["__version__"] = version
+                return make_key(namespace, arguments)
+
+            if inspect.iscoroutinefunction(func):
+
+                async def refresh(key, args, kwargs):
+                    try:
+                        if value := await func(*args, **kwargs):
+                            self.set(key, value)
+                    except Exception:
+                        logger.exception(f"Background refresh of {namespace} failed")
+                    finally:
+                        self._release_refresh(key)
+
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    key = key_for(args, kwargs)
+                    if self.ttl <= 0:
+                        return await single_flight.ado(
+                            namespace, f"llm/{key}", lambda: counted(*args, **kwargs)
+                        )
+                    value, stale = self.get(key)
+                    if value is MISSING:
+                        self._count(namespace, "miss")
+
+                        async def load():
+                            value = await counted(*args, **kwargs)
+                            if value:
+                                self.set(key, value)
+                            return value
+
+                        return await single_flight.ado(namespace, f"llm/{key}", load)
+                    self._count(namespace, "stale" if stale else "hit")
+                    if stale and self._claim_refresh(key):
+                        task = asyncio.create_task(refresh(key, args, kwargs))
+                        self._tasks.add(task)
+                        task.add_done_callback(self._tasks.discard)
+                    return value
+
+                return async_wrapper
+
+            def refresh_sync(key, args, kwargs):
+                try:
+                    if value := func(*args, **kwargs):
+                        self.set(key, value)
+                except Exception:
+                    logger.exception(f"Background refresh of {namespace} failed")
+                finally:
+                    self._release_refresh(key)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = key_for(args, kwargs)
+                if self.ttl <= 0:
+                    return single_flight.do(
+                        namespace, f"llm/{key}", lambda: counted(*args, **kwargs)
+                    )
+                value, stale = self.get(key)
+                if value is MISSING:
+                    self._count(namespace, "miss")
+
+                    def load():
+                        value = counted(*args, **kwargs)
+                        if value:
+                            self.set(key, value)
+                        return value
+
+                    return single_flight.do(namespace, f"llm/{key}", load)
+                self._count(namespace, "stale" if stale else "hit")
+                if stale and self._claim_refresh(key):
+                    threading.Thread(
+                        target=refresh_sync, args=(key, args, kwargs), daemon=True
+                    ).start()
+                return value
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        try:
+            entries, size = (
+                self._connect()
+                .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache")
+                .fetchone()
+            )
+        except Exception:
+            entries = size = None
+        return {**stats, "entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        self._connect().execute("DELETE FROM llm_cache")
+
+
+llm_cache = LLMResultCache(
+    settings.LLM_CACHE_PATH,
+    settings.LLM_CACHE_MAX_BYTES,
+    settings.LLM_CACHE_TTL,
+    settings.LLM_CACHE_STALE_TTL,
+    settings.LLM_CACHE_STALE_WHILE_REVALIDATE,
+)
@@ -0,0 +1,204 @@
+# core/metrics.py
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+from .config import settings
+
+# Planning steps range from milliseconds (plan updates) to a minute (LLM turns)
+LATENCY_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80)
+
+NODE_LATENCY = Histogram(
+    "trip_planner_node_duration_seconds",
+    "Time spent in a graph node.",
+    ["node"],
+    buckets=LATENCY_BUCKETS,
+)
+NODE_ERRORS = Counter(
+    "trip_planner_node_errors_total", "Graph node runs that raised.", ["node"]
+)
+TOOL_LATENCY = Histogram(
+    "trip_planner_tool_duration_seconds",
+    "Time spent in a tool call.",
+    ["tool"],
+    buckets=LATENCY_BUCKETS,
+)
+TOOL_ERRORS = Counter(
+    "trip_planner_tool_errors_total",
+    "Tool calls that raised or returned an error result.",
+    ["tool"],
+)
+LLM_LATENCY = Histogram(
+    "trip_planner_llm_duration_seconds",
+    "Time spent waiting for the chat model.",
+    ["provider", "model", "node"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "trip_planner_llm_tokens_total",
+    "Tokens reported by the chat model.",
+    ["provider", "model", "node", "kind"],
+)
+LLM_ERRORS = Counter(
+    "trip_planner_llm_errors_total",
+    "Chat model calls that failed.",
+    ["provider", "model", "node"],
+)
+CACHE_REQUESTS = Counter(
+    "trip_planner_cache_requests_total",
+    "Cache lookups by outcome (hit, stale or miss).",
+    ["cache", "namespace", "result"],
+)
+SINGLE_FLIGHT_CALLS = Counter(
+    "trip_planner_single_flight_calls_total",
+    "Upstream calls by role: 'leader' ran it, 'coalesced' reused an in-flight call.",
+    ["namespace", "role"],
+)
+ADMISSION_RUNNING = Gauge(
+    "trip_planner_graph_runs_running", "Graph runs currently executing."
+)
+ADMISSION_QUEUED = Gauge(
+    "trip_planner_graph_runs_queued", "Requests waiting for a graph run slot."
+)
+ADMISSION_REJECTED = Counter(
+    "trip_planner_graph_runs_rejected_total",
+    "Requests turned away by admission control.",
+    ["reason"],
+)
+PROVIDER_CIRCUIT_STATE = Gauge(
+    "trip_planner_provider_circuit_state",
+    "Circuit breaker per upstream API: 0 closed, 1 half-open, 2 open.",
+    ["provider"],
+)
+PROVIDER_RETRIES = Counter(
+    "trip_planner_provider_retries_total",
+    "Upstream requests retried after a 429/5xx or connection error.",
+    ["provider", "reason"],
+)
+PROVIDER_REJECTED = Counter(
+    "trip_planner_provider_rejected_total",
+    "Upstream calls failed fast without a request (circuit open or over quota).",
+    ["provider", "reason"],
+)
+PROVIDER_RATE_LIMIT_WAIT = Counter(
+    "trip_planner_provider_rate_limit_wait_seconds_total",
+    "Time requests were held back by the per-provider rate limit.",
+    ["provider"],
+)
+
+
+def _is_error_result(result: Any) -> bool:
+    # Tools report failures as `{"error": ...}` / `[{"error": ...}]` instead of raising.
+    if isinstance(result, list) and len(result) == 1:
+        result = result[0]
+    return isinstance(result, dict) and "error" in result
+
+
+def observe_node(name: str):
+    """Decorator recording latency and errors of a graph node (sync or async)."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                except Exception:
+                    NODE_ERRORS.labels(name).inc()
+                    raise
+                finally:
+                    NODE_LATENCY.labels(name).observe(time.perf_counter() - started)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                NODE_ERRORS.labels(name).inc()
+                raise
+            finally:
+                NODE_LATENCY.labels(name).observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def observe_tool(name: str):
+    """
+    Times one tool call. Yields a callback that takes the tool's result, so
+    error results (not just exceptions) are counted too.
+    """
+    started = time.perf_counter()
+
+    def check(result: Any):
+        if _is_error_result(result):
+            TOOL_ERRORS.labels(name).inc()
+
+    try:
+        yield check
+    except Exception:
+        TOOL_ERRORS.labels(name).inc()
+        raise
+    finally:
+        TOOL_LATENCY.labels(name).observe(time.perf_counter() - started)
+
+
+def record_cache(cache: str, namespace: str, result: str):
+    CACHE_REQUESTS.labels(cache, namespace, result).inc()
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """Attached to the chat model: records latency and token usage per call."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.provider = settings.MODEL_PROVIDER.lower()
+        self.model = settings.llm_model_name
+        self._started: dict = {}
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, metadata=None, **kwargs
+    ):
+        node = (metadata or {}).get("langgraph_node", "none")
+        self._started[run_id] = (node, time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        node, started = self._started.pop(run_id, ("none", time.perf_counter()))
+        labels = (self.provider, self.model, node)
+        LLM_LATENCY.labels(*labels).observe(time.perf_counter() - started)
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                LLM_TOKENS.labels(*labels, "prompt").inc(usage.get("input_tokens", 0))
+                LLM_TOKENS.labels(*labels, "completion").inc(
+                    usage.get("output_tokens", 0)
+                )
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        node, _ = self._started.pop(run_id, ("none", None))
+        LLM_ERRORS.labels(self.provider, self.model, node).inc()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """The Prometheus exposition payload and its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
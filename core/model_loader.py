@@ -1,59 +1,109 @@
 # core/model_loader.py
 import logging
-import json
-from langchain_groq import ChatGroq
-from langchain_openai import ChatOpenAI
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import ToolMessage, BaseMessage
-from langchain_core.outputs import ChatResult
-from typing import List, Any
+import threading
+from typing import Any, Callable, Sequence
 
 from .config import settings
+from .metrics import LLMMetricsCallback
 
 logger = logging.getLogger(__name__)
 
 
-class GeminiSanitizer(ChatGoogleGenerativeAI):
+# Provider SDKs are imported inside the loaders, so only the configured one is
+# ever imported (each pulls in a sizeable dependency tree).
+def _load_google():
+    from .gemini_sanitizer import GeminiSanitizer
+
+    return GeminiSanitizer(
+        model=settings.GOOGLE_MODEL_NAME, google_api_key=settings.GOOGLE_API_KEY
+    )
+
+
+def _load_openai():
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model_name=settings.OPENAI_MODEL_NAME, api_key=settings.OPENAI_API_KEY
+    )
+
+
+def _load_groq():
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(model=settings.GROQ_MODEL_NAME, api_key=settings.GROQ_API_KEY)
+
+
+PROVIDERS: dict[str, Callable[[], Any]] = {
+    "google": _load_google,
+    "openai": _load_openai,
+    "groq": _load_groq,
+}
+
+
+def _tool_name(tool: Any) -> str:
+    return getattr(tool, "name", None) or tool.__name__
+
+
+class ModelRegistry:
     """
-    A custom wrapper for ChatGoogleGenerativeAI that sanitizes ToolMessages
-    to prevent the 'contents.parts must not be empty' error.
-    This is the correct way to handle complex tool outputs for the Gemini API.
+    Builds the configured chat model on first use and shares it between callers,
+    along with its `bind_tools` / `with_structured_output` wrappers.
     """
 
-    def _generate(self, messages: List[BaseMessage], **kwargs: Any) -> ChatResult:
-        """
-        Intercepts messages, cleans them, and then calls the parent method.
-        """
-        sanitized_messages = []
-        for msg in messages:
-            if isinstance(msg, ToolMessage):
-                # The Gemini API can fail if the content of a ToolMessage
-                # is not a simple string. We ensure it is by JSON-dumping it.
-                if not isinstance(msg.content, str):
-                    msg.content = json.dumps(msg.content, indent=2)
-            sanitized_messages.append(msg)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._llm = None
+        self._wrappers: dict[tuple, Any] = {}
+
+    def get_llm(self):
+        if self._llm is None:
+            with self._lock:
+                if self._llm is None:
+                    provider = settings.MODEL_PROVIDER.lower()
+                    if provider not in PROVIDERS:
+                        raise ValueError(f"Unsupported model provider: {provider}")
+                    llm = PROVIDERS[provider]()
+                    # Latency and token usage of every call go to /metrics
+                    llm.callbacks = [*(llm.callbacks or []), LLMMetricsCallback()]
+                    self._llm = llm
+                    logger.info(
+                        f"Loaded {provider.upper()} model: {settings.llm_model_name}"
+                    )
+        return self._llm
+
+    def _wrapper(self, key: tuple, build: Callable[[Any], Any]):
+        wrapper = self._wrappers.get(key)
+        if wrapper is None:
+            llm = self.get_llm()
+            with self._lock:
+                wrapper = self._wrappers.get(key)
+                if wrapper is None:
+                    wrapper = self._wrappers[key] = build(llm)
+        return wrapper
+
+    def with_tools(self, tools: Sequence[Any]):
+        """The model bound to `tools`, cached by tool name."""
+        key = ("tools", tuple(_tool_name(t) for t in tools))
+        return self._wrapper(key, lambda llm: llm.bind_tools(list(tools)))
+
+    def with_structured_output(self, schema: type):
+        """The model constrained to `schema`, cached per schema."""
+        key = ("structured", schema)
+        return self._wrapper(key, lambda llm: llm.with_structured_output(schema))
+
+    def reset(self):
+        """Drops the model and its wrappers, e.g. after changing the settings."""
+        with self._lock:
+            self._llm = None
+            self._wrappers.clear()
+
 
-        # Call the original _generate method with the cleaned messages
-        return super()._generate(sanitized_messages, **kwargs)
+model_registry = ModelRegistry()
 
 
 def get_llm():
     """
-    Load and return the LLM model instance based on the configuration.
+    Return the shared LLM model instance for the configured provider,
+    creating it on first use.
     """
-    provider = settings.MODEL_PROVIDER.lower()
-
-    if provider == "google":
-        model_name = settings.GOOGLE_MODEL_NAME
-        llm = GeminiSanitizer(model=model_name, google_api_key=settings.GOOGLE_API_KEY)
-    elif provider == "openai":
-        model_name = settings.OPENAI_MODEL_NAME
-        llm = ChatOpenAI(model_name=model_name, api_key=settings.OPENAI_API_KEY)
-    elif provider == "groq":
-        model_name = settings.GROQ_MODEL_NAME
-        llm = ChatGroq(model=model_name, api_key=settings.GROQ_API_KEY)
-    else:
-        raise ValueError(f"Unsupported model provider: {provider}")
-
-    logger.info(f"Loaded {provider.upper()} model: {model_name}")
-    return llm
+    return model_registry.get_llm()
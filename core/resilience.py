@@ -0,0 +1,330 @@
+# core/resilience.py
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable
+
+import httpx
+
+from .config import settings
+from .metrics import (
+    PROVIDER_CIRCUIT_STATE,
+    PROVIDER_RATE_LIMIT_WAIT,
+    PROVIDER_REJECTED,
+    PROVIDER_RETRIES,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Connection failures never reached the API, so they're safe to retry.
+_RETRYABLE_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.RemoteProtocolError,
+)
+
+
+class ProviderUnavailable(Exception):
+    """Raised instead of calling an upstream API that is down or over its quota."""
+
+    def __init__(self, provider: str, reason: str, retry_in: float):
+        self.provider = provider
+        self.reason = reason
+        self.retry_in = retry_in
+        super().__init__(
+            f"The {provider} API is temporarily unavailable ({reason}, retry in "
+            f"~{max(1, round(retry_in))}s). Don't call it again this turn; "
+            "continue with the information you already have."
+        )
+
+
+class TokenBucket:
+    """`rate` requests per second with bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> float | None:
+        """
+        Takes a token, returning how long to wait before using it, or None
+        (taking nothing) if that would be longer than `max_wait`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.capacity, self._tokens + elapsed * self.rate)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures. After
+    `recovery_timeout` seconds one probe request is let through (half-open):
+    success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        PROVIDER_CIRCUIT_STATE.labels(name).set(_STATE_VALUES[CLOSED])
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"Circuit for {self.name} is now {state}")
+        self.state = state
+        PROVIDER_CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self.retry_in() <= 0:
+                self._set_state(HALF_OPEN)
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release_probe(self):
+        """Frees the half-open probe slot of a call that never got an answer."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Provider:
+    """
+    Resilience policy for one upstream API (per process): a token bucket sized
+    to its quota, bounded exponential backoff with jitter on 429/5xx and
+    connection errors (honouring Retry-After), and a circuit breaker that fails
+    fast with `ProviderUnavailable` while the API keeps failing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        max_wait: float,
+        failure_threshold: int,
+        recovery_timeout: float,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(name, failure_threshold, recovery_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_wait = max_wait
+
+    def _admit(self) -> float:
+        """Checks the breaker and takes a token; returns the rate-limit wait."""
+        if not self.breaker.allow():
+            PROVIDER_REJECTED.labels(self.name, "circuit_open").inc()
+            raise ProviderUnavailable(
+                self.name, "circuit open", self.breaker.retry_in()
+            )
+        wait = self.bucket.reserve(self.max_wait)
+        if wait is None:
+            self.breaker.release_probe()
+            PROVIDER_REJECTED.labels(self.name, "rate_limited").inc()
+            raise ProviderUnavailable(
+                self.name, "rate limit reached", 1 / self.bucket.rate
+            )
+        if wait:
+            PROVIDER_RATE_LIMIT_WAIT.labels(self.name).inc(wait)
+        return wait
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float | None:
+        """Seconds to wait before retry `attempt`, or None to stop retrying."""
+        if attempt > self.max_retries:
+            return None
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        if response is not None and (hinted := _retry_after(response)) is not None:
+            if hinted > self.backoff_max:
+                return None
+            delay = max(delay, hinted)
+        return delay
+
+    @staticmethod
+    def _is_failure(response: httpx.Response) -> bool:
+        return response.status_code == 429 or response.status_code >= 500
+
+    def _outcome(
+        self, attempt: int, response: httpx.Response | None, error: Exception | None
+    ) -> float | None:
+        """Records the attempt; returns the delay before retrying, or None if done."""
+        if error is None and not self._is_failure(response):
+            self.breaker.record_success()
+            return None
+        # A half-open probe gets one try; its failure reopens the circuit.
+        retryable = self.breaker.state == CLOSED and (
+            error is None or isinstance(error, _RETRYABLE_ERRORS)
+        )
+        delay = self._backoff(attempt, response) if retryable else None
+        if delay is None:
+            self.breaker.record_failure()
+        else:
+            reason = type(error).__name__ if error else str(response.status_code)
+            PROVIDER_RETRIES.labels(self.name, reason).inc()
+            logger.info(f"Retrying {self.name} in {delay:.2f}s ({reason})")
+        return delay
+
+    def call(self, send: Callable[[], httpx.Response]) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            wait = self._admit()
+            response, error = None, None
+            try:
+                if wait:
+                    time.sleep(wait)
+                response = send()
+            except httpx.TransportError as e:
+                error = e
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            delay = self._outcome(attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(delay)
+
+    async def acall(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            wait = self._admit()
+            response, error = None, None
+            try:
+                if wait:
+                    await asyncio.sleep(wait)
+                response = await send()
+            except httpx.TransportError as e:
+                error = e
+            except BaseException:
+                self.breaker.release_probe()
+                raise
+            delay = self._outcome(attempt, response, error)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retry_in": (
+                round(self.breaker.retry_in(), 1)
+                if self.breaker.state != CLOSED
+                else 0.0
+            ),
+            "tokens": round(self.bucket.tokens, 2),
+            "rate": self.bucket.rate,
+            "burst": self.bucket.capacity,
+        }
+
+
+def _provider(name: str, rate: float, burst: float) -> Provider:
+    return Provider(
+        name,
+        rate=rate,
+        burst=burst,
+        max_retries=settings.PROVIDER_MAX_RETRIES,
+        backoff_base=settings.PROVIDER_BACKOFF_BASE,
+        backoff_max=settings.PROVIDER_BACKOFF_MAX,
+        max_wait=settings.PROVIDER_RATE_LIMIT_MAX_WAIT,
+        failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout=settings.CIRCUIT_RECOVERY_TIMEOUT,
+    )
+
+
+providers = {
+    "weather": _provider(
+        "weather", settings.WEATHER_RATE_LIMIT, settings.WEATHER_RATE_BURST
+    ),
+    "places": _provider(
+        "places", settings.PLACES_RATE_LIMIT, settings.PLACES_RATE_BURST
+    ),
+    "exchange_rates": _provider(
+        "exchange_rates",
+        settings.EXCHANGE_RATES_RATE_LIMIT,
+        settings.EXCHANGE_RATES_RATE_BURST,
+    ),
+    "flights": _provider(
+        "flights", settings.FLIGHT_RATE_LIMIT, settings.FLIGHT_RATE_BURST
+    ),
+    "hotels": _provider("hotels", settings.HOTEL_RATE_LIMIT, settings.HOTEL_RATE_BURST),
+}
+
+
+def get_provider_stats() -> dict:
+    """Circuit state and rate-limit headroom of every upstream provider."""
+    return {name: provider.stats() for name, provider in providers.items()}
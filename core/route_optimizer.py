@@ -0,0 +1,120 @@
+# core/route_optimizer.py
+from typing import Sequence
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# A path endpoint: the index of a point to pin there, or a (lat, lon) anchor
+# outside the points (e.g. the traveller's home) that the path should start
+# or end next to.
+Endpoint = int | tuple[float, float] | None
+
+
+def distance_matrix(coordinates: Sequence[tuple[float, float]]) -> np.ndarray:
+    """Great-circle (haversine) distances in km between every pair of (lat, lon)."""
+    lat, lon = np.radians(np.asarray(coordinates, dtype=float)).T
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def path_length(dist: np.ndarray, order: Sequence[int]) -> float:
+    order = np.asarray(order)
+    return float(dist[order[:-1], order[1:]].sum())
+
+
+def _nearest_neighbour(dist: np.ndarray, start: int, end: int | None) -> np.ndarray:
+    unvisited = np.ones(len(dist), dtype=bool)
+    unvisited[start] = False
+    if end is not None:
+        unvisited[end] = False
+    path = [start]
+    for _ in range(int(unvisited.sum())):
+        nearest = int(np.where(unvisited, dist[path[-1]], np.inf).argmin())
+        unvisited[nearest] = False
+        path.append(nearest)
+    if end is not None and end != start:
+        path.append(end)
+    return np.array(path)
+
+
+def _two_opt(
+    dist: np.ndarray, path: np.ndarray, fixed_start: bool, fixed_end: bool
+) -> np.ndarray:
+    """
+    Reverses path segments while that shortens the path. The path is framed by
+    a dummy point at zero distance from everything, which makes the open ends
+    free to move unless they are fixed.
+    """
+    n = len(path)
+    framed = np.zeros((n + 1, n + 1))
+    framed[:n, :n] = dist[np.ix_(path, path)]
+    tour = np.concatenate(([n], np.arange(n), [n]))
+    first = 2 if fixed_start else 1
+    last = n - 1 if fixed_end else n
+    improved = True
+    while improved:
+        improved = False
+        for i in range(first, last):
+            # Reversing tour[i..j] swaps edges (a, b), (c, d) for (a, c), (b, d).
+            a, b = tour[i - 1], tour[i]
+            c, d = tour[i + 1 : last + 1], tour[i + 2 : last + 2]
+            delta = framed[a, c] + framed[b, d] - framed[a, b] - framed[c, d]
+            best = int(delta.argmin())
+            if delta[best] < -1e-9:
+                j = i + 1 + best
+                tour[i : j + 1] = tour[i : j + 1][::-1].copy()
+                improved = True
+    return path[tour[1:-1]]
+
+
+def shortest_path(
+    dist: np.ndarray, start: int | None = None, end: int | None = None
+) -> list[int]:
+    """
+    Visiting order of every point along a short open path: nearest neighbour
+    (from every candidate start unless `start` is fixed), then 2-opt.
+    """
+    n = len(dist)
+    if n <= 2:
+        order = list(range(n))
+        if (start is not None and order[0] != start) or (
+            end is not None and order[-1] != end
+        ):
+            order.reverse()
+        return order
+    starts = [start] if start is not None else [i for i in range(n) if i != end]
+    candidates = [_nearest_neighbour(dist, s, end) for s in starts]
+    path = min(candidates, key=lambda p: path_length(dist, p))
+    path = _two_opt(dist, path, start is not None, end is not None)
+    return [int(i) for i in path]
+
+
+def order_points(
+    coordinates: Sequence[tuple[float, float]],
+    start: Endpoint = None,
+    end: Endpoint = None,
+) -> list[int]:
+    """
+    Order in which to visit `coordinates` (lat, lon) so the total great-circle
+    distance is short, optionally pinning the first and last point.
+    """
+    points = list(coordinates)
+    anchors = {}
+    for name, endpoint in (("start", start), ("end", end)):
+        if isinstance(endpoint, tuple):
+            anchors[name] = len(points)
+            points.append(endpoint)
+        elif endpoint is not None:
+            anchors[name] = endpoint
+    if not points:
+        return []
+    order = shortest_path(
+        distance_matrix(points), anchors.get("start"), anchors.get("end")
+    )
+    return [i for i in order if i < len(coordinates)]
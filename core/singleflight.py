@@ -0,0 +1,113 @@
+# core/singleflight.py
+import asyncio
+import copy
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable
+
+from .metrics import SINGLE_FLIGHT_CALLS
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls: the first caller for a key runs the
+    function, concurrent callers with the same key wait for it and get a copy
+    of its result (or its exception).
+
+    Threads (sync tools) and tasks (async tools) share one table. Async callers
+    may also join a call running in another thread; sync callers never wait on
+    an async call, since that could block the event loop the call runs on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, tuple[Future, bool]] = {}
+        self._stats: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "coalesced": 0}
+        )
+
+    def _claim(
+        self, namespace: str, key: str, is_async: bool
+    ) -> tuple[Future | None, bool]:
+        """Returns `(future, is_leader)`; no future means run without coalescing."""
+        with self._lock:
+            self._stats[namespace]["calls"] += 1
+            entry = self._calls.get(key)
+            if entry is None:
+                future = Future()
+                self._calls[key] = (future, is_async)
+                SINGLE_FLIGHT_CALLS.labels(namespace, "leader").inc()
+                return future, True
+            future, running_async = entry
+            if running_async and not is_async:
+                SINGLE_FLIGHT_CALLS.labels(namespace, "leader").inc()
+                return None, True
+            self._stats[namespace]["coalesced"] += 1
+            SINGLE_FLIGHT_CALLS.labels(namespace, "coalesced").inc()
+            return future, False
+
+    def _release(self, key: str, future: Future):
+        with self._lock:
+            if self._calls.get(key, (None,))[0] is future:
+                del self._calls[key]
+
+    def do(self, namespace: str, key: str, func: Callable[[], Any]) -> Any:
+        future, leader = self._claim(namespace, key, is_async=False)
+        if future is None:
+            return func()
+        if not leader:
+            return copy.deepcopy(future.result())
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._release(key, future)
+
+    async def ado(
+        self, namespace: str, key: str, func: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        while True:
+            future, leader = self._claim(namespace, key, is_async=True)
+            if leader:
+                break
+            try:
+                # Shielded so a follower being cancelled doesn't cancel the leader.
+                result = await asyncio.shield(asyncio.wrap_future(future))
+                return copy.deepcopy(result)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The leader was cancelled before finishing; try again.
+
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._release(key, future)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "namespaces": {
+                    namespace: dict(counts)
+                    for namespace, counts in sorted(self._stats.items())
+                },
+            }
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,229 @@
+# database/checkpointer.py
+import asyncio
+import logging
+import sqlite3
+import time
+from typing import Any, AsyncIterator, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from core.config import settings
+from . import models
+
+logger = logging.getLogger(__name__)
+
+# When each thread last got a checkpoint, for expiring idle ones
+_ACTIVITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint_threads (
+    thread_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS checkpoint_threads_updated_at
+    ON checkpoint_threads (updated_at);
+"""
+
+
+def _state_serializer() -> JsonPlusSerializer | None:
+    # Our pydantic models live in the graph state (and in Send payloads), so allow
+    # them explicitly instead of relying on the deprecated permissive default.
+    allowed = [
+        (models.__name__, name)
+        for name, obj in vars(models).items()
+        if isinstance(obj, type)
+        and issubclass(obj, models.BaseModel)
+        and obj.__module__ == models.__name__
+    ]
+    try:
+        return JsonPlusSerializer(allowed_msgpack_modules=allowed)
+    except TypeError:
+        # Older langgraph-checkpoint releases have no allowlist.
+        return None
+
+
+class PrunedSqliteSaver(SqliteSaver):
+    """
+    langgraph's `SqliteSaver` with this app's retention policy on top:
+
+    - each thread keeps its latest `keep_last` checkpoints (older ones and
+      their writes are deleted once a thread has twice that many),
+    - threads without a new checkpoint for `ttl_seconds` are deleted.
+
+    `AsyncSqliteSaver` is bound to the event loop it was created on, while
+    this graph is compiled once at import and run from several loops, so the
+    async interface runs the sync saver on a worker thread instead. The graph
+    doesn't use `DeltaChannel`, so dropping old ancestors is safe.
+
+    Trade-off: `SqliteSaver` stores every checkpoint as a full snapshot of the
+    state, so each step re-serializes the whole `messages` history instead of
+    only the channels that changed. Write cost grows with the conversation
+    (a multi-city turn writes ~90 checkpoints, ~250 KB in the benchmark);
+    pruning bounds the disk used per thread, not the per-step cost.
+    """
+
+    def __init__(self, path: str, keep_last: int, ttl_seconds: float):
+        # The saver serializes access to the connection with its own lock.
+        conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        super().__init__(conn, serde=_state_serializer())
+        self.keep_last = keep_last
+        self.ttl_seconds = ttl_seconds
+        self._last_expiry = 0.0
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+        super().setup()
+        self.conn.executescript(_ACTIVITY_SCHEMA)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        self._maybe_prune(
+            saved["configurable"]["thread_id"], saved["configurable"]["checkpoint_ns"]
+        )
+        return saved
+
+    # --- pruning ---
+
+    def _maybe_prune(self, thread_id: str, checkpoint_ns: str):
+        now = time.time()
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO checkpoint_threads (thread_id, updated_at)"
+                " VALUES (?, ?)",
+                (thread_id, now),
+            )
+            # Amortized: only prune once a thread has twice as many as we keep.
+            (count,) = cur.execute(
+                "SELECT COUNT(*) FROM checkpoints"
+                " WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            ).fetchone()
+            if count > 2 * self.keep_last:
+                self._prune_thread(cur, thread_id, checkpoint_ns, self.keep_last)
+        if now - self._last_expiry > 60:
+            self._last_expiry = now
+            self._expire_idle_threads(now - self.ttl_seconds)
+
+    @staticmethod
+    def _prune_thread(
+        cur: sqlite3.Cursor, thread_id: str, checkpoint_ns: str, keep: int
+    ):
+        # Checkpoint ids are time-ordered (uuid6), newest last.
+        row = cur.execute(
+            "SELECT checkpoint_id FROM checkpoints"
+            " WHERE thread_id = ? AND checkpoint_ns = ?"
+            " ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+            (thread_id, checkpoint_ns, keep - 1),
+        ).fetchone()
+        if row is None:
+            return
+        for table in ("checkpoints", "writes"):
+            cur.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ?"
+                " AND checkpoint_id < ?",
+                (thread_id, checkpoint_ns, row[0]),
+            )
+
+    def _expire_idle_threads(self, cutoff: float):
+        with self.cursor() as cur:
+            idle = [
+                thread_id
+                for (thread_id,) in cur.execute(
+                    "SELECT thread_id FROM checkpoint_threads WHERE updated_at < ?",
+                    (cutoff,),
+                ).fetchall()
+            ]
+        for thread_id in idle:
+            self.delete_thread(thread_id)
+        if idle:
+            logger.info(f"Deleted checkpoints of {len(idle)} idle sessions")
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute(
+                "DELETE FROM checkpoint_threads WHERE thread_id = ?", (str(thread_id),)
+            )
+
+    def prune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        for thread_id in thread_ids:
+            if strategy == "delete":
+                self.delete_thread(thread_id)
+                continue
+            with self.cursor() as cur:
+                namespaces = cur.execute(
+                    "SELECT DISTINCT checkpoint_ns FROM checkpoints"
+                    " WHERE thread_id = ?",
+                    (str(thread_id),),
+                ).fetchall()
+                for (checkpoint_ns,) in namespaces:
+                    self._prune_thread(cur, str(thread_id), checkpoint_ns, keep=1)
+
+    # --- async interface: the sync saver runs on a worker thread ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    async def aprune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        await asyncio.to_thread(self.prune, thread_ids, strategy=strategy)
+
+
+checkpointer = PrunedSqliteSaver(
+    settings.CHECKPOINT_PATH,
+    keep_last=settings.CHECKPOINT_KEEP_LAST,
+    ttl_seconds=settings.SESSION_TTL_SECONDS,
+)
@@ -1,24 +1,153 @@
 # database/database.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlmodel import Field, Session, SQLModel, create_engine, delete, select
+
+from core.config import settings
 from .models import TripPlan
 
-# In-memory database for simplicity.
-# For a production app, replace this with a real database connection.
-# from sqlmodel import create_engine, SQLModel, Session
-# from core.config import settings
-# engine = create_engine(settings.DATABASE_URL)
-# def create_db_and_tables():
-#     SQLModel.metadata.create_all(engine)
+logger = logging.getLogger(__name__)
+
+
+class TripPlanRecord(SQLModel, table=True):
+    """A persisted session: the serialized TripPlan and when it was last written."""
+
+    __tablename__ = "trip_plans"
+
+    session_id: str = Field(primary_key=True)
+    data: str
+    updated_at: float = Field(index=True)
+
+
+def _create_engine():
+    if settings.DATABASE_URL.startswith("sqlite"):
+        engine = create_engine(
+            settings.DATABASE_URL,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, _):
+            # WAL lets several uvicorn workers read while one of them writes.
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+        return engine
+    return create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+    )
+
+
+engine = _create_engine()
+
+
+def create_db_and_tables():
+    SQLModel.metadata.create_all(engine)
+
+
+class SessionStore:
+    """
+    TripPlan store backed by SQL, shared by every worker process, with:
+    - a small in-process LRU of recently used sessions; a hit is only used if
+      the row's `updated_at` still matches, so another process's save is seen
+      on the next read without fetching the plan itself every time,
+    - TTL eviction of sessions that have been idle for SESSION_TTL_SECONDS.
+    Saves are written through, so other processes see them immediately.
+    Plans are kept as JSON, so callers always get their own copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hot: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._last_purge = 0.0
+
+    def _remember(self, session_id: str, data: str, updated_at: float):
+        with self._lock:
+            self._hot[session_id] = (data, updated_at)
+            self._hot.move_to_end(session_id)
+            while len(self._hot) > settings.SESSION_CACHE_SIZE:
+                self._hot.popitem(last=False)
+
+    def _forget(self, session_id: str):
+        with self._lock:
+            self._hot.pop(session_id, None)
+
+    def _load(self, session_id: str) -> tuple[str, float] | None:
+        with self._lock:
+            hot = self._hot.get(session_id)
+        with Session(engine) as session:
+            if hot is not None:
+                updated_at = session.exec(
+                    select(TripPlanRecord.updated_at).where(
+                        TripPlanRecord.session_id == session_id
+                    )
+                ).first()
+                if updated_at == hot[1]:
+                    return hot
+            record = session.get(TripPlanRecord, session_id)
+        if record is None:
+            return None
+        return record.data, record.updated_at
+
+    def get(self, session_id: str) -> TripPlan:
+        entry = self._load(session_id)
+        if entry is None or entry[1] < time.time() - settings.SESSION_TTL_SECONDS:
+            self._forget(session_id)
+            return TripPlan(session_id=session_id)
+        self._remember(session_id, *entry)
+        return TripPlan.model_validate_json(entry[0])
+
+    def save(self, plan: TripPlan):
+        data, updated_at = plan.model_dump_json(), time.time()
+        with Session(engine) as session:
+            session.merge(
+                TripPlanRecord(
+                    session_id=plan.session_id, data=data, updated_at=updated_at
+                )
+            )
+            session.commit()
+        self._remember(plan.session_id, data, updated_at)
+        self._purge_expired()
+
+    def _purge_expired(self):
+        now = time.time()
+        if now - self._last_purge < settings.SESSION_PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        cutoff = now - settings.SESSION_TTL_SECONDS
+        with self._lock:
+            for session_id in [k for k, (_, ts) in self._hot.items() if ts < cutoff]:
+                del self._hot[session_id]
+        with Session(engine) as session:
+            result = session.exec(
+                delete(TripPlanRecord).where(TripPlanRecord.updated_at < cutoff)
+            )
+            session.commit()
+        if result.rowcount:
+            logger.info(f"Evicted {result.rowcount} idle sessions")
+
 
-db: dict[str, TripPlan] = {}
+create_db_and_tables()
+store = SessionStore()
 
 
 def get_trip_plan(session_id: str) -> TripPlan:
     """Retrieves or creates a trip plan for a given session."""
-    if session_id not in db:
-        db[session_id] = TripPlan(session_id=session_id)
-    return db[session_id]
+    return store.get(session_id)
 
 
 def save_trip_plan(plan: TripPlan):
     """Saves the trip plan to the database."""
-    db[plan.session_id] = plan
+    store.save(plan)
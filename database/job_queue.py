@@ -0,0 +1,338 @@
+# database/job_queue.py
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic_core import to_jsonable_python
+
+from core.config import settings
+from .models import QueryRequest
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    request TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created_at ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_session_status ON jobs (session_id, status);
+"""
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = (
+    "queued",
+    "running",
+    "succeeded",
+    "failed",
+    "cancelled",
+)
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+@dataclass
+class Job:
+    id: str
+    session_id: str
+    request: QueryRequest
+    status: str
+    attempts: int
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: Any = None
+    error: str | None = None
+    cancel_requested: bool = False
+
+    def to_dict(self, include_result: bool = False) -> dict:
+        data = {
+            "job_id": self.id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error:
+            data["error"] = self.error
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """
+    Persistent queue of background graph runs in a local SQLite file, shared by
+    the API (which enqueues and reads jobs) and any number of worker processes.
+
+    - A worker claims the oldest queued job whose session has nothing running,
+      so turns of one session still run in order.
+    - Running jobs are heartbeated; a job whose worker stopped heartbeating for
+      `stale_after` seconds is queued again (up to `max_attempts` runs).
+    - Cancelling a queued job is immediate; a running one is flagged and its
+      worker stops it at the next heartbeat.
+    - Finished jobs are deleted `result_ttl` seconds after they finish.
+    """
+
+    def __init__(
+        self, path: str, stale_after: float, max_attempts: int, result_ttl: float
+    ):
+        self.path = path
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self.result_ttl = result_ttl
+        self._local = threading.local()
+        self._last_purge = 0.0
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers can't
+        # both pick the same job.
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        return conn
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            session_id=row["session_id"],
+            request=QueryRequest.model_validate_json(row["request"]),
+            status=row["status"],
+            attempts=row["attempts"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            cancel_requested=bool(row["cancel_requested"]),
+        )
+
+    def enqueue(self, request: QueryRequest) -> Job:
+        job_id = uuid.uuid4().hex
+        self._connect().execute(
+            "INSERT INTO jobs (id, session_id, request, status, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                job_id,
+                request.session_id,
+                request.model_dump_json(),
+                QUEUED,
+                time.time(),
+            ),
+        )
+        self._purge_finished()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Job | None:
+        row = (
+            self._connect()
+            .execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return self._job(row) if row else None
+
+    def active_job(self, session_id: str) -> Job | None:
+        """The session's oldest queued or running job, if any."""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT * FROM jobs WHERE session_id = ? AND status IN (?, ?) "
+                "ORDER BY created_at LIMIT 1",
+                (session_id, QUEUED, RUNNING),
+            )
+            .fetchone()
+        )
+        return self._job(row) if row else None
+
+    def _recover_stale(self, conn: sqlite3.Connection, now: float):
+        """Requeues (or gives up on) running jobs whose worker went quiet."""
+        stale = conn.execute(
+            "SELECT id, attempts, cancel_requested FROM jobs "
+            "WHERE status = ? AND heartbeat_at < ?",
+            (RUNNING, now - self.stale_after),
+        ).fetchall()
+        for row in stale:
+            if row["cancel_requested"]:
+                status, error = CANCELLED, None
+            elif row["attempts"] >= self.max_attempts:
+                status, error = FAILED, "The worker running this job stopped."
+            else:
+                status, error = QUEUED, None
+            logger.warning(f"Job {row['id']} lost its worker; now {status}")
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, "
+                "finished_at = ? WHERE id = ?",
+                (status, error, None if status == QUEUED else now, row["id"]),
+            )
+
+    def claim(self, worker_id: str) -> Job | None:
+        """Marks the next runnable job as running on `worker_id` and returns it."""
+        now = time.time()
+        conn = self._transaction()
+        try:
+            self._recover_stale(conn, now)
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND session_id NOT IN "
+                "(SELECT session_id FROM jobs WHERE status = ?) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING),
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = ?, "
+                    "attempts = attempts + 1, started_at = ?, heartbeat_at = ? "
+                    "WHERE id = ?",
+                    (RUNNING, worker_id, now, now, row["id"]),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"]) if row else None
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Records that the worker is still on the job. Returns False if the job
+        should stop: it was cancelled or another worker has taken it over.
+        """
+        conn = self._connect()
+        updated = conn.execute(
+            "UPDATE jobs SET heartbeat_at = ? "
+            "WHERE id = ? AND worker_id = ? AND status = ? AND cancel_requested = 0",
+            (time.time(), job_id, worker_id, RUNNING),
+        ).rowcount
+        return bool(updated)
+
+    def _finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        result: Any = None,
+        error: str | None = None,
+    ) -> bool:
+        payload = None
+        if result is not None:
+            payload = json.dumps(to_jsonable_python(result, fallback=str))
+        # Only the worker that owns the job may finish it.
+        updated = (
+            self._connect()
+            .execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "worker_id = NULL WHERE id = ? AND worker_id = ? AND status = ?",
+                (status, payload, error, time.time(), job_id, worker_id, RUNNING),
+            )
+            .rowcount
+        )
+        return bool(updated)
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        return self._finish(job_id, worker_id, SUCCEEDED, result=result)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        return self._finish(job_id, worker_id, FAILED, error=error)
+
+    def mark_cancelled(self, job_id: str, worker_id: str) -> bool:
+        return self._finish(job_id, worker_id, CANCELLED)
+
+    def release(self, job_id: str, worker_id: str):
+        """
+        Hands a running job back to the queue (worker shutting down). Its
+        attempt still counts, so the next run knows to resume the turn.
+        """
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, worker_id = NULL "
+            "WHERE id = ? AND worker_id = ? AND status = ?",
+            (QUEUED, job_id, worker_id, RUNNING),
+        )
+
+    def requeue(self, job_id: str, worker_id: str):
+        """Hands back a claimed job that never got to run; the attempt doesn't count."""
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, worker_id = NULL, started_at = NULL, "
+            "attempts = attempts - 1 "
+            "WHERE id = ? AND worker_id = ? AND status = ?",
+            (QUEUED, job_id, worker_id, RUNNING),
+        )
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancels a queued job right away; a running one is flagged for its worker."""
+        conn = self._transaction()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? "
+                "WHERE id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED),
+            )
+            conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?",
+                (job_id, RUNNING),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(job_id)
+
+    def _purge_finished(self):
+        now = time.time()
+        if now - self._last_purge < 60:
+            return
+        self._last_purge = now
+        deleted = (
+            self._connect()
+            .execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED))}) "
+                "AND finished_at < ?",
+                (*FINISHED, now - self.result_ttl),
+            )
+            .rowcount
+        )
+        if deleted:
+            logger.info(f"Purged {deleted} finished jobs")
+
+    def stats(self) -> dict:
+        rows = (
+            self._connect()
+            .execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+            .fetchall()
+        )
+        counts = {status: 0 for status in (QUEUED, RUNNING, *FINISHED)}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+
+job_queue = JobQueue(
+    settings.JOB_QUEUE_PATH,
+    stale_after=settings.JOB_STALE_AFTER,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    result_ttl=settings.JOB_RESULT_TTL,
+)
@@ -1,5 +1,5 @@
 # database/models.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional, Dict, Union
 
 
@@ -13,13 +13,30 @@ class CityStop(BaseModel):
 
 class FlightDetails(BaseModel):
     airline: str
-    price: str
+    price: float = Field(description="Fare amount, a plain number.")
+    currency: Optional[str] = Field(
+        default=None, description="ISO currency code of the fare, e.g. 'INR'."
+    )
     departure_time: str
     arrival_time: str
     stops: int
 
+    @model_validator(mode="before")
+    @classmethod
+    def _split_price(cls, data):
+        # Older plans stored the fare as one string, e.g. "4500 INR".
+        if isinstance(data, dict) and isinstance(data.get("price"), str):
+            amount, _, currency = data["price"].strip().partition(" ")
+            data = {**data, "price": amount.replace(",", "")}
+            if currency and not data.get("currency"):
+                data["currency"] = currency.strip()
+        return data
+
 
 class HotelDetails(BaseModel):
+    city: Optional[str] = Field(
+        default=None, description="Route city the hotel is in, for multi-city trips."
+    )
     name: str
     rating: float
     price_per_night: str
@@ -72,3 +89,7 @@ class TripPlan(BaseModel):
 class QueryRequest(BaseModel):
     query: str
     session_id: str
+    # Clients that track the plan themselves can skip it and apply `plan_delta`
+    include_plan: bool = True
+    # Queue the run and return a job id instead of waiting for the answer
+    background: bool = False
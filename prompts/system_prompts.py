@@ -11,7 +11,7 @@ PLANNER_PROMPT = ChatPromptTemplate.from_messages(
 
 **IF the `route` list in the plan is empty:**
     // The highest priority is to define the multi-city route.
-    1.  Your ONLY action is to call the `create_multicity_route` tool.
+    1.  Your ONLY action is to call the `create_multicity_route` tool. Pass the user's origin city as `start_city` (and also as `end_city` if they return home at the end).
     2.  **Self-Correction:** If that tool fails (returns an empty list), your backup plan is to immediately call `PlanUpdater` with a default route. For a 15-day "Europe" trip, the default is: `[
             {{"city": "Paris", "country": "France", "num_days": 5}},
             {{"city": "Rome", "country": "Italy", "num_days": 5}},
@@ -30,13 +30,17 @@ PLANNER_PROMPT = ChatPromptTemplate.from_messages(
 
 **ELIF `current_city_index` == `len(route)` and `status` != 'complete':**
     // All cities are planned. The project is ready for finalization.
-    1.  **Personalized Budget:** Your first action is to create a sample `budget`. You MUST infer the user's local currency from their origin city (e.g., "Gwalior, India" implies INR). The budget MUST be in that currency. Call `PlanUpdater` to save it.
+    1.  **Personalized Budget:** Your first action is to create a sample `budget`. You MUST infer the user's local currency from their origin city (e.g., "Gwalior, India" implies INR). The budget MUST be in that currency. Call `PlanUpdater` to save it. If your cost estimates are in several currencies, convert them all with a single `convert_budget` call instead of one `currency_converter` call per item.
     2.  **IF a budget already exists:** Your final action is to set `status` to 'complete' using `PlanUpdater`. When you do this, you must also provide the final, polished, engaging summary for the user. The summary should be vibrant, highlight a "must-do" experience, offer a practical tip, transparently mention any tool failures, and wish them a fantastic trip.
 
 **RULES:**
 - **YOU MUST ONLY OUTPUT TOOL CALLS**, except for the very final summary when setting status to 'complete'.
 - **DO NOT TALK TO THE USER.** Do not ask for clarification. Follow the script.
 - **ONE ACTION PER TURN.**
+- For hotels, call `route_hotel_search` once with the trip's start date; it searches every city of the route (or the single destination) and saves the results to the plan itself.
+- `origin_iata` and `destination_iata` are filled in automatically once `origin_city` and `destination` are set. If one stays empty, or you need another airport code, use `airport_lookup`, never `search_place`.
+- For the weather during the trip, call `route_weather` once with the trip's start date; it forecasts every city and day of the route in one table.
+- When the travel dates are flexible, find the cheapest day with one `flexible_flight_search` call instead of calling `flight_search` for each date.
 
 **Current Trip Plan State:**
 <TripPlan>
@@ -0,0 +1,78 @@
+# scripts/import_time_report.py
+"""
+Reports how long it takes to import the API (its cold start), using
+`python -X importtime` in fresh interpreters.
+
+The "eager" run also imports every provider SDK up front, which is what
+`core.model_loader` used to do; the difference is what lazy loading saves.
+
+    python scripts/import_time_report.py --runs 5 --top 15
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROVIDER_PACKAGES = ["langchain_google_genai", "langchain_openai", "langchain_groq"]
+SCENARIOS = {
+    "lazy": "import api.main",
+    "eager": "; ".join(f"import {p}" for p in PROVIDER_PACKAGES) + "; import api.main",
+}
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(statement: str) -> dict:
+    """Imports in a fresh interpreter and returns the per-module cumulative times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"`{statement}` failed:\n{result.stderr[-2000:]}")
+    modules = {}
+    total = 0
+    for match in LINE.finditer(result.stderr):
+        _, cumulative, indent, module = match.groups()
+        modules[module] = int(cumulative)
+        # Top-level imports have a single space of indentation
+        if len(indent) == 1:
+            total += int(cumulative)
+    return {"total_us": total, "modules": modules}
+
+
+def report(runs: int, top: int) -> dict:
+    output = {}
+    for name, statement in SCENARIOS.items():
+        samples = [measure(statement) for _ in range(runs)]
+        last = samples[-1]["modules"]
+        slowest = sorted(
+            ((m, t) for m, t in last.items() if "." not in m),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:top]
+        output[name] = {
+            "median_ms": round(
+                statistics.median(s["total_us"] for s in samples) / 1000, 1
+            ),
+            "providers_imported": [p for p in PROVIDER_PACKAGES if p in last],
+            "slowest_packages_ms": {m: round(t / 1000, 1) for m, t in slowest},
+        }
+    output["saved_ms"] = round(
+        output["eager"]["median_ms"] - output["lazy"]["median_ms"], 1
+    )
+    return output
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="imports per scenario")
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to list")
+    args = parser.parse_args()
+    print(json.dumps(report(args.runs, args.top), indent=2))
@@ -0,0 +1,171 @@
+# services/admission.py
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from core.config import settings
+from core.metrics import ADMISSION_QUEUED, ADMISSION_REJECTED, ADMISSION_RUNNING
+
+
+class AdmissionRejected(Exception):
+    """A graph run was turned away; carries the HTTP status and a Retry-After hint."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+@dataclass
+class _SessionSlot:
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Turns holding or waiting for the lock
+    pending: int = 0
+
+
+@dataclass
+class Ticket:
+    session_id: str
+    started_at: float = 0.0
+    released: bool = False
+
+
+class AdmissionController:
+    """
+    Gatekeeper for graph runs in this process:
+
+    - turns of one session run one at a time, in arrival order, with at most
+      `session_max_queued` waiting behind the running one (else 429),
+    - at most `max_running` runs execute at once; up to `max_queued` more wait
+      for a slot for `queue_timeout` seconds, anything beyond is turned away
+      immediately (503).
+
+    Rejections carry a Retry-After estimate based on recent run durations.
+    """
+
+    def __init__(
+        self,
+        max_running: int,
+        max_queued: int,
+        queue_timeout: float,
+        session_max_queued: int,
+    ):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.session_max_queued = session_max_queued
+        self._slots = asyncio.Semaphore(max_running)
+        self._sessions: dict[str, _SessionSlot] = {}
+        self._running = 0
+        self._queued = 0
+        # Moving average of run durations, for Retry-After
+        self._avg_run_seconds = 30.0
+
+    def _retry_after(self, waiting: int) -> int:
+        rounds = math.ceil((waiting + 1) / max(self.max_running, 1))
+        return max(1, math.ceil(self._avg_run_seconds * rounds))
+
+    def _reject(self, status_code: int, reason: str, detail: str, waiting: int):
+        ADMISSION_REJECTED.labels(reason).inc()
+        raise AdmissionRejected(status_code, detail, self._retry_after(waiting))
+
+    def _release_session(self, session_id: str, slot: _SessionSlot):
+        slot.pending -= 1
+        if slot.pending == 0:
+            self._sessions.pop(session_id, None)
+
+    async def _acquire_session(self, session_id: str) -> _SessionSlot:
+        slot = self._sessions.setdefault(session_id, _SessionSlot())
+        if slot.pending > self.session_max_queued:
+            self._reject(
+                429,
+                "session_busy",
+                "Another request for this session is still being processed.",
+                slot.pending,
+            )
+        slot.pending += 1
+        try:
+            await asyncio.wait_for(slot.lock.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._release_session(session_id, slot)
+            self._reject(
+                429,
+                "session_timeout",
+                "Timed out waiting for the previous request of this session.",
+                slot.pending,
+            )
+        except BaseException:
+            self._release_session(session_id, slot)
+            raise
+        return slot
+
+    async def _acquire_run_slot(self):
+        if self._slots.locked() and self._queued >= self.max_queued:
+            self._reject(503, "queue_full", "The server is at capacity.", self._queued)
+        self._queued += 1
+        ADMISSION_QUEUED.set(self._queued)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject(
+                503, "queue_timeout", "Timed out waiting for capacity.", self._queued
+            )
+        finally:
+            self._queued -= 1
+            ADMISSION_QUEUED.set(self._queued)
+        self._running += 1
+        ADMISSION_RUNNING.set(self._running)
+
+    async def acquire(self, session_id: str) -> Ticket:
+        """Waits for this session's turn and a free run slot, or raises AdmissionRejected."""
+        slot = await self._acquire_session(session_id)
+        try:
+            await self._acquire_run_slot()
+        except BaseException:
+            slot.lock.release()
+            self._release_session(session_id, slot)
+            raise
+        return Ticket(session_id, started_at=time.monotonic())
+
+    def release(self, ticket: Ticket):
+        """Frees the ticket's slots; safe to call more than once."""
+        if ticket.released:
+            return
+        ticket.released = True
+        duration = time.monotonic() - ticket.started_at
+        self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * duration
+        self._running -= 1
+        ADMISSION_RUNNING.set(self._running)
+        self._slots.release()
+        slot = self._sessions[ticket.session_id]
+        slot.lock.release()
+        self._release_session(ticket.session_id, slot)
+
+    @asynccontextmanager
+    async def admit(self, session_id: str):
+        ticket = await self.acquire(session_id)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "queued": self._queued,
+            "sessions": len(self._sessions),
+            "max_running": self.max_running,
+            "max_queued": self.max_queued,
+            "avg_run_seconds": round(self._avg_run_seconds, 2),
+        }
+
+
+admission = AdmissionController(
+    settings.MAX_CONCURRENT_RUNS,
+    settings.MAX_QUEUED_RUNS,
+    settings.RUN_QUEUE_TIMEOUT,
+    settings.SESSION_MAX_QUEUED,
+)
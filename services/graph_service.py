@@ -1,31 +1,73 @@
 # services/graph_service.py
+import asyncio
+import json
+import logging
 import uuid
+from typing import AsyncIterator
+from pydantic_core import to_jsonable_python
 from agents.graph import graph
 from database.database import get_trip_plan, save_trip_plan
-from database.models import QueryRequest
+from database.models import QueryRequest, TripPlan
 
+logger = logging.getLogger(__name__)
 
-def run_graph(query_request: QueryRequest):
-    """
-    Runs the agentic graph for a given query and session.
-    """
-    session_id = query_request.session_id
-    trip_plan = get_trip_plan(session_id)
+# Add a config to increase the recursion limit, as planning can take many steps
+GRAPH_CONFIG = {"recursion_limit": 50}
+
+# Graph nodes whose start/finish is reported to streaming clients
+STREAMED_NODES = {name for name in graph.nodes if not name.startswith("__")}
+# Tool outputs are clipped in progress events; the full data lands in the plan
+STREAMED_TOOL_OUTPUT_CHARS = 2000
 
-    # Add a config to increase the recursion limit, as planning can take many steps
-    config = {"recursion_limit": 50}
 
-    initial_state = {
+def _graph_config(session_id: str) -> dict:
+    # The checkpointer keys conversation state by thread, one thread per session.
+    return {**GRAPH_CONFIG, "configurable": {"thread_id": session_id}}
+
+
+async def _initial_state(
+    query_request: QueryRequest, config: dict
+) -> tuple[dict, TripPlan]:
+    """
+    The input of a new turn and the plan it starts from. Only the new message
+    is sent; earlier turns and the plan come back from the thread's checkpoint.
+    A thread without one (new, or expired) is seeded from the session store.
+    """
+    state = {
         "messages": [("human", query_request.query)],
-        "plan": trip_plan,
+        "city_itineraries": None,
+        "llm_calls": None,
+        "plan_patch": None,
     }
+    snapshot = await graph.aget_state(config)
+    plan = snapshot.values.get("plan")
+    if plan is None:
+        plan = await asyncio.to_thread(get_trip_plan, query_request.session_id)
+        state["plan"] = plan
+    return state, plan
 
-    # Invoke the graph with the config
-    final_state = graph.invoke(initial_state, config=config)
 
-    updated_plan = final_state["plan"]
-    save_trip_plan(updated_plan)
+async def _resume_interrupted_run(config: dict):
+    """
+    If the previous turn of this session stopped part-way (e.g. the worker died
+    mid-run), finish its pending steps first so the new turn starts from a
+    consistent state instead of dangling tool calls.
+    """
+    snapshot = await graph.aget_state(config)
+    if not snapshot.next:
+        return
+    logger.info(
+        f"Resuming interrupted run for {config['configurable']['thread_id']} "
+        f"at {snapshot.next}"
+    )
+    try:
+        await graph.ainvoke(None, config=config)
+    except Exception:
+        logger.exception("Could not resume the interrupted run; starting fresh")
+
 
+def _build_response(final_state: dict, include_plan: bool = True) -> dict:
+    updated_plan: TripPlan = final_state["plan"]
     final_message = final_state["messages"][-1].content
 
     if not final_message:
@@ -36,4 +78,108 @@ def run_graph(query_request: QueryRequest):
         else:
             final_message = "I have updated the plan with the new information."
 
-    return {"answer": final_message, "plan": updated_plan.model_dump()}
+    response = {
+        "answer": final_message,
+        # JSON-Patch operations taking the previous plan to the updated one
+        "plan_delta": final_state.get("plan_patch") or [],
+        "llm_calls": final_state.get("llm_calls", 0),
+    }
+    if include_plan:
+        response["plan"] = updated_plan.model_dump()
+    return response
+
+
+def run_graph(query_request: QueryRequest):
+    """
+    Runs the agentic graph for a given query and session.
+    The graph nodes are async, so this drives `arun_graph` on a fresh event loop.
+    Don't call it from inside a running loop; use `arun_graph` there.
+    """
+    return asyncio.run(arun_graph(query_request))
+
+
+async def _retried_turn_state(config: dict, query: str) -> dict | None:
+    """
+    When a background job is retried after its worker died, the turn may
+    already be in the checkpoint. If the latest human message is this query,
+    finish that turn (or reuse its result) instead of asking it again.
+    """
+    snapshot = await graph.aget_state(config)
+    humans = [m for m in snapshot.values.get("messages", []) if m.type == "human"]
+    if not humans or humans[-1].content != query:
+        return None
+    if snapshot.next:
+        logger.info(f"Finishing retried turn for {config['configurable']['thread_id']}")
+        return await graph.ainvoke(None, config=config)
+    return snapshot.values
+
+
+async def _finish_turn(final_state: dict, include_plan: bool) -> dict:
+    # Written through before answering, so the next turn (possibly served by
+    # another worker process) sees this plan.
+    await asyncio.to_thread(save_trip_plan, final_state["plan"])
+    return _build_response(final_state, include_plan)
+
+
+async def arun_graph(query_request: QueryRequest, retry: bool = False):
+    """
+    Async version of `run_graph`. Used by the API so a long planning run
+    doesn't block the event loop for other sessions. `retry` marks a background
+    job being run again, which may pick up where the previous attempt stopped.
+    """
+    config = _graph_config(query_request.session_id)
+    final_state = None
+    if retry:
+        final_state = await _retried_turn_state(config, query_request.query)
+    if final_state is None:
+        await _resume_interrupted_run(config)
+        initial_state, _ = await _initial_state(query_request, config)
+        final_state = await graph.ainvoke(initial_state, config=config)
+    return await _finish_turn(final_state, query_request.include_plan)
+
+
+async def astream_graph(query_request: QueryRequest) -> AsyncIterator[dict]:
+    """
+    Runs the graph like `arun_graph`, yielding progress events as they happen:
+    `node_start`/`node_end`, `tool_result`, `plan_delta` and finally `final`
+    (the same payload `/api/query` returns) or `error`.
+    """
+    config = _graph_config(query_request.session_id)
+    await _resume_interrupted_run(config)
+    initial_state, plan = await _initial_state(query_request, config)
+    yield {"event": "plan", "data": plan.model_dump()}
+
+    final_state = None
+    async for event in graph.astream_events(initial_state, config=config, version="v2"):
+        kind, name = event["event"], event["name"]
+        node = event.get("metadata", {}).get("langgraph_node")
+
+        if kind == "on_chain_start" and name in STREAMED_NODES and node == name:
+            yield {"event": "node_start", "data": {"node": name}}
+        elif kind == "on_chain_end" and name in STREAMED_NODES and node == name:
+            yield {"event": "node_end", "data": {"node": name}}
+            output = event["data"].get("output")
+            if isinstance(output, dict) and output.get("plan_patch"):
+                yield {"event": "plan_delta", "data": output["plan_patch"]}
+        elif kind == "on_tool_end":
+            output = event["data"].get("output")
+            if not isinstance(output, str):
+                output = json.dumps(to_jsonable_python(output, fallback=str))
+            yield {
+                "event": "tool_result",
+                "data": {
+                    "tool": name,
+                    "node": node,
+                    "output": output[:STREAMED_TOOL_OUTPUT_CHARS],
+                },
+            }
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            final_state = event["data"].get("output")
+
+    if not final_state:
+        yield {"event": "error", "data": {"detail": "The graph produced no result."}}
+        return
+    yield {
+        "event": "final",
+        "data": await _finish_turn(final_state, query_request.include_plan),
+    }
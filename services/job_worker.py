@@ -0,0 +1,141 @@
+# services/job_worker.py
+"""
+Background job worker: takes queued graph runs from `database.job_queue` and
+runs up to JOB_WORKER_CONCURRENCY of them at once. Start as many worker
+processes as needed next to the API; they coordinate through the queue file.
+
+    python -m services.job_worker --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+
+from core.config import settings
+from core.http_client import aclose_http_clients
+from database.job_queue import Job, JobQueue, job_queue
+from services.admission import AdmissionRejected, admission
+from services.graph_service import arun_graph
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Polls the queue and runs claimed jobs as asyncio tasks."""
+
+    def __init__(self, queue: JobQueue, concurrency: int):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    async def _admitted_run(job: Job) -> dict:
+        # Same per-session serialization and run cap as /api/query, so a job
+        # never runs alongside a synchronous turn of its session here.
+        async with admission.admit(job.session_id):
+            logger.info(
+                f"Job {job.id} started (session {job.session_id}, try {job.attempts})"
+            )
+            return await arun_graph(job.request, retry=job.attempts > 1)
+
+    async def _run_job(self, job: Job):
+        # Heartbeats go on while the run waits for admission.
+        run = asyncio.create_task(self._admitted_run(job))
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {run}, timeout=settings.JOB_HEARTBEAT_INTERVAL
+                )
+                if done:
+                    break
+                if not await asyncio.to_thread(
+                    self.queue.heartbeat, job.id, self.worker_id
+                ):
+                    logger.info(f"Job {job.id} cancelled or taken over; stopping it")
+                    run.cancel()
+                    await asyncio.gather(run, return_exceptions=True)
+                    await asyncio.to_thread(
+                        self.queue.mark_cancelled, job.id, self.worker_id
+                    )
+                    return
+            result = run.result()
+        except asyncio.CancelledError:
+            # Worker shutting down: let another worker pick the job up.
+            run.cancel()
+            await asyncio.gather(run, return_exceptions=True)
+            await asyncio.to_thread(self.queue.release, job.id, self.worker_id)
+            raise
+        except AdmissionRejected as e:
+            logger.info(f"Job {job.id} not admitted ({e}); back to the queue")
+            await asyncio.to_thread(self.queue.requeue, job.id, self.worker_id)
+            # Keep the slot a moment so the job isn't claimed again right away.
+            await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+            return
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed")
+            await asyncio.to_thread(self.queue.fail, job.id, self.worker_id, str(e))
+            return
+        await asyncio.to_thread(self.queue.complete, job.id, self.worker_id, result)
+        logger.info(f"Job {job.id} succeeded")
+
+    async def run(self):
+        """Claims and runs jobs until cancelled, then hands back unfinished ones."""
+        logger.info(
+            f"Worker {self.worker_id} started with {self.concurrency} slots "
+            f"on {self.queue.path}"
+        )
+        slots = asyncio.Semaphore(self.concurrency)
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    job = await asyncio.to_thread(self.queue.claim, self.worker_id)
+                except Exception:
+                    logger.exception("Could not claim a job")
+                    job = None
+                if job is None:
+                    slots.release()
+                    await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+                    continue
+                task = asyncio.create_task(self._run_job(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                task.add_done_callback(lambda _: slots.release())
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            logger.info(f"Worker {self.worker_id} stopped")
+
+
+async def _main(concurrency: int):
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    worker = asyncio.create_task(JobWorker(job_queue, concurrency).run())
+    try:
+        await stop.wait()
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+    finally:
+        await aclose_http_clients()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trip planner background job worker")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # streamlit_app.py
 import streamlit as st
 import requests
+import json
 import uuid
 
 # ------------------------#
@@ -61,7 +62,8 @@ def display_trip_plan(plan):
             with st.container(border=True):
                 st.write(f"**{flight.get('airline', 'N/A')}**")
                 col1, col2, col3 = st.columns(3)
-                col1.metric("Price", str(flight.get("price", "N/A")))
+                price_str = f"{flight.get('price', 'N/A')} {flight.get('currency') or ''}"
+                col1.metric("Price", price_str.strip())
                 col2.metric("Stops", str(flight.get("stops", "N/A")))
                 col3.metric("Departure", flight.get("departure_time", "N/A"))
 
@@ -70,7 +72,8 @@ def display_trip_plan(plan):
         st.markdown("#### 🏨 Hotel Options")
         for hotel in accommodation:
             with st.container(border=True):
-                st.write(f"**{hotel.get('name', 'N/A')}**")
+                city = f"{hotel['city']}: " if hotel.get("city") else ""
+                st.write(f"**{city}{hotel.get('name', 'N/A')}**")
                 col1, col2, col3 = st.columns(3)
                 price_str = str(hotel.get("price_per_night", "N/A"))
                 col1.metric("Price/Night", price_str)
@@ -100,6 +103,42 @@ def display_trip_plan(plan):
         st.table(budget)
 
 
+def apply_plan_patch(plan, ops):
+    """Applies the `add`/`replace` JSON-Patch operations the API sends for the plan."""
+    for op in ops:
+        field, _, index = op["path"].lstrip("/").partition("/")
+        if op["op"] == "add" and index == "-":
+            plan.setdefault(field, []).append(op["value"])
+        else:
+            plan[field] = op["value"]
+
+
+def stream_query(payload):
+    """Posts to the streaming endpoint and yields (event, data) pairs from the SSE stream."""
+    with requests.post(
+        f"{API_BASE_URL}/query/stream", json=payload, stream=True, timeout=(10, 300)
+    ) as response:
+        response.raise_for_status()
+        event = "message"
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[len("event:") :].strip()
+            elif line.startswith("data:"):
+                yield event, json.loads(line[len("data:") :])
+            elif not line:
+                event = "message"
+
+
+NODE_LABELS = {
+    "controller": "🧭 Working out the next step...",
+    "planner": "🧠 Thinking about your trip...",
+    "tools": "🔎 Fetching live data...",
+    "update_plan": "📝 Updating your plan...",
+    "plan_city": "🗺️ Crafting city itineraries...",
+    "join_itineraries": "🧩 Stitching your itinerary together...",
+}
+
+
 # ------------------------#
 # HEADER
 # ------------------------#
@@ -125,30 +164,49 @@ if prompt := st.chat_input(
         st.markdown(prompt)
 
     with st.chat_message("assistant"):
-        with st.spinner(
-            "🧠 Planning your ultimate adventure... This may take a moment as I search for live data..."
-        ):
-            try:
-                payload = {"query": prompt, "session_id": st.session_state.session_id}
-                response = requests.post(
-                    f"{API_BASE_URL}/query", json=payload, timeout=300
-                )
-                response.raise_for_status()
-
-                data = response.json()
-                bot_response = data.get(
-                    "answer", "I'm not sure how to respond to that."
-                )
-                st.session_state.trip_plan = data.get("plan", {})
-
-                st.markdown(bot_response)
-                st.session_state.messages.append(
-                    {"role": "assistant", "content": bot_response}
-                )
-                st.rerun()
-
-            except requests.RequestException as e:
-                error_detail = e.response.json().get("detail") if e.response else str(e)
-                st.error(f"API Error: {error_detail}")
-            except Exception as e:
-                st.error(f"An unexpected error occurred: {e}")
+        status = st.status(
+            "🧠 Planning your ultimate adventure... I'll show the plan as it takes shape.",
+            expanded=False,
+        )
+        plan_placeholder = st.empty()
+        try:
+            payload = {"query": prompt, "session_id": st.session_state.session_id}
+            partial_plan = dict(st.session_state.trip_plan)
+            data = None
+            for event, event_data in stream_query(payload):
+                if event == "plan":
+                    partial_plan = event_data
+                elif event == "node_start":
+                    status.update(label=NODE_LABELS.get(event_data["node"], "Working..."))
+                elif event == "tool_result":
+                    status.write(f"✅ {event_data['tool']} finished")
+                elif event == "plan_delta":
+                    # Render the partial plan as soon as something new lands in it
+                    apply_plan_patch(partial_plan, event_data)
+                    with plan_placeholder.container():
+                        display_trip_plan(partial_plan)
+                elif event == "final":
+                    data = event_data
+                elif event == "error":
+                    raise RuntimeError(event_data.get("detail", "Unknown error"))
+
+            if data is None:
+                raise RuntimeError("The planner stopped without a final answer.")
+            status.update(label="Done!", state="complete")
+
+            bot_response = data.get("answer", "I'm not sure how to respond to that.")
+            st.session_state.trip_plan = data.get("plan", {})
+
+            st.markdown(bot_response)
+            st.session_state.messages.append(
+                {"role": "assistant", "content": bot_response}
+            )
+            st.rerun()
+
+        except requests.RequestException as e:
+            status.update(label="Something went wrong", state="error")
+            error_detail = e.response.json().get("detail") if e.response else str(e)
+            st.error(f"API Error: {error_detail}")
+        except Exception as e:
+            status.update(label="Something went wrong", state="error")
+            st.error(f"An unexpected error occurred: {e}")
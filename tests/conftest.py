@@ -0,0 +1,23 @@
+# tests/conftest.py
+import os
+import tempfile
+
+import pytest
+
+# Settings are read at import time: give the app dummy keys and point every
+# on-disk store at a scratch directory before any app module is imported.
+_DATA_DIR = tempfile.mkdtemp(prefix="trip-planner-tests-")
+for _key in ("GOOGLE_API_KEY", "WEATHER_API_KEY", "EXCHANGE_RATES_API_KEY"):
+    os.environ.setdefault(_key, "test")
+os.environ.setdefault("RAPIDAPI_KEY", "test")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DATA_DIR, 'trips.db')}"
+os.environ["CHECKPOINT_PATH"] = os.path.join(_DATA_DIR, "checkpoints.db")
+os.environ["JOB_QUEUE_PATH"] = os.path.join(_DATA_DIR, "jobs.db")
+os.environ["LLM_CACHE_PATH"] = os.path.join(_DATA_DIR, "llm_cache.db")
+os.environ["TOOL_CACHE_BACKEND"] = "memory"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """A fresh SQLite file for stores that take a path."""
+    return str(tmp_path / "test.db")
@@ -0,0 +1,91 @@
+# tests/test_admission.py
+import asyncio
+
+import pytest
+
+from services.admission import AdmissionController, AdmissionRejected
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = dict(max_running=2, max_queued=2, queue_timeout=1.0, session_max_queued=1)
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def test_turns_of_one_session_run_in_order():
+    controller = _controller()
+    order = []
+
+    async def turn(name: str):
+        async with controller.admit("s"):
+            order.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name} end")
+
+    async def main():
+        await asyncio.gather(turn("first"), turn("second"))
+
+    asyncio.run(main())
+    assert order == ["first start", "first end", "second start", "second end"]
+    assert controller.stats()["sessions"] == 0
+
+
+def test_too_many_waiting_turns_of_a_session_are_rejected():
+    controller = _controller()
+
+    async def main():
+        running = await controller.acquire("s")
+        waiting = asyncio.create_task(controller.acquire("s"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("s")
+        controller.release(running)
+        controller.release(await waiting)
+        return rejected.value
+
+    rejected = asyncio.run(main())
+    assert rejected.status_code == 429
+    assert rejected.retry_after >= 1
+
+
+def test_full_queue_is_rejected_immediately():
+    controller = _controller(max_running=1, max_queued=0)
+
+    async def main():
+        ticket = await controller.acquire("a")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("b")
+        controller.release(ticket)
+        return rejected.value
+
+    assert asyncio.run(main()).status_code == 503
+    assert controller.stats()["running"] == 0
+
+
+def test_waiting_for_a_slot_times_out():
+    controller = _controller(max_running=1, queue_timeout=0.01)
+
+    async def main():
+        ticket = await controller.acquire("a")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("b")
+        controller.release(ticket)
+        return rejected.value
+
+    assert asyncio.run(main()).status_code == 503
+    assert controller.stats()["queued"] == 0
+
+
+def test_release_is_idempotent():
+    controller = _controller()
+
+    async def main():
+        ticket = await controller.acquire("a")
+        controller.release(ticket)
+        controller.release(ticket)
+        # The session and the run slot are free again.
+        controller.release(await controller.acquire("a"))
+
+    asyncio.run(main())
+    assert controller.stats()["running"] == 0
+    assert controller.stats()["sessions"] == 0
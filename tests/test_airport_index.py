@@ -0,0 +1,71 @@
+# tests/test_airport_index.py
+import pytest
+
+from core.airport_index import (
+    BUNDLED_AIRPORTS,
+    EXACT,
+    FUZZY,
+    IATA,
+    PREFIX,
+    AirportIndex,
+    normalize,
+)
+
+
+@pytest.fixture(scope="module")
+def index():
+    return AirportIndex.from_csv(BUNDLED_AIRPORTS)
+
+
+def test_normalize_drops_accents_punctuation_and_stopwords():
+    assert normalize("São Paulo") == "sao paulo"
+    assert normalize("Airport in Goa, India!") == "goa india"
+
+
+@pytest.mark.parametrize(
+    "place, iata",
+    [
+        ("Goa", "GOI"),
+        ("goa airport", "GOI"),
+        ("Paris, France", "CDG"),
+        ("Bangalore", "BLR"),
+        ("New York City", "JFK"),
+        ("Amsterdam Airport Schiphol", "AMS"),
+        ("LHR", "LHR"),
+    ],
+)
+def test_resolve_finds_the_main_airport(index, place, iata):
+    assert index.resolve(place).iata == iata
+
+
+def test_resolve_ignores_prefix_matches(index):
+    matches = {a.city for a, match in index.search("bang") if match == PREFIX}
+    assert {"Bangkok", "Bengaluru"} <= matches
+    assert index.resolve("bang") is None
+    assert index.resolve("Amsterd") is None
+
+
+@pytest.mark.parametrize("place", ["Amsterdm", "Siena", "Spiti", "Kasol", "Munnar"])
+def test_resolve_ignores_typo_matches(index, place):
+    # Near misses are often other places: Siena would be Vienna, Spiti Split.
+    assert index.resolve(place) is None
+
+
+def test_resolve_only_takes_codes_in_capitals(index):
+    assert index.resolve("GOA").iata == "GOI"
+    assert index.resolve("Leh").iata == "IXL"
+    assert index.resolve("lhr") is None
+
+
+def test_resolve_returns_none_for_unknown_places(index):
+    assert index.resolve("Qwxzy") is None
+    assert index.resolve("") is None
+
+
+def test_search_reports_how_each_airport_matched(index):
+    assert [(a.iata, m) for a, m in index.search("London", limit=2)] == [
+        ("LHR", EXACT),
+        ("LGW", EXACT),
+    ]
+    assert index.search("AMS")[0][1] == IATA
+    assert index.search("Amsterdm")[0][1] == FUZZY
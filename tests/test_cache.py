@@ -0,0 +1,140 @@
+# tests/test_cache.py
+import asyncio
+
+import pytest
+
+from core.cache import (
+    MISSING,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    ToolCache,
+    make_key,
+)
+from core.resilience import ProviderUnavailable
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_backend(request, db_path):
+    def make(max_entries: int = 10, stale_ttl: float = 0):
+        if request.param == "memory":
+            return MemoryCacheBackend(max_entries, stale_ttl)
+        return SQLiteCacheBackend(db_path, max_entries, stale_ttl)
+
+    return make
+
+
+def test_backend_returns_fresh_values(make_backend):
+    backend = make_backend()
+    backend.set("k", {"temp": 21}, ttl=60)
+    assert backend.get("k") == {"temp": 21}
+    assert backend.get("other") is MISSING
+
+
+def test_expired_value_is_only_served_as_stale(make_backend):
+    backend = make_backend(stale_ttl=60)
+    backend.set("k", "old", ttl=-1)
+    assert backend.get("k") is MISSING
+    assert backend.get("k", allow_stale=True) == "old"
+
+
+def test_value_past_its_stale_window_is_dropped(make_backend):
+    backend = make_backend(stale_ttl=0)
+    backend.set("k", "old", ttl=-1)
+    assert backend.get("k", allow_stale=True) is MISSING
+    assert len(backend) == 0
+
+
+def test_least_recently_used_entry_is_evicted(make_backend):
+    backend = make_backend(max_entries=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", 3, ttl=60)
+    assert backend.get("b") is MISSING
+    assert backend.get("a") == 1
+    assert len(backend) == 2
+
+
+def test_keys_ignore_case_whitespace_and_order():
+    assert make_key("ns", {"city": " Paris ", "tags": ["b", "a"]}) == make_key(
+        "ns", {"tags": ["a", "b"], "city": "paris"}
+    )
+    assert make_key("ns", {"city": "Paris"}) != make_key("other", {"city": "Paris"})
+
+
+@pytest.fixture
+def cache():
+    return ToolCache(MemoryCacheBackend(max_entries=10, stale_ttl=60))
+
+
+def test_cached_function_runs_once_per_key(cache):
+    calls = []
+
+    @cache.cached("weather", ttl=60)
+    def weather(city: str) -> dict:
+        calls.append(city)
+        return {"city": city}
+
+    assert weather("Paris") == {"city": "Paris"}
+    assert weather(" paris") == {"city": "Paris"}
+    assert weather("Rome") == {"city": "Rome"}
+    assert calls == ["Paris", "Rome"]
+    assert cache.stats()["namespaces"]["weather"] == {
+        "hits": 1,
+        "misses": 2,
+        "hit_rate": 0.3333,
+    }
+
+
+def test_exceptions_are_not_cached(cache):
+    calls = []
+
+    @cache.cached("weather", ttl=60)
+    def weather(city: str) -> dict:
+        calls.append(city)
+        if len(calls) == 1:
+            raise ValueError("upstream error")
+        return {"city": city}
+
+    with pytest.raises(ValueError):
+        weather("Paris")
+    assert weather("Paris") == {"city": "Paris"}
+
+
+def test_stale_value_answers_while_the_provider_is_down(cache):
+    @cache.cached("weather", ttl=60)
+    def weather(city: str) -> dict:
+        raise ProviderUnavailable("weather", "circuit open", 30)
+
+    # An entry that expired a moment ago, still within its stale window.
+    cache.backend.set(make_key("weather", {"city": "Paris"}), {"temp": 21}, ttl=-1)
+    assert weather("Paris") == {"temp": 21}
+    with pytest.raises(ProviderUnavailable):
+        weather("Rome")
+
+
+def test_sync_and_async_variants_share_entries(cache):
+    @cache.cached("places", ttl=60)
+    def search(query: str) -> list:
+        return [query]
+
+    @cache.cached("places", ttl=60)
+    async def asearch(query: str) -> list:
+        raise AssertionError("should have been cached")
+
+    assert search("Goa") == ["Goa"]
+    assert asyncio.run(asearch("Goa")) == ["Goa"]
+
+
+def test_zero_ttl_disables_caching(cache):
+    calls = []
+
+    @cache.cached("fx", ttl=0)
+    def rate(pair: str) -> float:
+        calls.append(pair)
+        return 1.0
+
+    rate("USD/EUR")
+    rate("USD/EUR")
+    assert len(calls) == 2
+    assert len(cache.backend) == 0
@@ -0,0 +1,71 @@
+# tests/test_checkpointer.py
+import operator
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from database.checkpointer import PrunedSqliteSaver
+
+
+class _State(TypedDict):
+    steps: Annotated[list, operator.add]
+
+
+def _graph(saver: PrunedSqliteSaver):
+    workflow = StateGraph(_State)
+    workflow.add_node("step", lambda state: {"steps": [len(state["steps"])]})
+    workflow.set_entry_point("step")
+    workflow.add_edge("step", END)
+    return workflow.compile(checkpointer=saver)
+
+
+@pytest.fixture
+def saver(db_path):
+    saver = PrunedSqliteSaver(db_path, keep_last=2, ttl_seconds=3600)
+    saver.setup()
+    return saver
+
+
+def _checkpoints(saver: PrunedSqliteSaver, thread_id: str) -> int:
+    return len(list(saver.list({"configurable": {"thread_id": thread_id}})))
+
+
+def test_state_carries_over_between_turns(saver):
+    graph = _graph(saver)
+    config = {"configurable": {"thread_id": "t"}}
+    graph.invoke({"steps": []}, config)
+    final = graph.invoke({"steps": []}, config)
+    assert final["steps"] == [0, 1]
+
+
+def test_old_checkpoints_are_pruned(saver):
+    graph = _graph(saver)
+    config = {"configurable": {"thread_id": "t"}}
+    for _ in range(6):
+        graph.invoke({"steps": []}, config)
+    # Pruning is amortized: a thread keeps between keep_last and twice that.
+    assert 2 <= _checkpoints(saver, "t") <= 4
+    assert len(graph.get_state(config).values["steps"]) == 6
+
+
+def test_idle_threads_expire(saver):
+    graph = _graph(saver)
+    graph.invoke({"steps": []}, {"configurable": {"thread_id": "idle"}})
+    graph.invoke({"steps": []}, {"configurable": {"thread_id": "busy"}})
+    with saver.cursor() as cur:
+        cur.execute(
+            "UPDATE checkpoint_threads SET updated_at = 0 WHERE thread_id = 'idle'"
+        )
+    saver._expire_idle_threads(cutoff=1)
+    assert _checkpoints(saver, "idle") == 0
+    assert _checkpoints(saver, "busy") > 0
+
+
+def test_prune_keeps_only_the_latest_checkpoint(saver):
+    graph = _graph(saver)
+    config = {"configurable": {"thread_id": "t"}}
+    graph.invoke({"steps": []}, config)
+    saver.prune(["t"])
+    assert _checkpoints(saver, "t") == 1
+    assert graph.get_state(config).values["steps"] == [0]
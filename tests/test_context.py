@@ -0,0 +1,79 @@
+# tests/test_context.py
+import json
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from agents.context import compact_plan_view, prepare_messages
+from core.config import settings
+from database.models import ItineraryDay, TripPlan
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "STALE_TOOL_MESSAGE_CHARS", 50)
+    monkeypatch.setattr(settings, "PROMPT_TOKEN_BUDGET", 10_000)
+
+
+def _turn(n: int, result: str = "ok") -> list:
+    """A human message, a tool call and its result."""
+    call = {"name": "search_place", "args": {"query": f"q{n}"}, "id": f"c{n}"}
+    return [
+        HumanMessage(content=f"question {n}"),
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=result, tool_call_id=f"c{n}"),
+    ]
+
+
+def test_plan_view_keeps_only_day_titles():
+    day = ItineraryDay(day=1, title="Old Goa", activities=["Basilica"], meals="Fish")
+    view = json.loads(compact_plan_view(TripPlan(session_id="s", itinerary=[day])))
+    assert view["itinerary"] == [{"day": 1, "title": "Old Goa"}]
+    assert "session_id" not in view
+
+
+def test_results_already_acted_on_are_truncated():
+    messages = _turn(1, "x" * 500) + _turn(2, "y" * 500)
+    prepared = prepare_messages(messages)
+    assert len(prepared) == len(messages)
+    assert prepared[2].content.startswith("x" * 50 + "... [truncated 450 chars]")
+    # The latest result hasn't been read by the planner yet.
+    assert prepared[-1].content == "y" * 500
+
+
+def test_stale_tool_call_arguments_are_omitted():
+    chunk = [{"day": d, "title": "t" * 40} for d in range(5)]
+    call = {"name": "PlanUpdater", "args": {"itinerary": chunk}, "id": "u"}
+    messages = [
+        HumanMessage(content="plan"),
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content="done", tool_call_id="u"),
+        AIMessage(content="Here is your plan."),
+    ]
+    (stale,) = prepare_messages(messages)[1].tool_calls
+    assert stale["args"]["itinerary"].startswith("<omitted: ")
+    assert messages[1].tool_calls[0]["args"]["itinerary"] == chunk
+
+
+def test_oldest_turns_are_dropped_over_budget(monkeypatch):
+    monkeypatch.setattr(settings, "STALE_TOOL_MESSAGE_CHARS", 10_000)
+    monkeypatch.setattr(settings, "PROMPT_TOKEN_BUDGET", 400)
+    messages = _turn(1, "a" * 800) + _turn(2, "b" * 800) + _turn(3, "c" * 200)
+    # Turn 1 goes; that's enough to fit, so turn 2 stays.
+    assert prepare_messages(messages) == messages[3:]
+
+
+def test_reserved_tokens_come_off_the_budget(monkeypatch):
+    monkeypatch.setattr(settings, "PROMPT_TOKEN_BUDGET", 400)
+    messages = _turn(1) + _turn(2)
+    assert prepare_messages(messages) == messages
+    assert prepare_messages(messages, reserved_tokens=380) == messages[3:]
+
+
+def test_latest_question_and_turn_are_always_kept(monkeypatch):
+    monkeypatch.setattr(settings, "PROMPT_TOKEN_BUDGET", 1)
+    messages = _turn(1) + _turn(2)
+    # The tool result stays with the call it answers.
+    assert prepare_messages(messages) == messages[3:]
+    messages = _turn(1) + [AIMessage(content="Anything else?")]
+    assert prepare_messages(messages) == [messages[0], messages[3]]
@@ -0,0 +1,61 @@
+# tests/test_controller.py
+from agents import graph
+from database.models import CityStop, ItineraryDay, TripPlan
+
+
+def _route(*cities: str) -> list[CityStop]:
+    return [CityStop(city=city, country="", num_days=2) for city in cities]
+
+
+def test_airport_codes_are_filled_in():
+    plan = TripPlan(session_id="s", origin_city="Delhi, India", destination="Goa")
+    update = graph.controller_node({"plan": plan})
+    assert (update["plan"].origin_iata, update["plan"].destination_iata) == (
+        "DEL",
+        "GOI",
+    )
+    assert {op["path"] for op in update["plan_patch"]} == {
+        "/origin_iata",
+        "/destination_iata",
+    }
+
+
+def test_a_region_destination_falls_back_to_the_first_city():
+    plan = TripPlan(session_id="s", destination="Europe", route=_route("Rome", "Paris"))
+    update = graph.controller_node({"plan": plan})
+    assert update["plan"].destination_iata == "FCO"
+
+
+def test_known_codes_are_kept():
+    plan = TripPlan(
+        session_id="s", origin_city="Delhi", origin_iata="XYZ", destination="Spiti"
+    )
+    # Nothing to resolve exactly and nothing to advance: no update at all.
+    assert graph.controller_node({"plan": plan}) == {}
+
+
+def test_planned_cities_are_skipped():
+    itinerary = [ItineraryDay(day=day) for day in range(1, 5)]
+    plan = TripPlan(
+        session_id="s",
+        destination_iata="FCO",
+        route=_route("Rome", "Florence", "Milan"),
+        itinerary=itinerary,
+    )
+    update = graph.controller_node({"plan": plan})
+    assert update["plan"].current_city_index == 2
+    assert update["plan_patch"] == [
+        {"op": "replace", "path": "/current_city_index", "value": 2}
+    ]
+
+
+def test_a_fully_planned_route_moves_on_to_the_planner():
+    itinerary = [ItineraryDay(day=day) for day in range(1, 5)]
+    plan = TripPlan(
+        session_id="s",
+        destination_iata="FCO",
+        route=_route("Rome", "Florence"),
+        itinerary=itinerary,
+    )
+    update = graph.controller_node({"plan": plan})
+    assert graph.controller_router(update) == "planner"
@@ -0,0 +1,63 @@
+# tests/test_create_multicity_route.py
+import pytest
+
+from core.config import settings
+from database.models import CityStop
+from tools.create_multicity_route_tool import _ordered
+
+
+def _stops(*cities: str) -> list[CityStop]:
+    return [CityStop(city=city, country="", num_days=2) for city in cities]
+
+
+def _cities(stops: list[CityStop]) -> list[str]:
+    return [stop.city for stop in stops]
+
+
+@pytest.fixture(autouse=True)
+def optimize(monkeypatch):
+    monkeypatch.setattr(settings, "ROUTE_OPTIMIZATION", True)
+
+
+def test_stops_come_back_in_travel_order():
+    ordered = _cities(_ordered(_stops("Milan", "Naples", "Florence"), None, None))
+    assert ordered in (["Milan", "Florence", "Naples"], ["Naples", "Florence", "Milan"])
+
+
+def test_route_starts_next_to_home():
+    stops = _stops("Lisbon", "Berlin", "Madrid")
+    ordered = _cities(_ordered(stops, "Delhi", "Delhi"))
+    assert ordered[0] == "Berlin"
+
+
+def test_unknown_stops_keep_their_place():
+    # "Siena" is one typo away from "Vienna"; it must not be placed there.
+    stops = _stops("Naples", "Siena", "Milan", "Florence")
+    ordered = _cities(_ordered(stops, None, None))
+    assert ordered[1] == "Siena"
+    assert ordered in (
+        ["Naples", "Siena", "Florence", "Milan"],
+        ["Milan", "Siena", "Florence", "Naples"],
+    )
+
+
+def test_two_stops_are_turned_towards_the_start_city():
+    stops = _stops("Lisbon", "Berlin")
+    assert _cities(_ordered(stops, "Delhi", None)) == ["Berlin", "Lisbon"]
+    assert _cities(_ordered(stops, None, "Delhi")) == ["Lisbon", "Berlin"]
+    assert _cities(_ordered(stops, "Berlin", None)) == ["Berlin", "Lisbon"]
+
+
+def test_days_stay_with_their_city():
+    stops = [
+        CityStop(city="Lisbon", country="PT", num_days=3),
+        CityStop(city="Berlin", country="DE", num_days=1),
+    ]
+    ordered = _ordered(stops, "Delhi", None)
+    assert [(s.city, s.num_days) for s in ordered] == [("Berlin", 1), ("Lisbon", 3)]
+
+
+def test_nothing_moves_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "ROUTE_OPTIMIZATION", False)
+    stops = _stops("Lisbon", "Berlin", "Madrid")
+    assert _ordered(stops, "Delhi", None) == stops
@@ -0,0 +1,91 @@
+# tests/test_flexible_flight_search.py
+import asyncio
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from core.config import settings
+from tools import flexible_flight_search_tool
+from tools.flexible_flight_search_tool import flexible_flight_search
+
+START = date.today() + timedelta(days=30)
+# Price per day offset from START; None is a day the API has no flights for
+PRICES = {-2: 5200.0, -1: 4100.0, 0: 4800.0, 1: None, 2: 3900.0}
+
+
+def _flight(price: float) -> dict:
+    return {"airline": "IndiGo", "price": price, "currency": "INR", "stops": 0}
+
+
+@pytest.fixture
+def searched(monkeypatch):
+    """Stubs the per-date fetchers; returns every date searched."""
+    dates = []
+
+    def fetch_flights(origin, destination, day):
+        dates.append(day)
+        offset = (date.fromisoformat(day) - START).days
+        if offset == -2:
+            raise httpx.ReadTimeout("timed out")
+        if PRICES.get(offset) is None:
+            return [{"error": "No flights found for the given route and date."}]
+        return [_flight(PRICES[offset] + 700), _flight(PRICES[offset])]
+
+    async def afetch_flights(*args):
+        return fetch_flights(*args)
+
+    monkeypatch.setattr(flexible_flight_search_tool, "fetch_flights", fetch_flights)
+    monkeypatch.setattr(flexible_flight_search_tool, "afetch_flights", afetch_flights)
+    return dates
+
+
+def _args(window_days: int = 2, departure: date = START) -> dict:
+    return {
+        "origin_iata": "del",
+        "destination_iata": "goi",
+        "departure_date": departure.isoformat(),
+        "window_days": window_days,
+    }
+
+
+def test_cheapest_fare_per_day_and_overall(searched):
+    result = flexible_flight_search.invoke(_args())
+    assert result["route"] == "DEL-GOI"
+    assert [cell["date"] for cell in result["days"]] == sorted(searched)
+    by_offset = {
+        (date.fromisoformat(c["date"]) - START).days: c for c in result["days"]
+    }
+    assert by_offset[-1]["price"] == 4100.0 and by_offset[-1]["options"] == 2
+    assert by_offset[-2]["error"] == "timed out"
+    assert "No flights" in by_offset[1]["error"]
+    assert result["cheapest"]["date"] == (START + timedelta(days=2)).isoformat()
+
+
+def test_window_is_capped_and_skips_past_days(searched, monkeypatch):
+    monkeypatch.setattr(settings, "FLIGHT_FLEX_MAX_WINDOW_DAYS", 1)
+    flexible_flight_search.invoke(_args(window_days=5))
+    assert len(searched) == 3
+    searched.clear()
+    flexible_flight_search.invoke(_args(departure=date.today()))
+    assert min(searched) == date.today().isoformat()
+
+
+def test_async_twin_gives_the_same_matrix(searched):
+    assert asyncio.run(flexible_flight_search.ainvoke(_args())) == (
+        flexible_flight_search.invoke(_args())
+    )
+
+
+def test_no_fares_in_the_window(searched):
+    result = flexible_flight_search.invoke(
+        _args(window_days=0, departure=START + timedelta(days=1))
+    )
+    assert result["error"] == "No flights found for DEL-GOI in this date window."
+    assert len(result["days"]) == 1
+
+
+def test_bad_date_is_reported(searched):
+    result = flexible_flight_search.invoke({**_args(), "departure_date": "soon"})
+    assert result == {"error": "departure_date must be in YYYY-MM-DD format."}
+    assert searched == []
@@ -0,0 +1,125 @@
+# tests/test_itinerary_fan_out.py
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END
+
+from agents import graph
+from core.config import settings
+from database.models import CityStop, ItineraryDay, TripPlan
+
+
+def _plan(*cities: str, planned_days: int = 0) -> TripPlan:
+    route = [CityStop(city=city, country="Italy", num_days=2) for city in cities]
+    itinerary = [ItineraryDay(day=day) for day in range(1, planned_days + 1)]
+    return TripPlan(
+        session_id="s",
+        route=route,
+        itinerary=itinerary,
+        current_city_index=planned_days // 2,
+        interests=["food"],
+    )
+
+
+class _FakeItineraryTool:
+    """Stands in for `generate_itinerary`: days titled after the destination."""
+
+    name = "generate_itinerary"
+
+    def __init__(self, fail_for: str = "", short_for: str = ""):
+        self.fail_for, self.short_for = fail_for, short_for
+
+    async def ainvoke(self, args: dict) -> list[ItineraryDay]:
+        city = args["destination"].split(",")[0]
+        if city == self.fail_for:
+            raise RuntimeError("model timeout")
+        days = 1 if city == self.short_for else args["duration_days"] + 1
+        return [ItineraryDay(day=1, title=f"{city} {i}") for i in range(days)]
+
+
+def _plan_city(monkeypatch, plan: TripPlan, index: int, **fake) -> dict:
+    monkeypatch.setattr(graph, "generate_itinerary", _FakeItineraryTool(**fake))
+    task = {"city_index": index, "stop": plan.route[index], "interests": ["food"]}
+    return asyncio.run(graph.plan_city_node(task))["city_itineraries"][0]
+
+
+def test_every_pending_city_is_sent_at_once(monkeypatch):
+    monkeypatch.setattr(settings, "ITINERARY_FAN_OUT", True)
+    sends = graph.controller_router(
+        {"plan": _plan("Rome", "Florence", "Milan", planned_days=2)}
+    )
+    assert [send.node for send in sends] == ["plan_city", "plan_city"]
+    assert [send.arg["stop"].city for send in sends] == ["Florence", "Milan"]
+    assert all(send.arg["interests"] == ["food"] for send in sends)
+
+
+def test_without_fan_out_only_the_current_city_is_sent(monkeypatch):
+    monkeypatch.setattr(settings, "ITINERARY_FAN_OUT", False)
+    sends = graph.controller_router({"plan": _plan("Rome", "Florence", "Milan")})
+    assert [send.arg["city_index"] for send in sends] == [0]
+
+
+def test_a_planned_route_goes_to_the_planner():
+    plan = _plan("Rome", "Florence", planned_days=4)
+    assert graph.controller_router({"plan": plan}) == "planner"
+
+
+def test_plan_city_keeps_the_stop_length(monkeypatch):
+    plan = _plan("Rome", "Florence")
+    result = _plan_city(monkeypatch, plan, 1)
+    assert result["index"] == 1
+    assert [day["title"] for day in result["days"]] == ["Florence 0", "Florence 1"]
+
+
+def test_plan_city_reports_failures(monkeypatch):
+    plan = _plan("Rome", "Florence")
+    assert _plan_city(monkeypatch, plan, 0, fail_for="Rome")["error"] == "model timeout"
+    short = _plan_city(monkeypatch, plan, 1, short_for="Florence")
+    assert short["error"] == "only 1 of 2 days were generated"
+
+
+def _days(city: str) -> list[dict]:
+    return [ItineraryDay(day=1, title=f"{city} {i}").model_dump() for i in range(2)]
+
+
+def test_join_stitches_cities_in_route_order():
+    plan = _plan("Rome", "Florence", "Milan")
+    results = [
+        {"index": 2, "days": _days("Milan")},
+        {"index": 0, "days": _days("Rome")},
+        {"index": 1, "days": _days("Florence")},
+    ]
+    update = graph.join_itineraries_node({"plan": plan, "city_itineraries": results})
+    titles = [day.title for day in update["plan"].itinerary]
+    assert titles[::2] == ["Rome 0", "Florence 0", "Milan 0"]
+    assert [day.day for day in update["plan"].itinerary] == [1, 2, 3, 4, 5, 6]
+    assert update["plan"].current_city_index == 3
+    assert update["city_itineraries"] is None and "messages" not in update
+
+
+def test_join_stops_at_the_first_failed_city():
+    plan = _plan("Rome", "Florence", "Milan")
+    results = [
+        {"index": 0, "days": _days("Rome")},
+        {"index": 1, "error": "model timeout"},
+        {"index": 2, "days": _days("Milan")},
+    ]
+    state = {"plan": plan, "city_itineraries": results}
+    update = graph.join_itineraries_node(state)
+    assert [day.title for day in update["plan"].itinerary] == ["Rome 0", "Rome 1"]
+    assert update["plan"].current_city_index == 1
+    (notice,) = update["messages"]
+    assert "Florence" in notice.content and "model timeout" in notice.content
+    assert graph.join_router({"messages": update["messages"]}) == END
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        HumanMessage(content="plan my trip"),
+        AIMessage(content="", tool_calls=[{"name": "x", "args": {}, "id": "1"}]),
+    ],
+)
+def test_join_router_continues_to_the_controller(message):
+    assert graph.join_router({"messages": [message]}) == "controller"
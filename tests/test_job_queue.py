@@ -0,0 +1,122 @@
+# tests/test_job_queue.py
+import pytest
+
+from database.job_queue import (
+    CANCELLED,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    SUCCEEDED,
+    JobQueue,
+)
+from database.models import QueryRequest
+
+
+@pytest.fixture
+def queue(db_path):
+    return JobQueue(db_path, stale_after=60, max_attempts=2, result_ttl=3600)
+
+
+def _request(session_id: str, query: str = "Plan a trip") -> QueryRequest:
+    return QueryRequest(query=query, session_id=session_id)
+
+
+def _age_heartbeat(queue: JobQueue, job_id: str, seconds: float):
+    queue._connect().execute(
+        "UPDATE jobs SET heartbeat_at = heartbeat_at - ? WHERE id = ?",
+        (seconds, job_id),
+    )
+
+
+def test_claim_takes_the_oldest_queued_job(queue):
+    first = queue.enqueue(_request("a"))
+    queue.enqueue(_request("b"))
+    job = queue.claim("w1")
+    assert job.id == first.id
+    assert job.status == RUNNING
+    assert job.attempts == 1
+    assert job.request.session_id == "a"
+
+
+def test_claim_skips_sessions_with_a_running_job(queue):
+    queue.enqueue(_request("a", "first"))
+    queue.enqueue(_request("a", "second"))
+    other = queue.enqueue(_request("b"))
+    assert queue.claim("w1").request.query == "first"
+    assert queue.claim("w2").id == other.id
+    assert queue.claim("w3") is None
+
+
+def test_finishing_is_reserved_to_the_owning_worker(queue):
+    job = queue.enqueue(_request("a"))
+    queue.claim("w1")
+    assert not queue.complete(job.id, "w2", {"response": "hi"})
+    assert queue.complete(job.id, "w1", {"response": "hi"})
+    done = queue.get(job.id)
+    assert done.status == SUCCEEDED
+    assert done.result == {"response": "hi"}
+    assert not queue.fail(job.id, "w1", "too late")
+
+
+def test_cancel_queued_job_is_immediate(queue):
+    job = queue.enqueue(_request("a"))
+    assert queue.cancel(job.id).status == CANCELLED
+    assert queue.claim("w1") is None
+
+
+def test_cancel_running_job_stops_its_heartbeat(queue):
+    job = queue.enqueue(_request("a"))
+    queue.claim("w1")
+    assert queue.heartbeat(job.id, "w1")
+    cancelled = queue.cancel(job.id)
+    assert cancelled.status == RUNNING
+    assert cancelled.cancel_requested
+    assert not queue.heartbeat(job.id, "w1")
+    assert queue.mark_cancelled(job.id, "w1")
+    assert queue.get(job.id).status == CANCELLED
+
+
+def test_stale_job_is_requeued_then_failed(queue):
+    job = queue.enqueue(_request("a"))
+    queue.claim("w1")
+    _age_heartbeat(queue, job.id, 120)
+    retried = queue.claim("w2")
+    assert retried.id == job.id
+    assert retried.attempts == 2
+    # The first worker lost the job and can't finish it any more.
+    assert not queue.heartbeat(job.id, "w1")
+    _age_heartbeat(queue, job.id, 120)
+    assert queue.claim("w3") is None
+    lost = queue.get(job.id)
+    assert lost.status == FAILED
+    assert lost.error
+
+
+def test_release_keeps_the_attempt_and_requeue_does_not(queue):
+    job = queue.enqueue(_request("a"))
+    queue.claim("w1")
+    queue.release(job.id, "w1")
+    assert queue.get(job.id).status == QUEUED
+    assert queue.claim("w1").attempts == 2
+    queue.requeue(job.id, "w1")
+    requeued = queue.get(job.id)
+    assert requeued.status == QUEUED
+    assert requeued.attempts == 1
+    assert requeued.started_at is None
+
+
+def test_active_job_and_stats(queue):
+    assert queue.active_job("a") is None
+    job = queue.enqueue(_request("a"))
+    queue.enqueue(_request("b"))
+    assert queue.active_job("a").id == job.id
+    queue.claim("w1")
+    queue.complete(job.id, "w1", None)
+    assert queue.active_job("a") is None
+    assert queue.stats() == {
+        QUEUED: 1,
+        RUNNING: 0,
+        SUCCEEDED: 1,
+        FAILED: 0,
+        CANCELLED: 0,
+    }
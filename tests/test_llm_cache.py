@@ -0,0 +1,133 @@
+# tests/test_llm_cache.py
+import time
+
+from core.cache import MISSING
+from core.llm_cache import LLMResultCache, count_model_calls
+
+
+def _cache(db_path, **overrides) -> LLMResultCache:
+    options = dict(max_bytes=1024 * 1024, ttl=60, stale_ttl=60)
+    options.update(overrides)
+    return LLMResultCache(db_path, **options)
+
+
+def _age(cache: LLMResultCache, seconds: float):
+    cache._connect().execute(
+        "UPDATE llm_cache SET created_at = created_at - ?", (seconds,)
+    )
+
+
+def _wait_for_refresh(cache: LLMResultCache):
+    deadline = time.monotonic() + 2
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_result_is_generated_once(db_path):
+    cache = _cache(db_path)
+    calls = []
+
+    @cache.cached("itinerary", version="v1")
+    def itinerary(city: str) -> list:
+        calls.append(city)
+        return [f"Day 1 in {city}"]
+
+    with count_model_calls() as count:
+        assert itinerary("Goa") == ["Day 1 in Goa"]
+        assert itinerary("goa") == ["Day 1 in Goa"]
+    assert calls == ["Goa"]
+    assert count.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_empty_results_are_not_cached(db_path):
+    cache = _cache(db_path)
+    calls = []
+
+    @cache.cached("itinerary", version="v1")
+    def itinerary(city: str) -> list:
+        calls.append(city)
+        return []
+
+    itinerary("Goa")
+    itinerary("Goa")
+    assert len(calls) == 2
+
+
+def test_new_version_does_not_match_old_entries(db_path):
+    cache = _cache(db_path)
+
+    @cache.cached("itinerary", version="v1")
+    def old(city: str) -> list:
+        return ["old"]
+
+    @cache.cached("itinerary", version="v2")
+    def new(city: str) -> list:
+        return ["new"]
+
+    assert old("Goa") == ["old"]
+    assert new("Goa") == ["new"]
+
+
+def test_expired_entry_is_regenerated(db_path):
+    cache = _cache(db_path)
+    results = iter([["first"], ["second"]])
+
+    @cache.cached("itinerary", version="v1")
+    def itinerary(city: str) -> list:
+        return next(results)
+
+    itinerary("Goa")
+    _age(cache, 61)
+    with count_model_calls() as count:
+        assert itinerary("Goa") == ["second"]
+    assert count.calls == 1
+
+
+def test_stale_entry_is_served_while_refreshing(db_path):
+    cache = _cache(db_path, stale_while_revalidate=True)
+    results = iter([["first"], ["second"]])
+
+    @cache.cached("itinerary", version="v1")
+    def itinerary(city: str) -> list:
+        return next(results)
+
+    itinerary("Goa")
+    _age(cache, 61)
+    with count_model_calls() as count:
+        assert itinerary("Goa") == ["first"]
+    # The background refresh isn't a call made for this turn.
+    assert count.calls == 0
+    _wait_for_refresh(cache)
+    assert itinerary("Goa") == ["second"]
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_entry_past_its_stale_window_is_not_served(db_path):
+    cache = _cache(db_path, stale_while_revalidate=True)
+    cache.set("k", ["old"])
+    _age(cache, 121)
+    assert cache.get("k") == (MISSING, False)
+
+
+def test_least_recently_used_entries_are_evicted(db_path):
+    cache = _cache(db_path, max_bytes=30)
+    cache.set("a", "x" * 10)
+    cache.set("b", "y" * 10)
+    cache.set("c", "z" * 10)
+    assert cache.get("a") == (MISSING, False)
+    assert cache.get("c") == ("z" * 10, False)
+
+
+def test_zero_ttl_still_counts_model_calls(db_path):
+    cache = _cache(db_path, ttl=0)
+
+    @cache.cached("itinerary", version="v1")
+    def itinerary(city: str) -> list:
+        return ["day"]
+
+    with count_model_calls() as count:
+        itinerary("Goa")
+        itinerary("Goa")
+    assert count.calls == 2
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,103 @@
+# tests/test_plan_patch.py
+import pytest
+from pydantic import ValidationError
+
+from agents.plan_patch import PlanPatcher
+from database.models import TripPlan
+
+
+def _day(day: int, title: str) -> dict:
+    return {"day": day, "title": title, "activities": [title]}
+
+
+def test_replace_records_only_changes():
+    plan = TripPlan(session_id="s", destination="Goa")
+    patcher = PlanPatcher(plan)
+    patcher.replace("destination", "Goa")
+    patcher.replace("duration_days", 5)
+    assert plan.duration_days == 5
+    assert patcher.ops == [{"op": "replace", "path": "/duration_days", "value": 5}]
+
+
+def test_replace_validates_the_value():
+    patcher = PlanPatcher(TripPlan(session_id="s"))
+    with pytest.raises(ValidationError):
+        patcher.replace("duration_days", "a week")
+    assert patcher.ops == []
+
+
+def test_replace_of_a_list_field_records_plain_values():
+    plan = TripPlan(session_id="s")
+    patcher = PlanPatcher(plan)
+    patcher.replace("interests", ["food"])
+    hotel = {
+        "name": "Taj",
+        "rating": 5,
+        "price_per_night": "100 EUR",
+        "review_score": 9,
+    }
+    patcher.replace("accommodation", [hotel])
+    assert plan.accommodation[0].name == "Taj"
+    assert patcher.ops[-1]["value"][0]["name"] == "Taj"
+    assert isinstance(patcher.ops[-1]["value"][0], dict)
+
+
+def test_extend_skips_items_already_present():
+    plan = TripPlan(session_id="s", interests=["food"])
+    patcher = PlanPatcher(plan)
+    patcher.extend("interests", ["food", "history", "history"])
+    assert plan.interests == ["food", "history"]
+    assert patcher.ops == [{"op": "add", "path": "/interests/-", "value": "history"}]
+
+
+def test_append_itinerary_renumbers_days():
+    plan = TripPlan(session_id="s")
+    patcher = PlanPatcher(plan)
+    patcher.append_itinerary([_day(1, "Beach"), _day(2, "Market")])
+    patcher.append_itinerary([_day(1, "Fort")])
+    assert [d.day for d in plan.itinerary] == [1, 2, 3]
+    assert plan.itinerary[2].title == "Fort"
+    assert [op["path"] for op in patcher.ops] == ["/itinerary/-"] * 3
+
+
+def test_apply_update_ignores_unknown_and_empty_fields():
+    plan = TripPlan(session_id="s")
+    patcher = PlanPatcher(plan)
+    patcher.apply_update(
+        {
+            "destination": "Lisbon",
+            "origin_city": None,
+            "not_a_field": 1,
+            "interests": ["food"],
+            "itinerary": [_day(4, "Alfama")],
+        }
+    )
+    assert plan.destination == "Lisbon"
+    assert plan.origin_city is None
+    assert plan.interests == ["food"]
+    assert plan.itinerary[0].day == 1
+    assert {op["path"] for op in patcher.ops} == {
+        "/destination",
+        "/interests/-",
+        "/itinerary/-",
+    }
+
+
+def test_invalid_update_leaves_the_plan_untouched():
+    plan = TripPlan(session_id="s", interests=["food"])
+    patcher = PlanPatcher(plan)
+    with pytest.raises(ValidationError):
+        patcher.apply_update(
+            {
+                "destination": "Lisbon",
+                "interests": ["history"],
+                "itinerary": [_day(1, "Alfama")],
+                "duration_days": "a week",
+            }
+        )
+    assert plan == TripPlan(session_id="s", interests=["food"])
+    assert patcher.ops == []
+    # The patcher is still usable afterwards.
+    patcher.apply_update({"destination": "Lisbon", "interests": ["history"]})
+    assert plan.interests == ["food", "history"]
+    assert len(patcher.ops) == 2
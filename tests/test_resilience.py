@@ -0,0 +1,106 @@
+# tests/test_resilience.py
+import time
+
+import httpx
+import pytest
+
+from core.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    Provider,
+    ProviderUnavailable,
+    TokenBucket,
+)
+
+
+def test_bucket_allows_a_burst_then_asks_to_wait():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.reserve(max_wait=0) == 0
+    assert bucket.reserve(max_wait=0) == 0
+    wait = bucket.reserve(max_wait=1)
+    assert 0 < wait <= 0.1
+
+
+def test_bucket_takes_nothing_when_the_wait_is_too_long():
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.reserve(max_wait=0)
+    assert bucket.reserve(max_wait=0.1) is None
+    assert bucket.tokens == pytest.approx(0, abs=0.05)
+
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket(rate=100, capacity=1)
+    bucket.reserve(max_wait=0)
+    time.sleep(0.02)
+    assert bucket.reserve(max_wait=0) == 0
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() > 0
+
+
+def test_breaker_lets_one_probe_through_after_recovery():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def _provider(**overrides) -> Provider:
+    options = dict(
+        rate=1000,
+        burst=100,
+        max_retries=2,
+        backoff_base=0,
+        backoff_max=1,
+        max_wait=0,
+        failure_threshold=2,
+        recovery_timeout=60,
+    )
+    options.update(overrides)
+    return Provider("test", **options)
+
+
+def _responses(*status_codes):
+    codes = iter(status_codes)
+    request = httpx.Request("GET", "https://example.com")
+    return lambda: httpx.Response(next(codes), request=request)
+
+
+def test_provider_retries_server_errors():
+    provider = _provider()
+    response = provider.call(_responses(503, 429, 200))
+    assert response.status_code == 200
+    assert provider.breaker.state == CLOSED
+
+
+def test_provider_fails_fast_once_the_circuit_is_open():
+    provider = _provider(max_retries=0)
+    assert provider.call(_responses(500)).status_code == 500
+    assert provider.call(_responses(500)).status_code == 500
+    with pytest.raises(ProviderUnavailable, match="circuit open"):
+        provider.call(_responses(200))
+
+
+def test_provider_rejects_calls_over_its_rate_limit():
+    provider = _provider(rate=1, burst=1)
+    provider.call(_responses(200))
+    with pytest.raises(ProviderUnavailable, match="rate limit"):
+        provider.call(_responses(200))
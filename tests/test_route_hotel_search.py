@@ -0,0 +1,92 @@
+# tests/test_route_hotel_search.py
+import asyncio
+
+import httpx
+import pytest
+
+from database.models import CityStop, HotelDetails, TripPlan
+from tools import route_hotel_search_tool
+from tools.hotel_search_tool import _parse_hotels
+from tools.route_hotel_search_tool import route_hotel_search
+
+
+def _hotel(name: str, price: int, review_score: float) -> dict:
+    return {
+        "name": name,
+        "rating": 3.0,
+        "price_per_night": f"{price} INR",
+        "review_score": review_score,
+    }
+
+
+HOTELS = {
+    "Rome": [
+        _hotel("Cheap", 4000, 8.0),
+        _hotel("Best", 9000, 9.1),
+        _hotel("Pricey", 12000, 8.0),
+        _hotel("Low", 3000, 6.0),
+    ],
+    "Florence": [{"error": "No hotels found for the given location and dates."}],
+}
+
+
+def _fetch_hotels(city, check_in, check_out, num_adults=1):
+    if city == "Milan":
+        raise httpx.ConnectError("down")
+    return HOTELS[city]
+
+
+async def _afetch_hotels(*args):
+    return _fetch_hotels(*args)
+
+
+@pytest.fixture(autouse=True)
+def stub_fetch(monkeypatch):
+    monkeypatch.setattr(route_hotel_search_tool, "fetch_hotels", _fetch_hotels)
+    monkeypatch.setattr(route_hotel_search_tool, "afetch_hotels", _afetch_hotels)
+
+
+def _plan(*cities: str) -> TripPlan:
+    route = [CityStop(city=city, country="Italy", num_days=2) for city in cities]
+    return TripPlan(session_id="s", route=route)
+
+
+def test_null_ratings_parse_as_zero():
+    data = {"result": [{"hotel_name": None, "class": None, "review_score": None}]}
+    response = httpx.Response(200, json=data, request=httpx.Request("GET", "http://x"))
+    hotel = _parse_hotels(response)[0]
+    assert HotelDetails.model_validate(hotel).rating == 0.0
+    assert hotel["name"] == "N/A" and hotel["review_score"] == 0.0
+
+
+def test_best_reviewed_hotels_per_city_go_to_the_plan():
+    plan = _plan("Rome", "Florence", "Milan")
+    result = route_hotel_search.invoke({"start_date": "2030-05-01", "plan": plan})
+    names = [hotel["name"] for hotel in result["plan_update"]["accommodation"]]
+    assert names == ["Best", "Cheap", "Pricey"]
+    rome, florence, milan = result["cities"]
+    assert (rome["check_in"], rome["check_out"]) == ("2030-05-01", "2030-05-03")
+    assert florence["check_in"] == "2030-05-03" and "No hotels" in florence["error"]
+    assert milan["error"] == "down" and milan["hotels_saved"] == 0
+
+
+def test_async_twin_gives_the_same_result():
+    plan = _plan("Rome", "Florence")
+    args = {"start_date": "2030-05-01", "plan": plan}
+    assert asyncio.run(route_hotel_search.ainvoke(args)) == (
+        route_hotel_search.invoke(args)
+    )
+
+
+def test_single_city_trip_uses_the_destination():
+    plan = TripPlan(session_id="s", destination="Rome", duration_days=3)
+    result = route_hotel_search.invoke({"start_date": "2030-05-01", "plan": plan})
+    assert result["cities"][0]["check_out"] == "2030-05-04"
+
+
+def test_unusable_input_is_reported():
+    empty = TripPlan(session_id="s")
+    result = route_hotel_search.invoke({"start_date": "2030-05-01", "plan": empty})
+    assert result == {"error": "The plan has no route or destination yet."}
+    result = route_hotel_search.invoke({"start_date": "May 1", "plan": _plan("Rome")})
+    assert result == {"error": "start_date must be in YYYY-MM-DD format."}
@@ -0,0 +1,73 @@
+# tests/test_route_optimizer.py
+import itertools
+
+import numpy as np
+import pytest
+
+from core.route_optimizer import (
+    distance_matrix,
+    order_points,
+    path_length,
+    shortest_path,
+)
+
+DELHI = (28.5562, 77.1000)
+# Cities along a rough west-to-east line across Europe, listed out of order
+CITIES = {
+    "Vienna": (48.1103, 16.5697),
+    "Lisbon": (38.7813, -9.1359),
+    "Munich": (48.3538, 11.7861),
+    "Madrid": (40.4983, -3.5676),
+    "Paris": (49.0097, 2.5479),
+}
+
+
+def _brute_force(dist: np.ndarray) -> float:
+    return min(
+        path_length(dist, order) for order in itertools.permutations(range(len(dist)))
+    )
+
+
+def test_distance_matrix_is_symmetric_great_circle_km():
+    dist = distance_matrix([CITIES["Paris"], CITIES["Madrid"], CITIES["Paris"]])
+    assert dist.shape == (3, 3)
+    np.testing.assert_allclose(dist, dist.T)
+    assert dist[0, 2] == pytest.approx(0)
+    assert dist[0, 1] == pytest.approx(1060, rel=0.05)
+
+
+def test_shortest_path_matches_brute_force_on_small_routes():
+    dist = distance_matrix(list(CITIES.values()))
+    order = shortest_path(dist)
+    assert sorted(order) == list(range(len(CITIES)))
+    assert path_length(dist, order) == pytest.approx(_brute_force(dist))
+
+
+def test_order_points_visits_cities_along_the_line():
+    names = list(CITIES)
+    order = [names[i] for i in order_points(list(CITIES.values()))]
+    expected = ["Lisbon", "Madrid", "Paris", "Munich", "Vienna"]
+    assert order in (expected, expected[::-1])
+
+
+def test_order_points_pins_endpoints():
+    coordinates = list(CITIES.values())
+    names = list(CITIES)
+    order = order_points(coordinates, start=0, end=1)
+    assert names[order[0]] == "Vienna"
+    assert names[order[-1]] == "Lisbon"
+    assert sorted(order) == list(range(len(coordinates)))
+
+
+def test_order_points_starts_next_to_an_outside_anchor():
+    # From Delhi, the trip should start at the eastern end of the line.
+    names = list(CITIES)
+    order = order_points(list(CITIES.values()), start=DELHI, end=DELHI)
+    assert names[order[0]] == "Vienna"
+    assert len(order) == len(CITIES)
+
+
+@pytest.mark.parametrize("count", [0, 1, 2])
+def test_order_points_handles_tiny_routes(count):
+    coordinates = list(CITIES.values())[:count]
+    assert sorted(order_points(coordinates)) == list(range(count))
@@ -0,0 +1,113 @@
+# tests/test_route_weather.py
+import asyncio
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from core.cache import tool_cache
+from core.config import settings
+from database.models import CityStop, TripPlan
+from tools import route_weather_tool
+from tools.route_weather_tool import route_weather
+
+TODAY = date.today()
+
+
+def _forecast(city: str, days: int) -> dict:
+    return {
+        "forecast": {
+            "forecastday": [
+                {
+                    "date": (TODAY + timedelta(days=i)).isoformat(),
+                    "day": {
+                        "condition": {"text": f"Sunny in {city}"},
+                        "mintemp_c": 18.0,
+                        "maxtemp_c": 27.4,
+                        "daily_chance_of_rain": 10,
+                    },
+                }
+                for i in range(days)
+            ]
+        }
+    }
+
+
+@pytest.fixture
+def api_calls(monkeypatch):
+    """Stubs the forecast API; returns the (city, days) of every request."""
+    made = []
+
+    def http_get(url, params, provider):
+        made.append((params["q"], params["days"]))
+        if params["q"] == "Atlantis":
+            raise httpx.ConnectError("unreachable")
+        data = _forecast(params["q"], params["days"])
+        return httpx.Response(200, json=data, request=httpx.Request("GET", url))
+
+    async def ahttp_get(*args, **kwargs):
+        return http_get(*args, **kwargs)
+
+    monkeypatch.setattr(route_weather_tool, "http_get", http_get)
+    monkeypatch.setattr(route_weather_tool, "ahttp_get", ahttp_get)
+    tool_cache.clear()
+    yield made
+    tool_cache.clear()
+
+
+def _args(*stops: tuple[str, int], start: date = TODAY) -> dict:
+    route = [CityStop(city=city, country="", num_days=days) for city, days in stops]
+    plan = TripPlan(session_id="s", route=route)
+    return {"start_date": start.isoformat(), "plan": plan}
+
+
+def test_one_request_per_city_covers_the_trip(api_calls):
+    table = route_weather.invoke(_args(("Rome", 2), ("Florence", 1), ("Rome", 1)))
+    lines = table.splitlines()
+    assert lines[0] == "date | city | forecast | min-max °C | rain"
+    assert lines[1] == f"{TODAY} | Rome | Sunny in Rome | 18-27 | 10%"
+    assert [line.split(" | ")[1] for line in lines[1:]] == [
+        "Rome",
+        "Rome",
+        "Florence",
+        "Rome",
+    ]
+    assert sorted(api_calls) == [("Florence", 3), ("Rome", 4)]
+
+
+def test_forecast_days_are_served_from_the_cache(api_calls):
+    route_weather.invoke(_args(("Rome", 3)))
+    api_calls.clear()
+    assert "Sunny in Rome" in route_weather.invoke(_args(("Rome", 2)))
+    assert api_calls == []
+
+
+def test_days_out_of_range_share_one_note(api_calls):
+    start = TODAY + timedelta(days=settings.WEATHER_FORECAST_DAYS - 1)
+    table = route_weather.invoke(_args(("Rome", 4), start=start))
+    first, last = start + timedelta(days=1), start + timedelta(days=3)
+    assert f"{first}..{last} | Rome | n/a [1] | |" in table
+    assert table.endswith("[1] too far ahead to forecast")
+
+
+def test_a_failing_city_does_not_hide_the_others(api_calls):
+    table = route_weather.invoke(_args(("Atlantis", 2), ("Rome", 1)))
+    assert "Atlantis | n/a [1]" in table and "Sunny in Rome" in table
+    assert "unreachable" in table.splitlines()[-1]
+
+
+def test_async_twin_gives_the_same_table(api_calls):
+    args = _args(("Rome", 2), ("Florence", 1))
+    assert asyncio.run(route_weather.ainvoke(args)) == route_weather.invoke(args)
+
+
+def test_unusable_input_is_reported(api_calls):
+    args = {"start_date": "tomorrow", "plan": _args(("Rome", 1))["plan"]}
+    assert route_weather.invoke(args) == (
+        "Error: start_date must be in YYYY-MM-DD format."
+    )
+    empty = {"start_date": TODAY.isoformat(), "plan": TripPlan(session_id="s")}
+    assert route_weather.invoke(empty) == (
+        "Error: The plan has no route or destination yet."
+    )
+    assert api_calls == []
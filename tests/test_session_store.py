@@ -0,0 +1,74 @@
+# tests/test_session_store.py
+import uuid
+
+import pytest
+from sqlmodel import Session, update
+
+from core.config import settings
+from database.database import SessionStore, TripPlanRecord, engine
+from database.models import TripPlan
+
+
+@pytest.fixture
+def session_id():
+    return uuid.uuid4().hex
+
+
+def _backdate(session_id: str, seconds: float):
+    with Session(engine) as session:
+        session.exec(
+            update(TripPlanRecord)
+            .where(TripPlanRecord.session_id == session_id)
+            .values(updated_at=TripPlanRecord.updated_at - seconds)
+        )
+        session.commit()
+
+
+def test_unknown_session_gets_an_empty_plan(session_id):
+    plan = SessionStore().get(session_id)
+    assert plan == TripPlan(session_id=session_id)
+
+
+def test_saved_plan_round_trips_as_a_copy(session_id):
+    store = SessionStore()
+    store.save(TripPlan(session_id=session_id, destination="Goa"))
+    plan = store.get(session_id)
+    assert plan.destination == "Goa"
+    plan.destination = "Rome"
+    assert store.get(session_id).destination == "Goa"
+
+
+def test_save_in_another_store_is_seen_on_the_next_read(session_id):
+    # Two stores stand in for two worker processes sharing the database.
+    first, second = SessionStore(), SessionStore()
+    first.save(TripPlan(session_id=session_id, destination="Goa"))
+    assert second.get(session_id).destination == "Goa"
+    second.save(TripPlan(session_id=session_id, destination="Rome"))
+    assert first.get(session_id).destination == "Rome"
+
+
+def test_idle_session_expires(session_id):
+    store = SessionStore()
+    store.save(TripPlan(session_id=session_id, destination="Goa"))
+    _backdate(session_id, settings.SESSION_TTL_SECONDS + 1)
+    assert store.get(session_id).destination is None
+
+
+def test_save_purges_idle_sessions(session_id, monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_PURGE_INTERVAL", 0)
+    store = SessionStore()
+    store.save(TripPlan(session_id=session_id, destination="Goa"))
+    _backdate(session_id, settings.SESSION_TTL_SECONDS + 1)
+    store.save(TripPlan(session_id=uuid.uuid4().hex))
+    with Session(engine) as session:
+        assert session.get(TripPlanRecord, session_id) is None
+
+
+def test_hot_entries_are_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "SESSION_CACHE_SIZE", 2)
+    store = SessionStore()
+    session_ids = [uuid.uuid4().hex for _ in range(3)]
+    for session_id in session_ids:
+        store.save(TripPlan(session_id=session_id))
+    assert list(store._hot) == session_ids[1:]
+    assert store.get(session_ids[0]).session_id == session_ids[0]
@@ -0,0 +1,107 @@
+# tests/test_singleflight.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.singleflight import SingleFlight
+
+
+def _value(value):
+    async def load():
+        await asyncio.sleep(0)
+        return value
+
+    return load
+
+
+def test_concurrent_threads_share_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return {"value": 1}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("ns", "k", load)))
+    leader.start()
+    started.wait(2)
+    followers = [
+        threading.Thread(target=lambda: results.append(flight.do("ns", "k", load)))
+        for _ in range(3)
+    ]
+    for thread in followers:
+        thread.start()
+    # Followers wait on the leader's call; let them register before finishing.
+    while flight.stats()["namespaces"]["ns"]["coalesced"] < 3:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(2)
+    assert len(calls) == 1
+    assert results == [{"value": 1}] * 4
+    # Every caller gets its own copy.
+    assert len({id(result) for result in results}) == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_concurrent_tasks_share_one_call_and_its_error():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream error")
+
+    async def main():
+        return await asyncio.gather(
+            *(flight.ado("ns", "k", load) for _ in range(3)), return_exceptions=True
+        )
+
+    errors = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def main():
+        return await asyncio.gather(
+            flight.ado("ns", "a", _value("a")), flight.ado("ns", "b", _value("b"))
+        )
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert flight.stats()["namespaces"]["ns"] == {"calls": 2, "coalesced": 0}
+
+
+def test_cancelled_leader_hands_over_to_a_follower():
+    flight = SingleFlight()
+    calls = []
+
+    def load():
+        async def run():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+
+        return run()
+
+    async def main():
+        leader = asyncio.create_task(flight.ado("ns", "k", load))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.ado("ns", "k", load))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "done"
+    assert len(calls) == 2
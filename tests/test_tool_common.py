@@ -0,0 +1,79 @@
+# tests/test_tool_common.py
+import asyncio
+
+import httpx
+import pytest
+
+from core.config import settings
+from tools import weather_info_tool
+from tools._common import ToolInputError, guarded, require
+from tools.weather_info_tool import weather_info
+
+
+def _on_error(e):
+    if isinstance(e, ToolInputError):
+        return f"bad input: {e}"
+    raise e
+
+
+@guarded(_on_error)
+def _sync(value):
+    """The tool description."""
+    if value < 0:
+        raise ToolInputError("negative")
+    if value == 0:
+        raise ZeroDivisionError
+    return value
+
+
+@guarded(_on_error)
+async def _async(value):
+    return _sync.__wrapped__(value)
+
+
+def test_guarded_twins_share_the_error_handling():
+    for value, expected in ((2, 2), (-1, "bad input: negative")):
+        assert _sync(value) == expected
+        assert asyncio.run(_async(value)) == expected
+    with pytest.raises(ZeroDivisionError):
+        _sync(0)
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(_async(0))
+    assert _sync.__doc__ == "The tool description."
+
+
+def test_require_names_the_missing_setting(monkeypatch):
+    monkeypatch.setattr(settings, "WEATHER_API_KEY", "")
+    with pytest.raises(ToolInputError, match="WEATHER_API_KEY is not set."):
+        require("WEATHER_API_KEY")
+
+
+def _weather_response(*args, **kwargs):
+    data = {
+        "current": {
+            "temp_c": 30,
+            "feelslike_c": 33,
+            "humidity": 70,
+            "condition": {"text": "Sunny"},
+        }
+    }
+    return httpx.Response(200, json=data, request=httpx.Request("GET", args[0]))
+
+
+async def _aweather_response(*args, **kwargs):
+    return _weather_response(*args, **kwargs)
+
+
+def test_weather_tool_twins_agree(monkeypatch):
+    monkeypatch.setattr(weather_info_tool, "http_get", _weather_response)
+    monkeypatch.setattr(weather_info_tool, "ahttp_get", _aweather_response)
+    # Different places, so the async call isn't answered from the cache
+    sync = weather_info.invoke({"location": "Goa"})
+    asynchronous = asyncio.run(weather_info.ainvoke({"location": "Pune"}))
+    assert sync.startswith("The current weather in Goa is 30°C")
+    assert asynchronous == sync.replace("Goa", "Pune")
+
+    monkeypatch.setattr(settings, "WEATHER_API_KEY", "")
+    assert weather_info.invoke({"location": "Goa"}) == (
+        "Error: WEATHER_API_KEY is not set."
+    )
@@ -0,0 +1,97 @@
+# tests/test_tool_node.py
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+
+from agents import graph
+from database.models import TripPlan
+from tools import route_hotel_search_tool
+
+
+async def _slow(text: str) -> str:
+    await asyncio.sleep(0.05)
+    return f"slow {text}"
+
+
+async def _fast(text: str) -> str:
+    return f"fast {text}"
+
+
+async def _broken(text: str) -> str:
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def fake_tools(monkeypatch):
+    for func in (_slow, _fast, _broken):
+        name = func.__name__.lstrip("_")
+        tool = StructuredTool.from_function(coroutine=func, name=name, description=name)
+        monkeypatch.setitem(graph.tool_map, name, tool)
+
+
+def _state(*calls: tuple[str, dict]) -> dict:
+    tool_calls = [
+        {"name": name, "args": args, "id": f"call-{i}"}
+        for i, (name, args) in enumerate(calls)
+    ]
+    message = AIMessage(content="", tool_calls=tool_calls)
+    return {"messages": [message], "plan": TripPlan(session_id="s")}
+
+
+def _run(state: dict) -> dict:
+    return asyncio.run(graph.custom_tool_node(state))
+
+
+def test_messages_keep_the_call_order():
+    update = _run(_state(("slow", {"text": "a"}), ("fast", {"text": "b"})))
+    assert [m.content for m in update["messages"]] == ["slow a", "fast b"]
+    assert [m.tool_call_id for m in update["messages"]] == ["call-0", "call-1"]
+
+
+def test_a_failing_call_does_not_take_down_its_siblings():
+    update = _run(_state(("broken", {"text": "a"}), ("fast", {"text": "b"})))
+    failed, ok = update["messages"]
+    assert failed.status == "error" and "boom" in failed.content
+    assert ok.content == "fast b" and ok.status == "success"
+
+
+def _async(func):
+    async def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _hotels(rating):
+    def fetch(city, check_in, check_out, num_adults=1):
+        hotel = {"name": "H", "price_per_night": "10 INR", "review_score": 8.0}
+        return [{**hotel, "rating": rating}]
+
+    return fetch
+
+
+def test_plan_updates_are_applied(monkeypatch):
+    monkeypatch.setattr(route_hotel_search_tool, "afetch_hotels", _async(_hotels(4.0)))
+    plan = TripPlan(session_id="s", destination="Rome", duration_days=2)
+    state = _state(("route_hotel_search", {"start_date": "2030-05-01"}))
+    update = _run({**state, "plan": plan})
+    assert [h.name for h in update["plan"].accommodation] == ["H"]
+    assert update["plan_patch"][0]["path"] == "/accommodation"
+    assert "plan_update" not in update["messages"][0].content
+
+
+def test_an_invalid_plan_update_becomes_an_error_message(monkeypatch):
+    monkeypatch.setattr(
+        route_hotel_search_tool, "afetch_hotels", _async(_hotels("five stars"))
+    )
+    plan = TripPlan(session_id="s", destination="Rome", duration_days=2)
+    state = _state(
+        ("route_hotel_search", {"start_date": "2030-05-01"}), ("fast", {"text": "b"})
+    )
+    update = _run({**state, "plan": plan})
+    rejected, ok = update["messages"]
+    assert rejected.status == "error" and "plan update rejected" in rejected.content
+    assert ok.content == "fast b"
+    assert "plan" not in update and plan.accommodation == []
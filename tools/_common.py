@@ -0,0 +1,60 @@
+# tools/_common.py
+import functools
+import inspect
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from core.config import settings
+from core.resilience import ProviderUnavailable
+
+
+class ToolInputError(ValueError):
+    """Arguments or settings a tool can't work with; the message goes to the model."""
+
+
+def require(setting: str) -> None:
+    """Raise `ToolInputError` if the API key `setting` isn't configured."""
+    if not getattr(settings, setting):
+        raise ToolInputError(f"{setting} is not set.")
+
+
+def guarded(on_error: Callable[[Exception], Any]):
+    """
+    Decorator for the sync and async twins of a tool: an exception they raise
+    becomes the result `on_error(e)` returns, or propagates if `on_error`
+    re-raises it. Validation, parsing and formatting live in shared helpers, so
+    the twins only differ in the transport call.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    return on_error(e)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return on_error(e)
+
+        return wrapper
+
+    return decorator
+
+
+def search_error(e: Exception) -> List[Dict[str, Any]]:
+    """A failed flight or hotel search, as the one-item list those tools return."""
+    if isinstance(e, ProviderUnavailable):
+        return [{"error": str(e)}]
+    if isinstance(e, httpx.HTTPError):
+        return [{"error": f"API request failed: {e}"}]
+    return [{"error": f"An unexpected error occurred: {e}"}]
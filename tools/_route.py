@@ -0,0 +1,47 @@
+# tools/_route.py
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from database.models import CityStop, TripPlan
+from tools._common import ToolInputError
+
+
+def trip_stops(plan: TripPlan) -> List[CityStop]:
+    """The planned route, or the destination alone for a single-city trip."""
+    if plan.route:
+        return plan.route
+    if plan.destination:
+        days = plan.duration_days or 1
+        return [CityStop(city=plan.destination, country="", num_days=days)]
+    return []
+
+
+def stays(route: List[CityStop], start_date: str) -> List[Dict[str, Any]]:
+    """
+    Check-in/check-out dates per stop: each city starts where the previous one
+    ends. Raises `ValueError` if `start_date` isn't YYYY-MM-DD.
+    """
+    check_in = date.fromisoformat(start_date)
+    result = []
+    for stop in route:
+        check_out = check_in + timedelta(days=max(stop.num_days, 1))
+        result.append(
+            {
+                "city": stop.city,
+                "check_in": check_in.isoformat(),
+                "check_out": check_out.isoformat(),
+            }
+        )
+        check_in = check_out
+    return result
+
+
+def plan_stays(plan: TripPlan, start_date: str) -> List[Dict[str, Any]]:
+    """`stays` of `trip_stops(plan)`, raising `ToolInputError` if there are none."""
+    stops = trip_stops(plan)
+    if not stops:
+        raise ToolInputError("The plan has no route or destination yet.")
+    try:
+        return stays(stops, start_date)
+    except ValueError:
+        raise ToolInputError("start_date must be in YYYY-MM-DD format.") from None
@@ -0,0 +1,23 @@
+# tools/airport_lookup_tool.py
+from typing import Any, Dict, List
+
+from langchain_core.tools import StructuredTool
+from core.airport_index import get_airport_index
+
+
+def _airport_lookup(query: str) -> List[Dict[str, Any]]:
+    """
+    Finds airports offline (no API call) for a city, airport name or IATA code,
+    e.g. "Delhi", "Goa, India", "Heathrow" or "BOM". Tolerates typos.
+    Returns each airport's IATA code, name, city, country and coordinates,
+    main airport of the city first.
+    """
+    matches = get_airport_index().search(query)
+    if not matches:
+        return [{"error": f"No airport found for: {query}"}]
+    return [{**airport.to_dict(), "match": match} for airport, match in matches]
+
+
+airport_lookup = StructuredTool.from_function(
+    func=_airport_lookup, name="airport_lookup"
+)
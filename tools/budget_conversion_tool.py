@@ -0,0 +1,71 @@
+# tools/budget_conversion_tool.py
+from langchain_core.tools import StructuredTool
+from database.models import BudgetItem
+from tools._common import ToolInputError, guarded, require
+from tools.currency_conversion_tool import (
+    ConversionFailed,
+    RateTable,
+    aget_rate_table,
+    get_rate_table,
+)
+from typing import List, Dict, Any
+
+
+def _convert_items(
+    table: RateTable, items: List[BudgetItem], target_currency: str
+) -> Dict[str, Any]:
+    target_currency = target_currency.upper()
+    converted, errors = [], []
+    for item in items:
+        try:
+            cost = table.convert(item.estimated_cost, item.currency, target_currency)
+        except ConversionFailed as e:
+            errors.append(f"{item.category}: {e}")
+            continue
+        converted.append(
+            {
+                "category": item.category,
+                "estimated_cost": round(cost, 2),
+                "currency": target_currency,
+                "original_cost": item.estimated_cost,
+                "original_currency": item.currency.upper(),
+            }
+        )
+    result = {
+        "currency": target_currency,
+        "items": converted,
+        "total": round(sum(i["estimated_cost"] for i in converted), 2),
+    }
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+def _budget_error(e: Exception) -> Dict[str, Any]:
+    if isinstance(e, ToolInputError):
+        return {"error": str(e)}
+    return {"error": f"Budget conversion failed: {e}"}
+
+
+@guarded(_budget_error)
+def _convert_budget(items: List[BudgetItem], target_currency: str) -> Dict[str, Any]:
+    """
+    Converts a whole list of budget items (possibly in mixed currencies) into
+    one target currency in a single call, e.g. the user's home currency.
+    Returns the converted items, ready for `PlanUpdater(budget=...)`, and the total.
+    """
+    require("EXCHANGE_RATES_API_KEY")
+    return _convert_items(get_rate_table(), items, target_currency)
+
+
+@guarded(_budget_error)
+async def _aconvert_budget(
+    items: List[BudgetItem], target_currency: str
+) -> Dict[str, Any]:
+    require("EXCHANGE_RATES_API_KEY")
+    return _convert_items(await aget_rate_table(), items, target_currency)
+
+
+convert_budget = StructuredTool.from_function(
+    func=_convert_budget, coroutine=_aconvert_budget, name="convert_budget"
+)
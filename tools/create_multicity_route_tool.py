@@ -1,10 +1,18 @@
 # tools/create_multicity_route_tool.py
-from langchain.tools import tool
+import logging
+
+from langchain_core.tools import StructuredTool
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
-from core.model_loader import get_llm
+from core.airport_index import get_airport_index, normalize
+from core.config import settings
+from core.llm_cache import llm_cache, prompt_version
+from core.model_loader import model_registry
+from tools._common import guarded
 from database.models import CityStop
-from typing import List
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
 
 
 class Route(BaseModel):
@@ -15,8 +23,6 @@ class Route(BaseModel):
     )
 
 
-route_llm = get_llm()
-
 ROUTE_GENERATION_PROMPT = ChatPromptTemplate.from_messages(
     [
         (
@@ -30,24 +36,121 @@ ROUTE_GENERATION_PROMPT = ChatPromptTemplate.from_messages(
     ]
 )
 
-structured_llm = route_llm.with_structured_output(Route)
+# Cached routes are dropped automatically when the prompt or schema changes
+ROUTE_PROMPT_VERSION = prompt_version(ROUTE_GENERATION_PROMPT, Route)
 
 
-@tool("create_multicity_route")
-def create_multicity_route(
-    region: str, duration_days: int, interests: List[str]
-) -> List[CityStop]:
-    """Creates a high-level, multi-city travel route for large regions like 'Europe' or 'Southeast Asia'."""
-    prompt = ROUTE_GENERATION_PROMPT.invoke(
+def _route_prompt(region: str, duration_days: int, interests: List[str]):
+    return ROUTE_GENERATION_PROMPT.invoke(
         {
             "region": region,
             "duration_days": duration_days,
             "interests": ", ".join(interests),
         }
     )
-    try:
-        route_result = structured_llm.invoke(prompt)
-        return route_result.route_plan
-    except Exception as e:
-        print(f"Error in create_multicity_route_tool: {e}")
-        return []
+
+
+def _route_stops(route_result: Route) -> List[dict]:
+    return [stop.model_dump() for stop in route_result.route_plan]
+
+
+@llm_cache.cached("route", ROUTE_PROMPT_VERSION)
+def _llm_route(region: str, duration_days: int, interests: List[str]):
+    prompt = _route_prompt(region, duration_days, interests)
+    structured_llm = model_registry.with_structured_output(Route)
+    return _route_stops(structured_llm.invoke(prompt))
+
+
+@llm_cache.cached("route", ROUTE_PROMPT_VERSION)
+async def _allm_route(region: str, duration_days: int, interests: List[str]):
+    prompt = _route_prompt(region, duration_days, interests)
+    structured_llm = model_registry.with_structured_output(Route)
+    return _route_stops(await structured_llm.ainvoke(prompt))
+
+
+def _validated(stops: List[dict]) -> List[CityStop]:
+    return [CityStop.model_validate(stop) for stop in stops]
+
+
+def _endpoint(place: Optional[str], stops: List[CityStop]):
+    """A stop to pin, or the coordinates of a place outside the route."""
+    if not place:
+        return None
+    key = normalize(place.split(",")[0])
+    for index, stop in enumerate(stops):
+        if normalize(stop.city) == key:
+            return index
+    airport = get_airport_index().resolve(place)
+    return (airport.latitude, airport.longitude) if airport else None
+
+
+def _ordered(
+    stops: List[CityStop], start_city: Optional[str], end_city: Optional[str]
+) -> List[CityStop]:
+    """
+    Puts the stops in a short travel order (great-circle distances between
+    their airports), keeping each stop's days. Only stops the airport index
+    knows by exact name are moved; any other stop keeps its place in the route.
+    """
+    if not settings.ROUTE_OPTIMIZATION:
+        return stops
+    # NumPy is only imported once a route is ordered, keeping it off the cold start.
+    from core.route_optimizer import order_points
+
+    index = get_airport_index()
+    positions, coordinates = [], []
+    for position, stop in enumerate(stops):
+        if airport := index.resolve(stop.city):
+            positions.append(position)
+            coordinates.append((airport.latitude, airport.longitude))
+    if len(positions) < 2:
+        return stops
+    placed = [stops[position] for position in positions]
+    start, end = _endpoint(start_city, placed), _endpoint(end_city, placed)
+    if isinstance(end, int) and end == start:
+        end = None
+    ordered = list(stops)
+    for position, i in zip(positions, order_points(coordinates, start, end)):
+        ordered[position] = placed[i]
+    return ordered
+
+
+def _route_failed(e: Exception) -> List[CityStop]:
+    logger.exception("Route generation failed")
+    return []
+
+
+@guarded(_route_failed)
+def _create_multicity_route(
+    region: str,
+    duration_days: int,
+    interests: List[str],
+    start_city: Optional[str] = None,
+    end_city: Optional[str] = None,
+) -> List[CityStop]:
+    """
+    Creates a high-level, multi-city travel route for large regions like 'Europe' or 'Southeast Asia'.
+    Cities come back in a short travel order. Pass the traveller's origin city as
+    `start_city` (and as `end_city` for a round trip) to start (and end) near home.
+    """
+    stops = _llm_route(region, duration_days, interests)
+    return _ordered(_validated(stops), start_city, end_city)
+
+
+@guarded(_route_failed)
+async def _acreate_multicity_route(
+    region: str,
+    duration_days: int,
+    interests: List[str],
+    start_city: Optional[str] = None,
+    end_city: Optional[str] = None,
+) -> List[CityStop]:
+    stops = await _allm_route(region, duration_days, interests)
+    return _ordered(_validated(stops), start_city, end_city)
+
+
+create_multicity_route = StructuredTool.from_function(
+    func=_create_multicity_route,
+    coroutine=_acreate_multicity_route,
+    name="create_multicity_route",
+)
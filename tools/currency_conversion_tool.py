@@ -1,28 +1,105 @@
-from langchain.tools import tool
-import requests
+from langchain_core.tools import StructuredTool
+import httpx
+from core.cache import tool_cache
 from core.config import settings
+from core.http_client import http_get, ahttp_get
+from tools._common import ToolInputError, guarded, require
 
 
-@tool("currency_converter")
-def currency_converter(amount: float, from_currency: str, to_currency: str) -> str:
-    """Convert currency using Exchange Rates API."""
-    api_key = settings.EXCHANGE_RATES_API_KEY
-    if not api_key:
-        return "Error: EXCHANGE_RATES_API_KEY is not set."
-    url = (
-        f"https://v6.exchangerate-api.com/v6/{api_key}/pair/"
-        f"{from_currency}/{to_currency}/{amount}"
+class ConversionFailed(Exception):
+    """The API answered, but refused the conversion (bad currency code, quota...)."""
+
+
+class RateTable:
+    """
+    Exchange rates against a single base currency. Any pair is converted
+    through the base (a cross rate), so one table serves every conversion.
+    """
+
+    def __init__(self, base: str, rates: dict[str, float]):
+        self.base = base
+        self.rates = rates
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        from_currency, to_currency = from_currency.upper(), to_currency.upper()
+        for code in (from_currency, to_currency):
+            if code not in self.rates:
+                raise ConversionFailed(f"unsupported-code {code}")
+        return self.rates[to_currency] / self.rates[from_currency]
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        return amount * self.rate(from_currency, to_currency)
+
+
+def _latest_url(base: str) -> str:
+    return (
+        f"{settings.EXCHANGE_RATES_API_BASE_URL}/{settings.EXCHANGE_RATES_API_KEY}"
+        f"/latest/{base}"
     )
-    try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        if data.get("result") == "success":
-            converted = data["conversion_result"]
-            return f"{amount} {from_currency} is approximately {converted:.2f} {to_currency}"
-        else:
-            return (
-                f"Currency conversion failed: {data.get('error-type', 'Unknown error')}"
-            )
-    except Exception as e:
-        return f"Currency conversion error: {e}"
+
+
+def _parse_rates(response: httpx.Response) -> dict[str, float]:
+    response.raise_for_status()
+    data = response.json()
+    if data.get("result") == "success":
+        return data["conversion_rates"]
+    raise ConversionFailed(data.get("error-type", "Unknown error"))
+
+
+@tool_cache.cached("fx_rates", ttl=settings.FX_CACHE_TTL)
+def _fetch_rates(base: str) -> dict[str, float]:
+    return _parse_rates(http_get(_latest_url(base), provider="exchange_rates"))
+
+
+@tool_cache.cached("fx_rates", ttl=settings.FX_CACHE_TTL)
+async def _afetch_rates(base: str) -> dict[str, float]:
+    resp = await ahttp_get(_latest_url(base), provider="exchange_rates")
+    return _parse_rates(resp)
+
+
+def get_rate_table() -> RateTable:
+    """The latest rates for FX_BASE_CURRENCY, fetched at most once per FX_CACHE_TTL."""
+    base = settings.FX_BASE_CURRENCY.upper()
+    return RateTable(base, _fetch_rates(base))
+
+
+async def aget_rate_table() -> RateTable:
+    base = settings.FX_BASE_CURRENCY.upper()
+    return RateTable(base, await _afetch_rates(base))
+
+
+def _format_conversion(
+    table: RateTable, amount: float, from_currency: str, to_currency: str
+) -> str:
+    converted = table.convert(amount, from_currency, to_currency)
+    return f"{amount} {from_currency} is approximately {converted:.2f} {to_currency}"
+
+
+def _conversion_error(e: Exception) -> str:
+    if isinstance(e, ToolInputError):
+        return f"Error: {e}"
+    if isinstance(e, ConversionFailed):
+        return f"Currency conversion failed: {e}"
+    return f"Currency conversion error: {e}"
+
+
+@guarded(_conversion_error)
+def _currency_converter(amount: float, from_currency: str, to_currency: str) -> str:
+    """Convert currency using Exchange Rates API."""
+    require("EXCHANGE_RATES_API_KEY")
+    table = get_rate_table()
+    return _format_conversion(table, amount, from_currency, to_currency)
+
+
+@guarded(_conversion_error)
+async def _acurrency_converter(
+    amount: float, from_currency: str, to_currency: str
+) -> str:
+    require("EXCHANGE_RATES_API_KEY")
+    table = await aget_rate_table()
+    return _format_conversion(table, amount, from_currency, to_currency)
+
+
+currency_converter = StructuredTool.from_function(
+    func=_currency_converter, coroutine=_acurrency_converter, name="currency_converter"
+)
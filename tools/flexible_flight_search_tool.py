@@ -0,0 +1,111 @@
+# tools/flexible_flight_search_tool.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+from langchain_core.tools import StructuredTool
+from core.config import settings
+from tools._common import ToolInputError, guarded
+from tools.flight_search_tool import afetch_flights, fetch_flights
+
+
+def _window(departure_date: str, window_days: int) -> List[str]:
+    """The requested date ± `window_days`, skipping days already in the past."""
+    try:
+        center = date.fromisoformat(departure_date)
+    except ValueError:
+        raise ToolInputError("departure_date must be in YYYY-MM-DD format.") from None
+    window_days = max(0, min(window_days, settings.FLIGHT_FLEX_MAX_WINDOW_DAYS))
+    today = date.today()
+    days = [center + timedelta(days=d) for d in range(-window_days, window_days + 1)]
+    return [d.isoformat() for d in days if d >= today or d == center]
+
+
+def _cheapest_cell(day: str, flights: List[Dict[str, Any]]) -> Dict[str, Any]:
+    priced = [f for f in flights if "error" not in f and f.get("price") is not None]
+    if not priced:
+        error = flights[0].get("error") if flights else None
+        return {"date": day, "error": error or "No flights found."}
+    cheapest = min(priced, key=lambda f: f["price"])
+    return {"date": day, **cheapest, "options": len(priced)}
+
+
+def _price_matrix(
+    origin_iata: str, destination_iata: str, cells: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    route = f"{origin_iata.upper()}-{destination_iata.upper()}"
+    priced = [cell for cell in cells if "error" not in cell]
+    if not priced:
+        return {
+            "error": f"No flights found for {route} in this date window.",
+            "days": cells,
+        }
+    return {
+        "route": route,
+        "days": cells,
+        "cheapest": min(priced, key=lambda cell: cell["price"]),
+    }
+
+
+def _flexible_error(e: Exception) -> Dict[str, Any]:
+    if isinstance(e, ToolInputError):
+        return {"error": str(e)}
+    raise e
+
+
+def _failed_cell(day: str, e: Exception) -> Dict[str, Any]:
+    return {"date": day, "error": str(e)}
+
+
+def _fetch_cell(origin_iata: str, destination_iata: str, day: str) -> Dict[str, Any]:
+    try:
+        return _cheapest_cell(day, fetch_flights(origin_iata, destination_iata, day))
+    except Exception as e:
+        return _failed_cell(day, e)
+
+
+async def _afetch_cell(
+    origin_iata: str, destination_iata: str, day: str
+) -> Dict[str, Any]:
+    try:
+        flights = await afetch_flights(origin_iata, destination_iata, day)
+        return _cheapest_cell(day, flights)
+    except Exception as e:
+        return _failed_cell(day, e)
+
+
+@guarded(_flexible_error)
+def _flexible_flight_search(
+    origin_iata: str, destination_iata: str, departure_date: str, window_days: int = 3
+) -> Dict[str, Any]:
+    """
+    Finds the cheapest day to fly: searches one-way flights on every day from
+    `departure_date - window_days` to `departure_date + window_days` at once
+    and returns the cheapest option per day plus the overall cheapest.
+    Use this instead of calling `flight_search` once per date.
+    """
+    days = _window(departure_date, window_days)
+    with ThreadPoolExecutor(max_workers=len(days)) as pool:
+        cells = list(
+            pool.map(lambda day: _fetch_cell(origin_iata, destination_iata, day), days)
+        )
+    return _price_matrix(origin_iata, destination_iata, cells)
+
+
+@guarded(_flexible_error)
+async def _aflexible_flight_search(
+    origin_iata: str, destination_iata: str, departure_date: str, window_days: int = 3
+) -> Dict[str, Any]:
+    days = _window(departure_date, window_days)
+    cells = await asyncio.gather(
+        *(_afetch_cell(origin_iata, destination_iata, day) for day in days)
+    )
+    return _price_matrix(origin_iata, destination_iata, list(cells))
+
+
+flexible_flight_search = StructuredTool.from_function(
+    func=_flexible_flight_search,
+    coroutine=_aflexible_flight_search,
+    name="flexible_flight_search",
+)
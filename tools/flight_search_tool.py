@@ -1,19 +1,22 @@
 # tools/flight_search_tool.py
-from langchain.tools import tool
-import requests
+from langchain_core.tools import StructuredTool
+import httpx
+from core.cache import tool_cache
 from core.config import settings
+from core.http_client import http_get, ahttp_get
+from tools._common import guarded, search_error
 from typing import List, Dict, Any
 
+FLIGHT_API_URL = f"{settings.FLIGHT_API_BASE_URL}/search_one_way/"
+# Options kept per cached (route, date); `flight_search` shows the first few
+MAX_OPTIONS_PER_DATE = 20
+SHOWN_OPTIONS = 3
 
-@tool("flight_search")
-def flight_search(
+
+def _flight_request(
     origin_iata: str, destination_iata: str, departure_date: str
-) -> List[Dict[str, Any]]:
-    """
-    Searches for one-way flights using a real-time Flight Data API.
-    You must provide the IATA codes for the origin and destination airports.
-    """
-    url = "https://flight-data.p.rapidapi.com/search_one_way/"
+) -> Dict[str, Any]:
+    """Keyword arguments for `http_get`/`ahttp_get`."""
     params = {
         "origin_iata": origin_iata,
         "destination_iata": destination_iata,
@@ -24,28 +27,86 @@ def flight_search(
         "X-RapidAPI-Key": settings.RAPIDAPI_KEY,
         "X-RapidAPI-Host": "flight-data.p.rapidapi.com",
     }
+    return {
+        "url": FLIGHT_API_URL,
+        "headers": headers,
+        "params": params,
+        "timeout": settings.RAPIDAPI_TIMEOUT,
+        "provider": "flights",
+    }
+
+
+def _parse_price(price: dict) -> tuple[float | None, str | None]:
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=20)
-        response.raise_for_status()
-        data = response.json()
-
-        if not data.get("flights"):
-            return [{"error": "No flights found for the given route and date."}]
-
-        # Extract and format the most important details for the top 3 flights
-        flight_options = []
-        for flight in data["flights"][:3]:
-            flight_options.append(
-                {
-                    "airline": flight["airline"]["name"],
-                    "price": f"{flight['price']['amount']} {flight['price']['currency']}",
-                    "departure_time": flight["departure"]["scheduled_time"],
-                    "arrival_time": flight["arrival"]["scheduled_time"],
-                    "stops": len(flight.get("stops", [])),
-                }
-            )
-        return flight_options
-    except requests.RequestException as e:
-        return [{"error": f"API request failed: {e}"}]
-    except Exception as e:
-        return [{"error": f"An unexpected error occurred: {e}"}]
+        amount = float(str(price.get("amount")).replace(",", ""))
+    except (TypeError, ValueError):
+        amount = None
+    return amount, price.get("currency")
+
+
+def _parse_flights(response: httpx.Response) -> List[Dict[str, Any]]:
+    response.raise_for_status()
+    data = response.json()
+    if not data.get("flights"):
+        return [{"error": "No flights found for the given route and date."}]
+
+    # Keep every option (in API order) so date-window searches can pick the
+    # cheapest; `flight_search` itself only shows the first few.
+    flight_options = []
+    for flight in data["flights"][:MAX_OPTIONS_PER_DATE]:
+        amount, currency = _parse_price(flight.get("price") or {})
+        flight_options.append(
+            {
+                "airline": flight["airline"]["name"],
+                "price": amount,
+                "currency": currency,
+                "departure_time": flight["departure"]["scheduled_time"],
+                "arrival_time": flight["arrival"]["scheduled_time"],
+                "stops": len(flight.get("stops", [])),
+            }
+        )
+    return flight_options
+
+
+# One cache entry per (origin, destination, date), shared with date-window searches
+@tool_cache.cached("flight_offers", ttl=settings.FLIGHT_CACHE_TTL)
+def fetch_flights(
+    origin_iata: str, destination_iata: str, departure_date: str
+) -> List[Dict[str, Any]]:
+    """Every option (up to MAX_OPTIONS_PER_DATE) for one route and date."""
+    request = _flight_request(origin_iata, destination_iata, departure_date)
+    return _parse_flights(http_get(**request))
+
+
+@tool_cache.cached("flight_offers", ttl=settings.FLIGHT_CACHE_TTL)
+async def afetch_flights(
+    origin_iata: str, destination_iata: str, departure_date: str
+) -> List[Dict[str, Any]]:
+    request = _flight_request(origin_iata, destination_iata, departure_date)
+    return _parse_flights(await ahttp_get(**request))
+
+
+@guarded(search_error)
+def _flight_search(
+    origin_iata: str, destination_iata: str, departure_date: str
+) -> List[Dict[str, Any]]:
+    """
+    Searches for one-way flights using a real-time Flight Data API.
+    You must provide the IATA codes for the origin and destination airports.
+    Prices are numbers, with their currency in `currency`.
+    """
+    flights = fetch_flights(origin_iata, destination_iata, departure_date)
+    return flights[:SHOWN_OPTIONS]
+
+
+@guarded(search_error)
+async def _aflight_search(
+    origin_iata: str, destination_iata: str, departure_date: str
+) -> List[Dict[str, Any]]:
+    flights = await afetch_flights(origin_iata, destination_iata, departure_date)
+    return flights[:SHOWN_OPTIONS]
+
+
+flight_search = StructuredTool.from_function(
+    func=_flight_search, coroutine=_aflight_search, name="flight_search"
+)
@@ -1,8 +1,9 @@
 # tools/generate_itinerary_tool.py
-from langchain.tools import tool
+from langchain_core.tools import StructuredTool
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
-from core.model_loader import get_llm
+from core.llm_cache import llm_cache, prompt_version
+from core.model_loader import model_registry
 from database.models import ItineraryDay
 from typing import List
 
@@ -15,8 +16,6 @@ class Itinerary(BaseModel):
     )
 
 
-itinerary_llm = get_llm()
-
 # This prompt is now much more forceful and specific about quality.
 ITINERARY_GENERATION_PROMPT = ChatPromptTemplate.from_messages(
     [
@@ -38,24 +37,57 @@ ITINERARY_GENERATION_PROMPT = ChatPromptTemplate.from_messages(
     ]
 )
 
-structured_llm = itinerary_llm.with_structured_output(Itinerary)
+# Cached itineraries are dropped automatically when the prompt or schema changes
+ITINERARY_PROMPT_VERSION = prompt_version(ITINERARY_GENERATION_PROMPT, Itinerary)
 
 
-@tool("generate_itinerary")
-def generate_itinerary(
-    destination: str, duration_days: int, interests: List[str]
-) -> List[ItineraryDay]:
-    """Generates a complete, multi-day itinerary in a single step."""
-    prompt = ITINERARY_GENERATION_PROMPT.invoke(
+def _itinerary_prompt(destination: str, duration_days: int, interests: List[str]):
+    return ITINERARY_GENERATION_PROMPT.invoke(
         {
             "destination": destination,
             "duration_days": duration_days,
             "interests": ", ".join(interests),
         }
     )
-    try:
-        itinerary_result = structured_llm.invoke(prompt)
-        return itinerary_result.itinerary_list
-    except Exception as e:
-        print(f"Error in generate_itinerary_tool: {e}")
-        return []
+
+
+def _itinerary_days(itinerary_result: Itinerary) -> List[dict]:
+    return [day.model_dump() for day in itinerary_result.itinerary_list]
+
+
+@llm_cache.cached("itinerary", ITINERARY_PROMPT_VERSION)
+def _llm_itinerary(destination: str, duration_days: int, interests: List[str]):
+    prompt = _itinerary_prompt(destination, duration_days, interests)
+    structured_llm = model_registry.with_structured_output(Itinerary)
+    return _itinerary_days(structured_llm.invoke(prompt))
+
+
+@llm_cache.cached("itinerary", ITINERARY_PROMPT_VERSION)
+async def _allm_itinerary(destination: str, duration_days: int, interests: List[str]):
+    prompt = _itinerary_prompt(destination, duration_days, interests)
+    structured_llm = model_registry.with_structured_output(Itinerary)
+    return _itinerary_days(await structured_llm.ainvoke(prompt))
+
+
+def _validated(days: List[dict]) -> List[ItineraryDay]:
+    return [ItineraryDay.model_validate(day) for day in days]
+
+
+def _generate_itinerary(
+    destination: str, duration_days: int, interests: List[str]
+) -> List[ItineraryDay]:
+    """Generates a complete, multi-day itinerary in a single step."""
+    return _validated(_llm_itinerary(destination, duration_days, interests))
+
+
+async def _agenerate_itinerary(
+    destination: str, duration_days: int, interests: List[str]
+) -> List[ItineraryDay]:
+    return _validated(await _allm_itinerary(destination, duration_days, interests))
+
+
+generate_itinerary = StructuredTool.from_function(
+    func=_generate_itinerary,
+    coroutine=_agenerate_itinerary,
+    name="generate_itinerary",
+)
@@ -1,18 +1,22 @@
 # tools/hotel_search_tool.py
-from langchain.tools import tool
-import requests
+from langchain_core.tools import StructuredTool
+import httpx
+from core.cache import tool_cache
 from core.config import settings
+from core.http_client import http_get, ahttp_get
+from tools._common import guarded, search_error
 from typing import List, Dict, Any
 
+HOTEL_API_URL = f"{settings.HOTEL_API_BASE_URL}/hotels/search-by-destination"
+# Options kept per cached (city, dates); `hotel_search` shows the first few
+MAX_OPTIONS_PER_STAY = 20
+SHOWN_OPTIONS = 3
 
-@tool("hotel_search")
-def hotel_search(
-    city_name: str, check_in_date: str, check_out_date: str, num_adults: int = 1
-) -> List[Dict[str, Any]]:
-    """
-    Searches for hotels in a given city using a real-time Booking.com API.
-    """
-    url = "https://booking-com.p.rapidapi.com/v1/hotels/search-by-destination"
+
+def _hotel_request(
+    city_name: str, check_in_date: str, check_out_date: str, num_adults: int
+) -> Dict[str, Any]:
+    """Keyword arguments for `http_get`/`ahttp_get`."""
     querystring = {
         "dest_type": "city",
         "checkin_date": check_in_date,
@@ -29,26 +33,71 @@ def hotel_search(
         "X-RapidAPI-Key": settings.RAPIDAPI_KEY,
         "X-RapidAPI-Host": "booking-com.p.rapidapi.com",
     }
-    try:
-        response = requests.get(url, headers=headers, params=querystring, timeout=20)
-        response.raise_for_status()
-        data = response.json()
-
-        if not data.get("result"):
-            return [{"error": "No hotels found for the given location and dates."}]
-
-        hotel_options = []
-        for hotel in data["result"][:3]:
-            hotel_options.append(
-                {
-                    "name": hotel.get("hotel_name", "N/A"),
-                    "rating": hotel.get("class", 0.0),
-                    "price_per_night": f"{hotel.get('min_total_price', 0)} {hotel.get('currency_code', '')}",
-                    "review_score": hotel.get("review_score", 0.0),
-                }
-            )
-        return hotel_options
-    except requests.RequestException as e:
-        return [{"error": f"API request failed: {e}"}]
-    except Exception as e:
-        return [{"error": f"An unexpected error occurred: {e}"}]
+    return {
+        "url": HOTEL_API_URL,
+        "headers": headers,
+        "params": querystring,
+        "timeout": settings.RAPIDAPI_TIMEOUT,
+        "provider": "hotels",
+    }
+
+
+def _parse_hotels(response: httpx.Response) -> List[Dict[str, Any]]:
+    response.raise_for_status()
+    data = response.json()
+    if not data.get("result"):
+        return [{"error": "No hotels found for the given location and dates."}]
+
+    hotel_options = []
+    for hotel in data["result"][:MAX_OPTIONS_PER_STAY]:
+        # The API sends null for unrated hotels; the plan needs numbers.
+        hotel_options.append(
+            {
+                "name": hotel.get("hotel_name") or "N/A",
+                "rating": hotel.get("class") or 0.0,
+                "price_per_night": f"{hotel.get('min_total_price', 0)} {hotel.get('currency_code', '')}",
+                "review_score": hotel.get("review_score") or 0.0,
+            }
+        )
+    return hotel_options
+
+
+# One cache entry per (city, dates, adults), shared with route-level searches
+@tool_cache.cached("hotel_offers", ttl=settings.HOTEL_CACHE_TTL)
+def fetch_hotels(
+    city_name: str, check_in_date: str, check_out_date: str, num_adults: int = 1
+) -> List[Dict[str, Any]]:
+    request = _hotel_request(city_name, check_in_date, check_out_date, num_adults)
+    return _parse_hotels(http_get(**request))
+
+
+@tool_cache.cached("hotel_offers", ttl=settings.HOTEL_CACHE_TTL)
+async def afetch_hotels(
+    city_name: str, check_in_date: str, check_out_date: str, num_adults: int = 1
+) -> List[Dict[str, Any]]:
+    request = _hotel_request(city_name, check_in_date, check_out_date, num_adults)
+    return _parse_hotels(await ahttp_get(**request))
+
+
+@guarded(search_error)
+def _hotel_search(
+    city_name: str, check_in_date: str, check_out_date: str, num_adults: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    Searches for hotels in a given city using a real-time Booking.com API.
+    """
+    hotels = fetch_hotels(city_name, check_in_date, check_out_date, num_adults)
+    return hotels[:SHOWN_OPTIONS]
+
+
+@guarded(search_error)
+async def _ahotel_search(
+    city_name: str, check_in_date: str, check_out_date: str, num_adults: int = 1
+) -> List[Dict[str, Any]]:
+    hotels = await afetch_hotels(city_name, check_in_date, check_out_date, num_adults)
+    return hotels[:SHOWN_OPTIONS]
+
+
+hotel_search = StructuredTool.from_function(
+    func=_hotel_search, coroutine=_ahotel_search, name="hotel_search"
+)
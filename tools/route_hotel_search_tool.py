@@ -0,0 +1,127 @@
+# tools/route_hotel_search_tool.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any, Dict, List
+
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import InjectedState
+from database.models import TripPlan
+from tools._common import ToolInputError, guarded
+from tools._route import plan_stays
+from tools.hotel_search_tool import afetch_hotels, fetch_hotels
+
+# Hotels kept per city once ranked
+HOTELS_PER_CITY = 3
+
+
+def _price(hotel: Dict[str, Any]) -> float:
+    try:
+        return float(str(hotel.get("price_per_night", "")).split()[0])
+    except (IndexError, ValueError):
+        return float("inf")
+
+
+def _rank(hotels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Best reviewed first, cheaper first among equally reviewed ones."""
+    found = [h for h in hotels if "error" not in h]
+    found.sort(key=lambda h: (-(h.get("review_score") or 0), _price(h)))
+    return found[:HOTELS_PER_CITY]
+
+
+def _city_result(stay: Dict[str, Any], hotels: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ranked = _rank(hotels)
+    if not ranked:
+        error = hotels[0].get("error") if hotels else None
+        return {**stay, "error": error or "No hotels found.", "hotels": []}
+    return {**stay, "hotels": [{"city": stay["city"], **h} for h in ranked]}
+
+
+def _summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The tool result. The tool node writes `plan_update` into the plan, replacing
+    `accommodation`; the rest goes back to the planner.
+    """
+    hotels = []
+    for result in results:
+        city_hotels = result.pop("hotels")
+        result["hotels_saved"] = len(city_hotels)
+        hotels.extend(city_hotels)
+    if not hotels:
+        return {
+            "error": "No hotels found for any city of the route.",
+            "cities": results,
+        }
+    return {
+        "saved_to_plan": True,
+        "cities": results,
+        "plan_update": {"accommodation": hotels},
+    }
+
+
+def _route_error(e: Exception) -> Dict[str, Any]:
+    if isinstance(e, ToolInputError):
+        return {"error": str(e)}
+    raise e
+
+
+def _failed_stay(stay: Dict[str, Any], e: Exception) -> Dict[str, Any]:
+    return {**stay, "error": str(e), "hotels": []}
+
+
+def _fetch_stay(stay: Dict[str, Any], num_adults: int) -> Dict[str, Any]:
+    try:
+        hotels = fetch_hotels(
+            stay["city"], stay["check_in"], stay["check_out"], num_adults
+        )
+    except Exception as e:
+        return _failed_stay(stay, e)
+    return _city_result(stay, hotels)
+
+
+async def _afetch_stay(stay: Dict[str, Any], num_adults: int) -> Dict[str, Any]:
+    try:
+        hotels = await afetch_hotels(
+            stay["city"], stay["check_in"], stay["check_out"], num_adults
+        )
+    except Exception as e:
+        return _failed_stay(stay, e)
+    return _city_result(stay, hotels)
+
+
+@guarded(_route_error)
+def _route_hotel_search(
+    start_date: str,
+    plan: Annotated[TripPlan, InjectedState("plan")],
+    num_adults: int = 1,
+) -> Dict[str, Any]:
+    """
+    Finds hotels for every city of the planned `route` (or the `destination` of
+    a single-city trip) at once and saves the best ranked ones per city as the
+    plan's `accommodation` (no `PlanUpdater` call needed). Check-in/check-out
+    dates follow from `start_date` (the first night of the trip, YYYY-MM-DD)
+    and each stop's `num_days`.
+    """
+    city_stays = plan_stays(plan, start_date)
+    with ThreadPoolExecutor(max_workers=len(city_stays)) as pool:
+        results = list(pool.map(lambda stay: _fetch_stay(stay, num_adults), city_stays))
+    return _summarize(results)
+
+
+@guarded(_route_error)
+async def _aroute_hotel_search(
+    start_date: str,
+    plan: Annotated[TripPlan, InjectedState("plan")],
+    num_adults: int = 1,
+) -> Dict[str, Any]:
+    city_stays = plan_stays(plan, start_date)
+    results = await asyncio.gather(
+        *(_afetch_stay(stay, num_adults) for stay in city_stays)
+    )
+    return _summarize(list(results))
+
+
+route_hotel_search = StructuredTool.from_function(
+    func=_route_hotel_search,
+    coroutine=_aroute_hotel_search,
+    name="route_hotel_search",
+)
@@ -0,0 +1,255 @@
+# tools/route_weather_tool.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Annotated, Any, Dict, List
+
+from langchain_core.tools import StructuredTool
+from langgraph.prebuilt import InjectedState
+import httpx
+from core.cache import MISSING, make_key, tool_cache
+from core.config import settings
+from core.http_client import http_get, ahttp_get
+from core.resilience import ProviderUnavailable
+from core.singleflight import single_flight
+from database.models import TripPlan
+from tools._common import ToolInputError, guarded, require
+from tools._route import plan_stays
+
+FORECAST_API_URL = f"{settings.WEATHER_API_BASE_URL}/forecast.json"
+# Daily summaries are cached per (city, date) under this namespace
+NAMESPACE = "weather_forecast"
+NO_FORECAST = {"error": "no forecast returned"}
+
+
+def _days(city_stays: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One (city, date) cell per day of the trip; days with no forecast are marked."""
+    today = date.today()
+    last = today + timedelta(days=settings.WEATHER_FORECAST_DAYS - 1)
+    cells = []
+    for stay in city_stays:
+        day = date.fromisoformat(stay["check_in"])
+        while day < date.fromisoformat(stay["check_out"]):
+            cell = {"city": stay["city"], "date": day.isoformat()}
+            if day < today:
+                cell["error"] = "in the past"
+            elif day > last:
+                cell["error"] = "too far ahead to forecast"
+            cells.append(cell)
+            day += timedelta(days=1)
+    return cells
+
+
+def _cell_key(city: str, day: str) -> str:
+    return make_key(NAMESPACE, {"city": city, "day": day})
+
+
+def _forecast_params(city: str, last_day: str) -> dict:
+    days_ahead = (date.fromisoformat(last_day) - date.today()).days
+    return {"key": settings.WEATHER_API_KEY, "q": city, "days": days_ahead + 1}
+
+
+def _parse_forecast(city: str, response: httpx.Response) -> Dict[str, Dict[str, Any]]:
+    """Every returned day's summary, each also cached under its (city, date)."""
+    response.raise_for_status()
+    days = {}
+    for forecast in response.json().get("forecast", {}).get("forecastday", []):
+        summary = forecast["day"]
+        days[forecast["date"]] = {
+            "condition": summary["condition"]["text"],
+            "min_c": summary["mintemp_c"],
+            "max_c": summary["maxtemp_c"],
+            "rain_chance": summary.get("daily_chance_of_rain"),
+        }
+        if settings.FORECAST_CACHE_TTL > 0:
+            tool_cache.store(
+                _cell_key(city, forecast["date"]),
+                days[forecast["date"]],
+                settings.FORECAST_CACHE_TTL,
+            )
+    return days
+
+
+def _request_forecast(city: str, last_day: str) -> Dict[str, Dict[str, Any]]:
+    params = _forecast_params(city, last_day)
+    resp = http_get(FORECAST_API_URL, params=params, provider="weather")
+    return _parse_forecast(city, resp)
+
+
+async def _arequest_forecast(city: str, last_day: str) -> Dict[str, Dict[str, Any]]:
+    params = _forecast_params(city, last_day)
+    resp = await ahttp_get(FORECAST_API_URL, params=params, provider="weather")
+    return _parse_forecast(city, resp)
+
+
+def _range_key(city: str, missing: List[str]) -> str:
+    return f"{_cell_key(city, missing[-1])}/range"
+
+
+def _cached_days(city: str, days: List[str]) -> tuple[Dict[str, Any], List[str]]:
+    found, missing = {}, []
+    for day in days:
+        value = tool_cache.lookup(NAMESPACE, _cell_key(city, day))
+        if value is MISSING:
+            missing.append(day)
+        else:
+            found[day] = value
+    return found, missing
+
+
+def _stale_days(
+    city: str, days: List[str], error: ProviderUnavailable
+) -> Dict[str, Any]:
+    found = {}
+    for day in days:
+        try:
+            found[day] = tool_cache.stale_fallback(
+                NAMESPACE, _cell_key(city, day), error
+            )
+        except ProviderUnavailable:
+            found[day] = {"error": str(error)}
+    return found
+
+
+def _forecast_stop(city: str, days: List[str]) -> Dict[str, Any]:
+    """
+    Forecasts of one city for `days`: cached days are reused, the rest come
+    from a single request covering up to the last missing day.
+    """
+    found, missing = _cached_days(city, days)
+    if missing:
+        try:
+            fetched = single_flight.do(
+                NAMESPACE,
+                _range_key(city, missing),
+                lambda: _request_forecast(city, missing[-1]),
+            )
+        except ProviderUnavailable as e:
+            fetched = _stale_days(city, missing, e)
+        found.update({day: fetched.get(day, NO_FORECAST) for day in missing})
+    return found
+
+
+async def _aforecast_stop(city: str, days: List[str]) -> Dict[str, Any]:
+    found, missing = _cached_days(city, days)
+    if missing:
+        try:
+            fetched = await single_flight.ado(
+                NAMESPACE,
+                _range_key(city, missing),
+                lambda: _arequest_forecast(city, missing[-1]),
+            )
+        except ProviderUnavailable as e:
+            fetched = _stale_days(city, missing, e)
+        found.update({day: fetched.get(day, NO_FORECAST) for day in missing})
+    return found
+
+
+def _by_city(cells: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Days to fetch per city (a city may appear twice on a route)."""
+    days: Dict[str, List[str]] = {}
+    for cell in cells:
+        if "error" not in cell:
+            days.setdefault(cell["city"], []).append(cell["date"])
+    return days
+
+
+def _fill(
+    cells: List[Dict[str, Any]], forecasts: Dict[str, Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    return [
+        cell if "error" in cell else {**cell, **forecasts[cell["city"]][cell["date"]]}
+        for cell in cells
+    ]
+
+
+def _failed_days(days: List[str], e: Exception) -> Dict[str, Any]:
+    return {day: {"error": str(e)} for day in days}
+
+
+def _fetch_city(city: str, days: List[str]) -> Dict[str, Any]:
+    try:
+        return _forecast_stop(city, days)
+    except Exception as e:
+        return _failed_days(days, e)
+
+
+async def _afetch_city(city: str, days: List[str]) -> Dict[str, Any]:
+    try:
+        return await _aforecast_stop(city, days)
+    except Exception as e:
+        return _failed_days(days, e)
+
+
+def _table(cells: List[Dict[str, Any]]) -> str:
+    """
+    One line per day. Consecutive days of a city without a forecast share a
+    line, and each distinct error is spelled out once, below the table.
+    """
+    errors: List[str] = []
+    lines = ["date | city | forecast | min-max °C | rain"]
+    previous = None
+    for cell in cells:
+        if "error" not in cell:
+            rain = cell["rain_chance"]
+            lines.append(
+                f"{cell['date']} | {cell['city']} | {cell['condition']} | "
+                f"{cell['min_c']:.0f}-{cell['max_c']:.0f} | "
+                f"{'' if rain is None else f'{rain}%'}"
+            )
+            previous = None
+            continue
+        if cell["error"] not in errors:
+            errors.append(cell["error"])
+        note = f"n/a [{errors.index(cell['error']) + 1}] | |"
+        if previous and all(previous[k] == cell[k] for k in ("city", "error")):
+            lines[-1] = f"{previous['date']}..{cell['date']} | {cell['city']} | {note}"
+        else:
+            lines.append(f"{cell['date']} | {cell['city']} | {note}")
+            previous = cell
+    lines += [f"[{i}] {error}" for i, error in enumerate(errors, 1)]
+    return "\n".join(lines)
+
+
+def _route_weather_error(e: Exception) -> str:
+    if isinstance(e, ToolInputError):
+        return f"Error: {e}"
+    raise e
+
+
+@guarded(_route_weather_error)
+def _route_weather(
+    start_date: str, plan: Annotated[TripPlan, InjectedState("plan")]
+) -> str:
+    """
+    Daily weather forecast for the whole trip in one call: every city of the
+    planned `route` (or the single destination) on each day you'll be there,
+    starting on `start_date` (YYYY-MM-DD) and following each stop's `num_days`.
+    Returns a compact table. Use this instead of `weather_info` per city.
+    """
+    require("WEATHER_API_KEY")
+    cells = _days(plan_stays(plan, start_date))
+    cities = _by_city(cells)
+    if not cities:
+        return _table(cells)
+    with ThreadPoolExecutor(max_workers=len(cities)) as pool:
+        forecasts = dict(zip(cities, pool.map(_fetch_city, cities, cities.values())))
+    return _table(_fill(cells, forecasts))
+
+
+@guarded(_route_weather_error)
+async def _aroute_weather(
+    start_date: str, plan: Annotated[TripPlan, InjectedState("plan")]
+) -> str:
+    require("WEATHER_API_KEY")
+    cells = _days(plan_stays(plan, start_date))
+    cities = _by_city(cells)
+    results = await asyncio.gather(
+        *(_afetch_city(city, days) for city, days in cities.items())
+    )
+    return _table(_fill(cells, dict(zip(cities, results))))
+
+
+route_weather = StructuredTool.from_function(
+    func=_route_weather, coroutine=_aroute_weather, name="route_weather"
+)
@@ -1,37 +1,83 @@
 # tools/search_place_tool.py
-from langchain.tools import tool
-import requests
+from langchain_core.tools import StructuredTool
+import httpx
+from core.cache import tool_cache
 from core.config import settings
+from core.http_client import http_get, ahttp_get
+from core.resilience import ProviderUnavailable
+from tools._common import guarded
 from typing import List, Dict, Any
 
+PLACES_API_URL = f"{settings.PLACES_API_BASE_URL}/textsearch/json"
 
-@tool("search_place")
-def search_place(query: str) -> List[Dict[str, Any]]:
+
+def _places_ttl(arguments: dict) -> int:
+    # Airport lookups are how the planner finds IATA codes; those never change.
+    if "airport" in arguments["query"].lower():
+        return settings.IATA_CACHE_TTL
+    return settings.PLACES_CACHE_TTL
+
+
+def _parse_places(query: str, response: httpx.Response) -> List[Dict[str, Any]]:
+    response.raise_for_status()
+    results = response.json().get("results", [])
+    if not results:
+        return [{"error": f"No places found for query: {query}"}]
+
+    return [
+        {
+            "name": place.get("name"),
+            "address": place.get("formatted_address"),
+            "rating": place.get("rating"),
+            "place_id": place.get("place_id"),
+        }
+        for place in results[:5]
+    ]
+
+
+def _places_params(query: str) -> dict:
+    return {"query": query, "key": settings.GOOGLE_API_KEY}
+
+
+def _place_error(e: Exception) -> List[Dict[str, Any]]:
+    if isinstance(e, ProviderUnavailable):
+        return [{"error": str(e)}]
+    if isinstance(e, httpx.HTTPError):
+        return [{"error": f"Place search API error: {e}"}]
+    raise e
+
+
+@tool_cache.cached("search_place", ttl=_places_ttl)
+def _fetch_places(query: str) -> List[Dict[str, Any]]:
+    params = _places_params(query)
+    resp = http_get(PLACES_API_URL, params=params, provider="places")
+    return _parse_places(query, resp)
+
+
+@tool_cache.cached("search_place", ttl=_places_ttl)
+async def _afetch_places(query: str) -> List[Dict[str, Any]]:
+    params = _places_params(query)
+    resp = await ahttp_get(PLACES_API_URL, params=params, provider="places")
+    return _parse_places(query, resp)
+
+
+@guarded(_place_error)
+def _search_place(query: str) -> List[Dict[str, Any]]:
     """
-    General purpose search for places, attractions, airports, or cities using Google Places API.
+    General purpose search for places, attractions, or cities using Google Places API.
     - To find attractions, use queries like "tourist attractions in Goa".
-    - To find an airport's IATA code, use a query like "airport in Delhi".
+    - For airports and IATA codes, use `airport_lookup` instead (offline, instant).
     - To get a city's ID for hotel searches, use a query like "Goa city".
     Returns a list of places with their name, address, rating, and internal Place ID.
     """
-    api_key = settings.GOOGLE_API_KEY
-    url = f"https://maps.googleapis.com/maps/api/place/textsearch/json?query={query}&key={api_key}"
-    try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        results = data.get("results", [])
-        if not results:
-            return [{"error": f"No places found for query: {query}"}]
-
-        return [
-            {
-                "name": place.get("name"),
-                "address": place.get("formatted_address"),
-                "rating": place.get("rating"),
-                "place_id": place.get("place_id"),
-            }
-            for place in results[:5]
-        ]
-    except requests.RequestException as e:
-        return [{"error": f"Place search API error: {e}"}]
+    return _fetch_places(query)
+
+
+@guarded(_place_error)
+async def _asearch_place(query: str) -> List[Dict[str, Any]]:
+    return await _afetch_places(query)
+
+
+search_place = StructuredTool.from_function(
+    func=_search_place, coroutine=_asearch_place, name="search_place"
+)
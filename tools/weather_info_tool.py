@@ -1,27 +1,63 @@
-from langchain.tools import tool
-import requests
+from langchain_core.tools import StructuredTool
+import httpx
+from core.cache import tool_cache
 from core.config import settings
+from core.http_client import http_get, ahttp_get
+from tools._common import ToolInputError, guarded, require
 
+WEATHER_API_URL = f"{settings.WEATHER_API_BASE_URL}/current.json"
 
-@tool("weather_info")
-def weather_info(location: str) -> str:
+
+def _format_weather(location: str, response: httpx.Response) -> str:
+    response.raise_for_status()
+    data = response.json()
+    if "current" in data:
+        weather = data["current"]
+        return (
+            f"The current weather in {location} is {weather['temp_c']}°C "
+            f"and feels like {weather['feelslike_c']}°C. "
+            f"The condition is {weather['condition']['text']} with {weather['humidity']}% humidity."
+        )
+    return f"Could not fetch weather for {location}. The API might not recognize the location or there might be an issue."
+
+
+def _weather_params(location: str) -> dict:
+    return {"key": settings.WEATHER_API_KEY, "q": location}
+
+
+def _weather_error(e: Exception) -> str:
+    if isinstance(e, ToolInputError):
+        return f"Error: {e}"
+    return f"Weather API error: {e}"
+
+
+@tool_cache.cached("weather_info", ttl=settings.WEATHER_CACHE_TTL)
+def _fetch_weather(location: str) -> str:
+    params = _weather_params(location)
+    resp = http_get(WEATHER_API_URL, params=params, provider="weather")
+    return _format_weather(location, resp)
+
+
+@tool_cache.cached("weather_info", ttl=settings.WEATHER_CACHE_TTL)
+async def _afetch_weather(location: str) -> str:
+    params = _weather_params(location)
+    resp = await ahttp_get(WEATHER_API_URL, params=params, provider="weather")
+    return _format_weather(location, resp)
+
+
+@guarded(_weather_error)
+def _weather_info(location: str) -> str:
     """Get current weather information for a given city."""
-    api_key = settings.WEATHER_API_KEY
-    if not api_key:
-        return "Error: WEATHER_API_KEY is not set."
-    url = f"http://api.weatherapi.com/v1/current.json?key={api_key}&q={location}"
-    try:
-        resp = requests.get(url, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        if "current" in data:
-            weather = data["current"]
-            return (
-                f"The current weather in {location} is {weather['temp_c']}°C "
-                f"and feels like {weather['feelslike_c']}°C. "
-                f"The condition is {weather['condition']['text']} with {weather['humidity']}% humidity."
-            )
-        else:
-            return f"Could not fetch weather for {location}. The API might not recognize the location or there might be an issue."
-    except Exception as e:
-        return f"Weather API error: {e}"
+    require("WEATHER_API_KEY")
+    return _fetch_weather(location)
+
+
+@guarded(_weather_error)
+async def _aweather_info(location: str) -> str:
+    require("WEATHER_API_KEY")
+    return await _afetch_weather(location)
+
+
+weather_info = StructuredTool.from_function(
+    func=_weather_info, coroutine=_aweather_info, name="weather_info"
+)